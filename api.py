@@ -1,6 +1,6 @@
 # api.py
 from __future__ import annotations
-from queue import Queue, Empty
+import atexit
 import subprocess
 import os
 import signal
@@ -9,13 +9,22 @@ from flask_cors import CORS, cross_origin
 from modules.linuxSystem.sound import soundSys # Ensure this path matches your project
 from modules.linuxSystem.linuxUtils import LinuxUtilities
 from modules.logMonitor import LogFileWatcher, logMonitorOP25
+from modules._eventBus import EventBus, LOG_TOPIC, ALL_LOG_TOPIC
+from modules._sseBroadcaster import SSEBroadcaster
+from modules._logHistory import LogAction
+from modules._callCoalescer import CallCoalescer, CALL_TOPIC
+from modules._callLog import CallLog
+from modules._logFilter import LogFilterPolicy
+from modules._catalog import CatalogConflict
+from modules._responseCache import ResponseCache
+from modules._paging import DEFAULT_LIMIT, MAX_LIMIT, FieldProjection, decode_cursor, encode_cursor
+from modules._talkgroupImport import TalkgroupCSVImporter
 from modules._session import SessionMember
 from modules._sessionManager import SessionManager
 from modules._op25Manager import op25Manager
 from modules.myConfiguration import MyConfig
 import time
 import threading
-from queue import Queue
 import json
 from modules._zoneManager import zoneMember, channelMember
 from modules._talkgroupSet import TalkgroupManager
@@ -77,6 +86,8 @@ class API:
         
         self.progress = 0
         self.lock = threading.Lock()
+        self._responseCache = ResponseCache(
+            min_gzip_size=self.configManager.getint("catalog", "gzip_min_size", fallback=1024))
 
         # REGISTER API ROUTES
         self.register_routes()
@@ -100,15 +111,65 @@ class API:
         self.kill_named_scripts(["rx.py", "terminal.py"])
 
     def startLoggerStream(self):
-        self._end_point = f"http://127.0.0.0:5001/controller/logging/update"
-        self._monitor = logMonitorOP25(self, file=self.configManager.get("paths", "stderr_file"), endpoint=self._end_point)
+        # PARSED LOG ENTRIES ARE PUBLISHED IN-PROCESS; /controller/logging/update REMAINS FOR EXTERNAL SOURCES
+        self._eventBus = EventBus()
+        self._logBroadcaster = SSEBroadcaster(
+            capacity=self.configManager.getint("logging", "sse_buffer_size", fallback=256),
+            drop_policy=self.configManager.get("logging", "sse_drop_policy", fallback="oldest"),
+            replay_size=self.configManager.getint("logging", "sse_replay_size", fallback=512)
+        )
+
+        # VOICE UPDATES ARE GROUPED INTO CALLS; BROWSERS GET call_start/call_update/call_end EVENTS
+        self._callCoalescer = CallCoalescer(
+            self._eventBus,
+            min_interval=self.configManager.getfloat("logging", "call_update_interval", fallback=1.0),
+            end_timeout=self.configManager.getfloat("logging", "call_end_timeout", fallback=2.0),
+            system_index=lambda: self.activeSession.activeSysIndex
+        )
+        self._coalesceVoice = self.configManager.getboolean("logging", "coalesce_voice", fallback=True)
+        # TRACKERS TAKE EVERY ENTRY, SO THE [logging] FILTER ONLY THINS WHAT IS STORED AND STREAMED
+        self._eventBus.subscribe(ALL_LOG_TOPIC, self._callCoalescer.on_entry)
+        self._eventBus.subscribe(CALL_TOPIC, self._logBroadcaster.publish)
+        self._eventBus.subscribe(LOG_TOPIC, self._broadcast_log_entry)
+        self._eventBus.subscribe(ALL_LOG_TOPIC, self.op25Manager.switchTracker.on_entry)  # Confirms hot channel switches
+        self._eventBus.subscribe(ALL_LOG_TOPIC, self.op25Manager.readiness.on_entry)  # rx.py startup milestones
+        self.op25Manager.supervisor.publish = lambda event: self._eventBus.publish(LOG_TOPIC, event)  # Crash/restart notices
+        self._callCoalescer.start()
+
+        # FINISHED CALLS ARE RECORDED IN SQLITE IN BATCHED TRANSACTIONS
+        self._callLog = CallLog(
+            self.configManager.get("paths", "call_db", fallback="/opt/op25-project/logs/calls.db"),
+            commit_interval=self.configManager.getfloat("logging", "call_commit_interval", fallback=20.0)
+        )
+        self._eventBus.subscribe(CALL_TOPIC, self._callLog.on_call)
+        self._callLog.start()
+        atexit.register(self._callLog.stop)  # Commits calls still buffered at shutdown
+        atexit.register(self._callCoalescer.stop)  # Registered last so it runs first: ends active calls before the commit
+
+        self._monitor = logMonitorOP25(self, file=self.configManager.get("paths", "stderr_file"), bus=self._eventBus,
+                                       history_size=self.configManager.getint("logging", "history_size", fallback=5000),
+                                       line_buffer_size=self.configManager.getint("logging", "line_buffer_size", fallback=500),
+                                       log_filter=LogFilterPolicy.from_config(self.configManager))
         self._watcher = LogFileWatcher(self._monitor)
         self._watcher.start_in_thread()
-        self._log_queue = Queue()
+
+    def _broadcast_log_entry(self, entry: dict):
+        """Sends a parsed log entry to SSE clients unless the call coalescer covers it."""
+        if self._coalesceVoice and entry.get("Action") == CallCoalescer.VOICE_ACTION:
+            return
+        self._logBroadcaster.publish(entry)
+
+    @property
+    def eventBus(self) -> EventBus:
+        return self._eventBus
+
+    @property
+    def callLog(self) -> CallLog:
+        return self._callLog
         
     @property
-    def logQueue(self) -> Queue:
-        return self._log_queue
+    def logBroadcaster(self) -> SSEBroadcaster:
+        return self._logBroadcaster
 
     @property
     def configManager(self) -> MyConfig:
@@ -130,6 +191,80 @@ class API:
     def zoneManager(self) -> zoneMember:
         return self.sessionManager.zoneManager
     
+    def set_progress(self, percent: int):
+        """Sets the value streamed by /controller/progress."""
+        with self.lock:
+            self.progress = percent
+
+    def _catalog_delta(self, part: str, derive):
+        """
+        Applies one PATCH (add or update) or DELETE request to the catalog.
+
+        The client sends the version it last saw as If-Match (or "version" in the body);
+        a stale version gets 412 and the current version. derive(manager, fields) returns
+        the changed manager; fields is the JSON body, or None for DELETE.
+        """
+        body = request.get_json(silent=True) or {}
+        if not isinstance(body, dict):
+            return jsonify({"error": "Expected a JSON object"}), 400
+        try:
+            expected = self.sessionManager.catalog.expected_version(request.headers.get("If-Match") or body.pop("version", None))
+        except ValueError:
+            return jsonify({"error": "Invalid version"}), 400
+        fields = None if request.method == "DELETE" else body
+        try:
+            snapshot = self.sessionManager.patchCatalog(part, lambda manager: derive(manager, fields), expected)
+        except CatalogConflict as e:
+            response = jsonify({"error": str(e), "version": e.current})
+            response.headers["ETag"] = self.sessionManager.catalog.current.etag
+            return response, 412
+        except KeyError as e:
+            return jsonify({"error": e.args[0] if e.args else "Not found"}), 404
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": str(e)}), 400
+        response = jsonify({"status": "ok", "version": snapshot.version})
+        response.headers["ETag"] = snapshot.etag
+        return response, 200
+
+    def _cached_json(self, key: str, etag: str, build):
+        """
+        Answers a large read endpoint from the response cache: 304 if the client's
+        If-None-Match still matches, otherwise the cached body, gzipped if accepted.
+        build() returns the data and is only called when the ETag has changed.
+        """
+        entry = self._responseCache.get(key, etag, build)
+        if request.if_none_match.contains_weak(entry.etag.strip('"')):
+            response = Response(status=304)
+        elif entry.compressible and request.accept_encodings["gzip"]:
+            response = Response(entry.gzipped, mimetype="application/json")
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = Response(entry.body, mimetype="application/json")
+        response.headers["ETag"] = entry.etag
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = "no-cache"  # Browsers revalidate, and usually get a 304
+        return response
+
+    @staticmethod
+    def _int_arg(name: str, default=None):
+        """Reads an integer query argument. Unlike args.get(type=int), a non-numeric value raises ValueError."""
+        value = request.args.get(name)
+        if value is None or value == "":
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"{name} must be an integer, got '{value}'")
+
+    @staticmethod
+    def _paging_args():
+        """Reads ?offset=&limit=&fields= for a paged listing. Raises ValueError on bad values."""
+        offset = API._int_arg("offset", 0)
+        limit = API._int_arg("limit", DEFAULT_LIMIT)
+        if offset < 0 or limit < 1:
+            raise ValueError("offset must be >= 0 and limit >= 1")
+        return offset, min(limit, MAX_LIMIT), FieldProjection(request.args.get("fields"))
+
     def dynamic_cross_origin(self):
         allowed_origins = ALLOWED_ORIGINS = [
             "http://192.168.1.46:8000",
@@ -303,7 +438,22 @@ class API:
         def get_active_tgid_object():
             if not self.activeSession.activeTGIDList:
                 return {"error": "No active TGID list in session"}, 400
-            return jsonify(self.activeSession.activeTGIDList.to_dict())
+            snapshot = self.sessionManager.catalog.current
+            tg_set = snapshot.talkgroups.getTalkgroupSetBySysIndex(self.activeSession.activeSysIndex)
+            if tg_set is None:
+                return {"error": "No active TGID list in session"}, 400
+            return self._cached_json(f"session_talkgroups_{tg_set.sysIndex}",
+                                     snapshot.etag_for("talkgroups", tg_set.sysIndex), tg_set.to_dict)
+
+        # 10B: [GET] Autocomplete talkgroups by tgid or name prefix. ?q=<text>&sys=<index>&limit=<n>
+        @self.app.route('/talkgroups/search', methods=['GET'])
+        @self.dynamic_cross_origin()
+        def search_talkgroups():
+            query = request.args.get("q", default="")
+            sys_index = request.args.get("sys", default=None, type=int)
+            limit = max(0, min(request.args.get("limit", default=20, type=int), 200))
+            results = self.sessionManager.talkgroupsManager.search(query, sys_index=sys_index, limit=limit)
+            return jsonify({"query": query, "results": results}), 200
 
         # ====== SESSION MODIFIERS ======
 
@@ -312,16 +462,15 @@ class API:
         @self.dynamic_cross_origin()
         def set_active_channel(id):
             zone_index = self.activeSession.activeZoneIndex
-            ch_data = self.sessionManager.zoneManager.getChannel(zone_index, id) # MODIFIED FOR ERROR CHECKING
-            if not ch_data:
+            channel = self.sessionManager.zoneManager.getChannel(zone_index, id) # MODIFIED FOR ERROR CHECKING
+            if not channel:
                 return {"error": f"Channel {id} not found in zone {zone_index}"}, 404
             zone = self.sessionManager.zoneManager.getZoneByIndex(zone_index)
-            channel = channelMember(ch_data, zone_index)
             sys = self.sessionManager.systemsManager.getSystemByIndex(channel.sysid)
             if not sys:
                 return {"error": f"System with sysid {channel.sysid} not found"}, 404
-            self.activeSession.updateSession(channel, zone, sys)
-            return {"message": {"Channel updated successfully", "SysIndex:", self.sessionManager.thisSession.activeSysIndex}}
+            self.activeSession.update_session(channel, zone, sys)
+            return {"message": "Channel updated successfully", "SysIndex": self.sessionManager.thisSession.activeSysIndex}
 
         # 12: [PUT] Move to next channel
         @self.app.route('/session/channel/next', methods=['PUT'])
@@ -350,7 +499,7 @@ class API:
             sys = self.sessionManager.systemsManager.getSystemByIndex(channel.sysid)
             if not sys:
                 return {"error": f"System with sysid {channel.sysid} not found"}, 404
-            self.activeSession.updateSession(channel, zone, sys)
+            self.activeSession.update_session(channel, zone, sys)
             return {"message": "Zone updated successfully"}
 
         # 15: [PUT] Move to next zone (loads first channel)
@@ -366,9 +515,26 @@ class API:
         # ====== ZONE DATA ======
 
         # 17: [GET] All zones from zones.json
+        #     With ?offset=&limit=&cursor=&fields= (e.g. fields=name,channels.name) returns one page:
+        #     {"items": [...], "total": n, "next_cursor": "...", "version": v}
         @self.app.route('/zones', methods=['GET'])
         def getAllZones():
-            return jsonify(self.zoneManager._data)
+            snapshot = self.sessionManager.catalog.current
+            if not any(arg in request.args for arg in ("offset", "limit", "cursor", "fields")):
+                return self._cached_json("zones", snapshot.etag_for("zones"), lambda: snapshot.zones._data)
+            try:
+                offset, limit, fields = self._paging_args()
+                cursor = request.args.get("cursor")
+                after = decode_cursor(cursor, 1)[0] if cursor else None
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            zones, next_after, total = snapshot.zones.page(after=after, offset=offset, limit=limit)
+            return jsonify({
+                "items": [fields.apply(zone.to_dict()) for zone in zones],
+                "total": total,
+                "next_cursor": encode_cursor(next_after) if next_after is not None else None,
+                "version": snapshot.version
+            }), 200
 
         # 18: [GET] Zone by index
         @self.app.route('/zone/<int:zone_number>', methods=['GET'])
@@ -392,21 +558,29 @@ class API:
        
         # ======    OP25 RADIO CONTROLS      =======
         
-        # 21: TODO: WHITELIST TGIDS (SWITCH TGIDS)
+        # 21: WHITELIST TGIDS (HOT SWITCH THE RUNNING OP25 TO THIS TGID LIST)
+        #     The list overrides the active channel's until the next channel change, restarts included
         @self.app.route('/session/controller/whitelist', methods=['POST'])
         @self.dynamic_cross_origin()
         def whitelist():
             payload = request.get_json() or {}
             tgids = payload.get("tgid", [])
-            channel = channelMember(payload)
 
             if not tgids:
                 return jsonify({"error": "No TGIDs provided", "payload": payload}), 400
-            
+            if not isinstance(tgids, list):
+                return jsonify({"error": "tgid must be a list of TGIDs", "payload": payload}), 400
+            try:
+                tgids = [int(tgid) for tgid in tgids]
+            except (TypeError, ValueError):
+                return jsonify({"error": "TGIDs must be integers", "payload": payload}), 400
+
             # SEND ARRAY OF WHITELISTED TALKGROUPS TO CONTROLLER
-            self.op25Manager.switchGroup(tgids)
+            record = self.op25Manager.overrideWhitelist(tgids, label=payload.get("name") or "whitelist")
+            if record is None:
+                return jsonify({"error": "OP25 is not running"}), 503
 
-            return jsonify({"message": "TGIDs added to whitelist", "payload": payload}), 200
+            return jsonify({"message": "TGIDs added to whitelist", "switch": record.to_dict()}), 202
         
         # 22: BLACKLIST TGID (LOCKOUT COMMAND IN CONTROLLER)
         @self.app.route('/session/controller/lockout/<int:tgid>', methods=['PUT'])
@@ -432,26 +606,76 @@ class API:
 
         # ======    STREAMING & LOGGING      =======
 
-        # 25: [POST] Receive log data for SSE broadcast
+        # 24B: [GET] Recent channel switches and their latency (written / acked / confirmed, ms)
+        @self.app.route('/controller/switches', methods=['GET'])
+        def switch_stats():
+            return jsonify(self.op25Manager.switchTracker.stats()), 200
+
+        # 24C: [GET] Generated OP25 file cache: directory, hit/miss counters and live links
+        @self.app.route('/controller/artifacts', methods=['GET'])
+        def artifact_stats():
+            return jsonify(self.op25Manager.artifacts.stats()), 200
+
+        # 24D: [GET] rx.py startup states (ms since spawn). ?wait=<state>&timeout=<s> blocks until the state is reached
+        @self.app.route('/controller/readiness', methods=['GET'])
+        def readiness():
+            state = request.args.get("wait")
+            if state:
+                timeout = min(request.args.get("timeout", default=10.0, type=float), 30.0)
+                try:
+                    self.op25Manager.readiness.wait_for(state, timeout)
+                except ValueError as e:
+                    return jsonify({"error": str(e)}), 400
+            return jsonify(self.op25Manager.readiness.to_dict()), 200
+
+        # 24E: [GET] rx.py supervisor: state, uptime, restart/crash counts and the last classified exit
+        @self.app.route('/controller/supervisor', methods=['GET'])
+        def supervisor_stats():
+            return jsonify(self.op25Manager.supervisor.to_dict()), 200
+
+        # 25: [POST] Receive log data from an external source for SSE broadcast
         @self.app.route('/controller/logging/update', methods=['POST'])
         def receive_log_update():
             data = request.get_json() or {}
-            self.logQueue.put(data)
+            self.eventBus.publish(ALL_LOG_TOPIC, data)
+            self.eventBus.publish(LOG_TOPIC, data)
             return jsonify(success=True), 200
 
-        # 26: [GET] Stream log data as Server-Sent Events (SSE)
+        # 26: [GET] Stream log data as Server-Sent Events (SSE); each client gets its own buffer
         @self.app.route('/controller/logging/stream', methods=['GET'])
         def logging_stream():
-            
-            def log_event_stream():
-                while True:
-                    try:
-                        data = self.logQueue.get(timeout=5)
-                        yield f"data: {json.dumps(data)}\n\n"
-                    except Empty:
-                        # Prevent client timeout
-                        yield f": keep-alive\n\n"
-            return Response(log_event_stream(), mimetype='text/event-stream')
+            last_event_id = request.headers.get("Last-Event-ID") or request.args.get("lastEventId")
+            try:
+                last_event_id = int(last_event_id) if last_event_id else None
+            except ValueError:
+                last_event_id = None
+            return Response(self.logBroadcaster.stream(last_event_id), mimetype='text/event-stream')
+
+        # 26B: [GET] Backfill parsed log entries newer than ?since=<seq>, optionally filtered by ?action=
+        @self.app.route('/controller/logging/history', methods=['GET'])
+        def logging_history():
+            try:
+                since = self._int_arg("since", 0)
+                limit = self._int_arg("limit")
+                action = request.args.get("action")
+                action = LogAction.parse(action) if action else None
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            history = self.logMonitor.history
+            records = history.since(since, action=action, limit=limit)
+            return jsonify({
+                "first_seq": history.first_seq,
+                "last_seq": history.last_seq,
+                "entries": [record.to_dict() for record in records]
+            }), 200
+
+        # 26C: [GET] Recorded calls, newest first. ?tgid=<tgid>&since=<unix time>&limit=<n>
+        @self.app.route('/calls', methods=['GET'])
+        def get_calls():
+            tgid = request.args.get("tgid", default=None, type=int)
+            since = request.args.get("since", default=None, type=float)
+            limit = max(1, min(request.args.get("limit", default=100, type=int), 1000))
+            return jsonify(self.callLog.query(tgid=tgid, since=since, limit=limit)), 200
 
         # 27: [GET] Stream OP25 TGID update progress (0–100) as SSE
         @self.app.route('/controller/progress', methods=['GET'])
@@ -479,7 +703,8 @@ class API:
         # 29: [GET] GET THE ENTIRE SYSTEMS FILE
         @self.app.route('/admin/systems/', methods=['GET'])
         def admin_systems_get():
-            return jsonify(self.sessionManager.systemsManager.data), 200
+            snapshot = self.sessionManager.catalog.current
+            return self._cached_json("systems", snapshot.etag_for("systems"), lambda: snapshot.systems.data)
         
         # 30:[POST] UPDATE THE ENTIRE SYSTEMS FILE
         @self.app.route('/admin/systems/update', methods=['POST'])
@@ -489,16 +714,34 @@ class API:
             if not data:
                 return jsonify({"error": "No data received"}), 400
             try:
-                self.sessionManager.systemsManager.update(data)  # your existing update logic
-                return jsonify({"status": "ok"}), 200  # ✅ must return something
+                snapshot = self.sessionManager.updateSystems(data)
+                return jsonify({"status": "ok", "version": snapshot.version}), 200
             except Exception as e:
                 return jsonify({"error": str(e)}), 500  # ✅ handles errors gracefully
                 data = request.get_json()
                 
         # 31: [GET] Get all TGIDs
+        #     With ?sys=&offset=&limit=&cursor=&fields= returns one page ordered by (sys, tgid):
+        #     {"items": [{"sys": 0, "tgid": ..., ...}], "total": n, "next_cursor": "...", "version": v}
         @self.app.route('/admin/talkgroups/all', methods=['GET'])
         def get_all_tgid_objects():
-            return jsonify(self.sessionManager.talkgroupsManager._data)
+            snapshot = self.sessionManager.catalog.current
+            if not any(arg in request.args for arg in ("sys", "offset", "limit", "cursor", "fields")):
+                return self._cached_json("talkgroups", snapshot.etag_for("talkgroups"), lambda: snapshot.talkgroups._data)
+            try:
+                offset, limit, fields = self._paging_args()
+                sys_index = self._int_arg("sys")
+                cursor = request.args.get("cursor")
+                after = decode_cursor(cursor, 2) if cursor else None
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            items, next_after, total = snapshot.talkgroups.page(sys_index=sys_index, after=after, offset=offset, limit=limit)
+            return jsonify({
+                "items": [fields.apply({"sys": sys, **tg.to_dict()}) for sys, tg in items],
+                "total": total,
+                "next_cursor": encode_cursor(*next_after) if next_after is not None else None,
+                "version": snapshot.version
+            }), 200
 
         # 30:[POST] UPDATE THE ENTIRE ZONES FILE
         @self.app.route('/admin/zones/update', methods=['POST'])
@@ -508,17 +751,86 @@ class API:
             if not data:
                 return jsonify({"error": "No data received"}), 400
             try:
-                self.sessionManager.zoneManager.update(data)  # Call your updated method
-                return jsonify({"status": "ok"}), 200
+                snapshot = self.sessionManager.updateZones(data)
+                return jsonify({"status": "ok", "version": snapshot.version}), 200
             except Exception as e:
                 return jsonify({"error": str(e)}), 500
     
+        # ====== CATALOG DELTAS: PATCH ADDS OR UPDATES ONE ENTRY, DELETE REMOVES IT ======
+        # SEND THE ETag FROM THE LAST RESPONSE AS If-Match; 412 MEANS SOMEONE ELSE CHANGED THE CATALOG FIRST
+
+        # 30A: [PATCH/DELETE] One talkgroup in a system's talkgroup set
+        @self.app.route('/admin/talkgroups/<int:sys_index>/<int:tgid>', methods=['PATCH', 'DELETE'])
+        @self.dynamic_cross_origin()
+        def admin_talkgroup_delta(sys_index, tgid):
+            return self._catalog_delta("talkgroups", lambda tg, fields: tg.with_talkgroup(sys_index, tgid, fields))
+
+        # 30B: [PATCH/DELETE] One system
+        @self.app.route('/admin/systems/<int:index>', methods=['PATCH', 'DELETE'])
+        @self.dynamic_cross_origin()
+        def admin_system_delta(index):
+            return self._catalog_delta("systems", lambda systems, fields: systems.with_system(index, fields))
+
+        # 30C: [PATCH/DELETE] One zone (PATCH the next free index to add a zone)
+        @self.app.route('/admin/zones/<int:zone_index>', methods=['PATCH', 'DELETE'])
+        @self.dynamic_cross_origin()
+        def admin_zone_delta(zone_index):
+            return self._catalog_delta("zones", lambda zones, fields: zones.with_zone(zone_index, fields))
+
+        # 30D: [PATCH/DELETE] One channel in a zone
+        @self.app.route('/admin/zones/<int:zone_index>/channels/<int:channel_number>', methods=['PATCH', 'DELETE'])
+        @self.dynamic_cross_origin()
+        def admin_channel_delta(zone_index, channel_number):
+            return self._catalog_delta("zones", lambda zones, fields: zones.with_channel(zone_index, channel_number, fields))
+
+        # 30E: [POST] Stream a talkgroup CSV (Decimal,Alpha Tag[,Priority][,Category]) into a system's set.
+        #      Raw text/csv body or multipart "file". ?mode=replace drops talkgroups missing from the file;
+        #      it is refused (400) if nothing was imported, or if rows were skipped unless ?force=true.
+        #      Progress is reported on /controller/progress.
+        @self.app.route('/admin/talkgroups/<int:sys_index>/import', methods=['POST'])
+        @self.dynamic_cross_origin()
+        def admin_talkgroup_import(sys_index):
+            if self.sessionManager.talkgroupsManager.getTalkgroupSetBySysIndex(sys_index) is None:
+                return jsonify({"error": f"No talkgroup set for system {sys_index}"}), 404
+            try:
+                expected = self.sessionManager.catalog.expected_version(request.headers.get("If-Match"))
+            except ValueError:
+                return jsonify({"error": "Invalid version"}), 400
+            replace = request.args.get("mode", "merge") == "replace"
+            force = request.args.get("force", "false").lower() in ("1", "true", "yes")
+
+            upload = request.files.get("file") if request.mimetype == "multipart/form-data" else None
+            stream, total = (upload.stream, None) if upload else (request.stream, request.content_length)
+
+            self.set_progress(0)
+            importer = TalkgroupCSVImporter(batch_size=self.configManager.getint("catalog", "import_batch_size", fallback=500),
+                                            progress=self.set_progress)
+            talkgroups = importer.read(stream, total)
+            if replace and not talkgroups:
+                return jsonify({"error": "Nothing to import; replace would empty the talkgroup set",
+                                **importer.summary(0)}), 400
+            if replace and importer.skipped and not force:
+                return jsonify({"error": f"{importer.skipped} row(s) skipped; repeat with force=true to replace anyway",
+                                **importer.summary(0)}), 400
+            imported = len(talkgroups)
+            try:
+                snapshot = self.sessionManager.patchCatalog(
+                    "talkgroups", lambda tg: tg.with_talkgroups(sys_index, talkgroups, replace=replace), expected)
+            except CatalogConflict as e:
+                return jsonify({"error": str(e), "version": e.current}), 412
+            except KeyError as e:
+                return jsonify({"error": e.args[0] if e.args else "Not found"}), 404
+            except (TypeError, ValueError) as e:
+                return jsonify({"error": str(e)}), 400
+            response = jsonify({**importer.summary(imported), "version": snapshot.version})
+            response.headers["ETag"] = snapshot.etag
+            return response, 200
+
         # 31: [GET] GET CONFIG FILE
         @self.app.route('/admin/config/get', methods=['GET'])
         @self.dynamic_cross_origin()
         def get_config_file():
-            config = self.configManager.toJson()
-            return jsonify(config), 200
+            return self._cached_json("config", f'"config-{self.configManager.version}"', self.configManager.toJson)
         
         # 32: [GET] GET SPECIFIC DEVICE SETTING
         @self.app.route('/admin/config/device/<property>', methods=['GET'])
@@ -564,8 +876,8 @@ class API:
         def post_talkgroups_file():
             try:
                 tgupdate = request.get_json(force=True)
-                self.sessionManager.talkgroupsManager.update(tgupdate)
-                return {"success": "reload command sent."}, 200
+                snapshot = self.sessionManager.updateTalkgroups(tgupdate)
+                return {"success": "reload command sent.", "version": snapshot.version}, 200
             except Exception as e:
                 return {"error": str(e)}, 500
             
@@ -23,15 +23,21 @@ function listenLogStream() {
 
       const updateType = data.Action || data.Update;
       const tgid = data["Talkgroup"] || -1;
-      if (updateType === "voice update" && tgid !== -1) {
-        try {
-          const response = await fetch(API_BASE_URL + APIEndpoints.SESSION.TALKGROUP_NAME(tgid));
-          const jsonData = await response.json();
-          const el = document.getElementById("talkgroup");
-          if (el) el.textContent = jsonData.name;
-        } catch (fetchError) {
-          console.error("Error fetching talkgroup name:", fetchError);
+      const isCall = updateType === "call_start" || updateType === "call_update" || updateType === "voice update";
+      if (isCall && tgid !== -1) {
+        // The server attaches the talkgroup name; only look it up if it is missing
+        let name = data["Talkgroup Name"];
+        if (!name) {
+          try {
+            const response = await fetch(API_BASE_URL + APIEndpoints.SESSION.TALKGROUP_NAME(tgid));
+            const jsonData = await response.json();
+            name = jsonData.name;
+          } catch (fetchError) {
+            console.error("Error fetching talkgroup name:", fetchError);
+          }
         }
+        const el = document.getElementById("talkgroup");
+        if (el && name) el.textContent = name;
       }
     } catch (parseError) {
       console.warn("Invalid log stream data:", parseError);
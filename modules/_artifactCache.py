@@ -0,0 +1,139 @@
+# _artifactCache.py
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, Iterable, TextIO
+
+
+def write_lines(f: TextIO, values: Iterable):
+    """Writes one value per line (whitelist/blacklist format)."""
+    for value in values:
+        f.write(f"{value}\n")
+
+
+def digest_of(kind: str, rows: Iterable) -> str:
+    """Hashes the inputs of an artifact: its kind plus every row, in order."""
+    h = hashlib.sha256(kind.encode())
+    for row in rows:
+        h.update(b"\x1e")
+        h.update(repr(row).encode())
+    return h.hexdigest()[:24]
+
+
+class ArtifactCache:
+    """
+    Content-addressed store for the files OP25 is started with (trunk TSV,
+    talkgroup CSV, whitelist and blacklist).
+
+    An artifact is named after a hash of its inputs (`tgroups-<digest>.csv`), so a
+    file that already exists is by definition up to date and is never rewritten;
+    restarting with an unchanged 30k talkgroup set costs a hash, not a multi-MB
+    write. New files are written to a temp name and renamed into place. The
+    directory should be on tmpfs (/dev/shm by default).
+
+    Files that rx.py must re-read after a change (whitelist/blacklist) are given
+    to it through link(): a stable name that is atomically re-pointed at another
+    artifact, so a hot switch back to an earlier channel writes nothing at all.
+    Only the newest `keep` artifacts per kind are kept; linked ones never expire.
+    """
+    def __init__(self, directory: str = None, keep: int = 16):
+        self._directory = self._usable_directory(directory)
+        self._keep = keep
+        self._lock = threading.Lock()
+        self._links: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes_written = 0
+
+    @staticmethod
+    def _usable_directory(directory: str) -> str:
+        for candidate in (directory, os.path.join(tempfile.gettempdir(), "op25-artifacts")):
+            if not candidate:
+                continue
+            try:
+                os.makedirs(candidate, exist_ok=True)
+                return candidate
+            except OSError as e:
+                logging.error(f"Artifact directory {candidate} unavailable: {e}")
+        raise OSError("No writable artifact directory")
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def materialize(self, kind: str, suffix: str, digest: str, write: Callable[[TextIO], None]) -> str:
+        """
+        Returns the path of the artifact for digest, calling write(file) only if it does not exist yet.
+
+        Raises:
+            OSError: If the file cannot be written.
+        """
+        path = os.path.join(self._directory, f"{kind}-{digest}{suffix}")
+        try:
+            os.utime(path)  # KEEPS IT NEWEST FOR PRUNING
+        except FileNotFoundError:
+            pass  # NEVER WRITTEN, OR PRUNED BY ANOTHER THREAD: A MISS
+        else:
+            with self._lock:
+                self.hits += 1
+            return path
+
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", newline='') as f:
+                write(f)
+                written = f.tell()
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            self.misses += 1
+            self.bytes_written += written
+        self._prune(kind, suffix)
+        return path
+
+    def link(self, name: str, target: str) -> str:
+        """Atomically points the stable path `name` at an artifact and returns the stable path."""
+        path = os.path.join(self._directory, name)
+        tmp_path = f"{path}.{threading.get_ident()}.lnk"
+        with self._lock:
+            if self._links.get(path) == target and os.path.realpath(path) == os.path.realpath(target):
+                return path
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+            os.symlink(target, tmp_path)
+            os.replace(tmp_path, path)
+            self._links[path] = target
+        return path
+
+    def _prune(self, kind: str, suffix: str):
+        prefix = f"{kind}-"
+        with self._lock:
+            linked = set(self._links.values())
+        try:
+            entries = [e for e in os.scandir(self._directory)
+                       if e.name.startswith(prefix) and e.name.endswith(suffix) and e.is_file(follow_symlinks=False)]
+        except OSError:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        for entry in entries[self._keep:]:
+            if entry.path in linked:
+                continue
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "directory": self._directory,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes_written": self.bytes_written,
+                "links": {os.path.basename(path): os.path.basename(target) for path, target in self._links.items()}
+            }
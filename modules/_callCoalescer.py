@@ -0,0 +1,170 @@
+# _callCoalescer.py
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from modules._eventBus import EventBus
+
+CALL_TOPIC = "op25.call"  # call_start / call_update / call_end events built from voice updates
+
+CALL_START = "call_start"
+CALL_UPDATE = "call_update"
+CALL_END = "call_end"
+
+MIN_REAP_INTERVAL = 0.05  # Seconds; keeps the reaper from spinning when an interval is configured as 0
+
+
+class _ActiveCall:
+    __slots__ = ("tgid", "freq", "priority", "name", "sys_index", "in_scan", "start_wall", "start", "last_seen",
+                 "last_emit", "updates")
+
+    def __init__(self, tgid: int, freq: int, priority: int, name: str, sys_index: Optional[int], now: float,
+                 in_scan: Optional[bool] = None):
+        self.tgid = tgid
+        self.freq = freq
+        self.priority = priority
+        self.name = name
+        self.sys_index = sys_index
+        self.in_scan = in_scan
+        self.start_wall = time.time()
+        self.start = now
+        self.last_seen = now
+        self.last_emit = now
+        self.updates = 1
+
+
+class CallCoalescer:
+    """
+    Turns the stream of OP25 "voice update" lines into per-call events.
+
+    OP25 repeats a voice update for the same tgid many times a second during a
+    transmission. Each (tgid, freq) pair produces one call_start, at most one
+    call_update per min_interval seconds, and a call_end once no voice update
+    has been seen for end_timeout seconds. duid lines for an active tgid count as
+    activity too. Events carry the talkgroup name and in-scan flag that the log
+    monitor already resolved, so browsers don't need to look them up.
+
+    Args:
+        system_index (callable, optional): Returns the active system index, recorded
+            on each call when it starts.
+    """
+    VOICE_ACTION = "voice update"
+
+    def __init__(self, bus: EventBus, min_interval: float = 1.0, end_timeout: float = 2.0,
+                 system_index: Optional[Callable[[], int]] = None):
+        self._bus = bus
+        self._system_index = system_index
+        self._min_interval = min_interval
+        self._end_timeout = end_timeout
+        self._calls: Dict[Tuple[int, int], _ActiveCall] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def active_calls(self) -> int:
+        return len(self._calls)
+
+    def start(self):
+        """Starts the background thread that ends calls which have gone quiet."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._reaper, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops the reaper and ends every call still in progress, so call_end subscribers record them."""
+        self._stop.set()
+        self.end_all()
+
+    def on_entry(self, entry: dict):
+        """Event bus callback for parsed log entries. Ignores everything but voice updates and duids."""
+        action = entry.get("Action", "")
+        if action != self.VOICE_ACTION:
+            if action.startswith("duid"):
+                self._touch(entry)
+            return
+        try:
+            tgid = int(entry["Talkgroup"])
+            freq = int(entry.get("Frequency") or 0)
+            priority = int(entry.get("Priority") or 0)
+        except (KeyError, TypeError, ValueError):
+            return
+        name = entry.get("Talkgroup Name", "")
+        now = time.monotonic()
+        key = (tgid, freq)
+
+        event = None
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _ActiveCall(tgid, freq, priority, name, self._current_system(), now, entry.get("In Scan"))
+                self._calls[key] = call
+                event = self._event(CALL_START, call, now)
+            else:
+                call.last_seen = now
+                call.updates += 1
+                call.priority = priority
+                if now - call.last_emit >= self._min_interval:
+                    call.last_emit = now
+                    event = self._event(CALL_UPDATE, call, now)
+        if event:
+            self._bus.publish(CALL_TOPIC, event)
+
+    def _touch(self, entry: dict):
+        """Keeps calls on the entry's tgid alive without emitting anything."""
+        try:
+            tgid = int(entry["Talkgroup"])
+        except (KeyError, TypeError, ValueError):
+            return
+        now = time.monotonic()
+        with self._lock:
+            for call in self._calls.values():
+                if call.tgid == tgid:
+                    call.last_seen = now
+
+    def _current_system(self) -> Optional[int]:
+        if self._system_index is None:
+            return None
+        try:
+            return self._system_index()
+        except Exception:
+            return None
+
+    def flush(self, now: Optional[float] = None):
+        """Emits call_end for every call idle longer than end_timeout."""
+        now = now if now is not None else time.monotonic()
+        ended = []
+        with self._lock:
+            for key, call in list(self._calls.items()):
+                if now - call.last_seen >= self._end_timeout:
+                    del self._calls[key]
+                    ended.append(self._event(CALL_END, call, call.last_seen))
+        for event in ended:
+            self._bus.publish(CALL_TOPIC, event)
+
+    def end_all(self):
+        """Emits call_end for every active call, e.g. at shutdown."""
+        with self._lock:
+            calls, self._calls = list(self._calls.values()), {}
+        for call in calls:
+            self._bus.publish(CALL_TOPIC, self._event(CALL_END, call, call.last_seen))
+
+    def _reaper(self):
+        interval = max(MIN_REAP_INTERVAL, min(self._min_interval, self._end_timeout) / 2)
+        while not self._stop.wait(interval):
+            self.flush()
+
+    @staticmethod
+    def _event(action: str, call: _ActiveCall, now: float) -> dict:
+        return {
+            "Action": action,
+            "Talkgroup": call.tgid,
+            "Frequency": call.freq,
+            "Priority": call.priority,
+            "Talkgroup Name": call.name,
+            "System": call.sys_index,
+            "In Scan": call.in_scan,
+            "Start": call.start_wall,
+            "Duration": round(now - call.start, 3),
+            "Updates": call.updates
+        }
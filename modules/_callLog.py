@@ -0,0 +1,155 @@
+# _callLog.py
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from typing import List, Optional
+
+from modules._callCoalescer import CALL_END
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    duration REAL NOT NULL,
+    tgid INTEGER NOT NULL,
+    freq INTEGER,
+    priority INTEGER,
+    sys_index INTEGER,
+    name TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_calls_start ON calls (start);
+CREATE INDEX IF NOT EXISTS idx_calls_tgid_start ON calls (tgid, start);
+"""
+
+COLUMNS = ("id", "start", "end", "duration", "tgid", "freq", "priority", "sys_index", "name")
+
+
+class CallLog:
+    """
+    Stores finished calls in a local SQLite database.
+
+    Calls arrive as call_end events from the CallCoalescer and are buffered in
+    memory. A writer thread commits the buffer in one transaction every
+    commit_interval seconds, or sooner once batch_size calls are waiting, so the
+    SD card sees a few commits per minute instead of one per log line. While
+    commits keep failing at most max_pending calls are held; the oldest are dropped.
+    """
+    def __init__(self, db_path: str, commit_interval: float = 20.0, batch_size: int = 500,
+                 max_pending: int = 50000):
+        self._db_path = db_path
+        self._commit_interval = commit_interval
+        self._batch_size = batch_size
+        self._max_pending = max_pending  # Calls kept in memory while the database keeps failing
+        self._pending: List[tuple] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.commits = 0
+        self.dropped = 0
+
+        directory = os.path.dirname(self._db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @property
+    def db_path(self) -> str:
+        return self._db_path
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._db_path, timeout=5)
+
+    def start(self):
+        """Starts the background writer thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops the writer thread after committing anything still buffered."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def on_call(self, event: dict):
+        """Event bus callback for call events. Only call_end events are recorded."""
+        if event.get("Action") != CALL_END:
+            return
+        start = event.get("Start")
+        duration = event.get("Duration") or 0.0
+        if start is None:
+            return
+        row = (start, start + duration, duration, event.get("Talkgroup"), event.get("Frequency"),
+               event.get("Priority"), event.get("System"), event.get("Talkgroup Name"))
+        with self._lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self._batch_size
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Commits all buffered calls in one transaction. Returns the number written."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT INTO calls (start, end, duration, tgid, freq, priority, sys_index, name) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.commits += 1
+        except sqlite3.Error as e:
+            logging.error(f"CallLog commit failed, keeping {len(rows)} calls for the next attempt: {e}")
+            with self._lock:
+                pending = rows + self._pending
+                dropped = len(pending) - self._max_pending
+                if dropped > 0:
+                    pending = pending[dropped:]  # OLDEST CALLS GO FIRST
+                    self.dropped += dropped
+                    logging.error(f"CallLog buffer full, dropped the {dropped} oldest calls")
+                self._pending = pending
+            return 0
+        return len(rows)
+
+    def _writer(self):
+        while not self._stop.is_set():
+            self._wake.wait(self._commit_interval)
+            self._wake.clear()
+            self.flush()
+
+    def query(self, tgid: Optional[int] = None, since: Optional[float] = None, limit: int = 100) -> List[dict]:
+        """
+        Returns recorded calls, newest first.
+
+        Args:
+            tgid (int, optional): Only calls on this talkgroup.
+            since (float, optional): Only calls that started at or after this Unix time.
+            limit (int): Maximum number of calls to return.
+        """
+        clauses, params = [], []
+        if tgid is not None:
+            clauses.append("tgid = ?")
+            params.append(tgid)
+        if since is not None:
+            clauses.append("start >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM calls {where} ORDER BY start DESC LIMIT ?", params
+            ).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
@@ -0,0 +1,146 @@
+# _catalog.py
+import threading
+import time
+from typing import Callable, Dict, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from modules._systemsManager import systemsManager
+    from modules._talkgroupSet import TalkgroupManager
+    from modules._zoneManager import zoneManager
+
+
+class CatalogConflict(Exception):
+    """Raised when a change was based on a catalog version that is no longer current."""
+    def __init__(self, expected: int, current: int):
+        super().__init__(f"Catalog changed: expected version {expected}, current version is {current}")
+        self.expected = expected
+        self.current = current
+
+
+class CatalogSnapshot:
+    """
+    One immutable, versioned view of the radio catalog: systems, zones and their
+    channels, talkgroup sets, and every lookup the managers build over them.
+
+    A published snapshot is never modified. Readers take `Catalog.current` once and
+    use it for the whole request, so they never lock and never see a half-rebuilt
+    state. Admin writes build replacement managers off to the side and publish a
+    new snapshot with `Catalog.apply`.
+    """
+    __slots__ = ("_version", "_epoch", "_zones", "_systems", "_talkgroups")
+
+    def __init__(self, version: int, zones: "zoneManager", systems: "systemsManager",
+                 talkgroups: "TalkgroupManager", epoch: str = ""):
+        object.__setattr__(self, "_version", version)
+        object.__setattr__(self, "_epoch", epoch)
+        object.__setattr__(self, "_zones", zones)
+        object.__setattr__(self, "_systems", systems)
+        object.__setattr__(self, "_talkgroups", talkgroups)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CatalogSnapshot is immutable; publish a new one with Catalog.apply()")
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def etag(self) -> str:
+        return self.etag_for()
+
+    def etag_for(self, *parts) -> str:
+        """
+        Returns an ETag for something derived from this snapshot, e.g. etag_for("zones").
+        It starts with the catalog epoch and version, so versions from an earlier run never match.
+        """
+        return '"' + "-".join([self._epoch, str(self._version)] + [str(part) for part in parts]) + '"'
+
+    @property
+    def zones(self) -> "zoneManager":
+        return self._zones
+
+    @property
+    def systems(self) -> "systemsManager":
+        return self._systems
+
+    @property
+    def talkgroups(self) -> "TalkgroupManager":
+        return self._talkgroups
+
+    def replace(self, zones=None, systems=None, talkgroups=None) -> "CatalogSnapshot":
+        """Returns the next version of this snapshot with the given parts replaced."""
+        return CatalogSnapshot(
+            self._version + 1,
+            zones if zones is not None else self._zones,
+            systems if systems is not None else self._systems,
+            talkgroups if talkgroups is not None else self._talkgroups,
+            self._epoch
+        )
+
+
+class Catalog:
+    """
+    Holds the current CatalogSnapshot and publishes new ones with a single
+    reference swap. Writers are serialized; readers never lock.
+    """
+    def __init__(self, zones: "zoneManager", systems: "systemsManager", talkgroups: "TalkgroupManager"):
+        self._epoch = format(time.time_ns() // 1000, "x")  # Versions restart at 1 on every run
+        self._current = CatalogSnapshot(1, zones, systems, talkgroups, self._epoch)
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> CatalogSnapshot:
+        return self._current
+
+    @property
+    def version(self) -> int:
+        return self._current.version
+
+    def expected_version(self, value) -> Optional[int]:
+        """
+        Parses an If-Match value (an ETag from etag_for, optionally weak) or a plain version
+        number. '*' and empty mean any version. ETags from an earlier run return 0, which
+        never matches, so the change is rejected as a conflict.
+
+        Raises:
+            ValueError: If the value is not a version or catalog ETag.
+        """
+        if value is None:
+            return None
+        value = str(value).strip()
+        if value.startswith("W/"):
+            value = value[2:]
+        value = value.strip('"')
+        if value in ("", "*"):
+            return None
+        parts = value.split("-")
+        if len(parts) == 1:
+            return int(parts[0])
+        if parts[0] != self._epoch:
+            return 0
+        return int(parts[1])
+
+    def apply(self, change: Callable[[CatalogSnapshot], Dict[str, object]],
+              expected_version: Optional[int] = None) -> CatalogSnapshot:
+        """
+        Runs change(current) under the writer lock and publishes the result.
+
+        Args:
+            change (callable): Receives the current snapshot and returns the parts to
+                replace as keyword arguments for CatalogSnapshot.replace, e.g.
+                {"zones": new_zone_manager}. Exceptions propagate and nothing is published.
+            expected_version (int, optional): Version the change was based on.
+
+        Returns:
+            CatalogSnapshot: The newly published snapshot.
+
+        Raises:
+            CatalogConflict: If expected_version is given and is not the current version.
+        """
+        with self._lock:
+            current = self._current
+            if expected_version is not None and expected_version != current.version:
+                raise CatalogConflict(expected_version, current.version)
+            snapshot = current.replace(**change(current))
+            self._current = snapshot
+        return snapshot
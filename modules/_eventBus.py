@@ -0,0 +1,53 @@
+# _eventBus.py
+import logging
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+# TOPICS
+LOG_TOPIC = "op25.log"  # Parsed OP25 stderr entries (dicts from logMonitorOP25.interpretLine) that pass the log filter
+ALL_LOG_TOPIC = "op25.log.all"  # Every parsed entry, filtered or not; for in-process trackers, not for output
+
+
+class EventBus:
+    """
+    In-process publish/subscribe bus.
+
+    Subscribers are plain callables registered per topic. publish() calls them
+    synchronously on the publishing thread, so subscribers must be quick (for
+    example, putting the event on their own queue). The subscriber list is
+    copied on write, so publishing never takes a lock.
+    """
+    def __init__(self):
+        self._subscribers: Dict[str, Tuple[Callable[[Any], None], ...]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str, callback: Callable[[Any], None]) -> Callable[[Any], None]:
+        """Registers callback for topic and returns it so it can be passed to unsubscribe()."""
+        with self._lock:
+            self._subscribers[topic] = self._subscribers.get(topic, ()) + (callback,)
+        return callback
+
+    def unsubscribe(self, topic: str, callback: Callable[[Any], None]):
+        """Removes callback from topic. Unknown callbacks are ignored."""
+        with self._lock:
+            current = self._subscribers.get(topic, ())
+            self._subscribers[topic] = tuple(cb for cb in current if cb is not callback)
+
+    def publish(self, topic: str, event: Any) -> int:
+        """
+        Delivers event to every subscriber of topic.
+
+        Returns:
+            int: The number of subscribers the event was delivered to.
+        """
+        delivered = 0
+        for callback in self._subscribers.get(topic, ()):
+            try:
+                callback(event)
+                delivered += 1
+            except Exception as e:
+                logging.error(f"EventBus subscriber failed on '{topic}': {e}")
+        return delivered
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._subscribers.get(topic, ()))
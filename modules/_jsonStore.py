@@ -0,0 +1,173 @@
+# _jsonStore.py
+import atexit
+import json
+import logging
+import os
+import shutil
+import threading
+from typing import Dict, Optional
+
+DEFAULT_DEBOUNCE = 1.0  # Seconds to wait for more changes before writing
+
+_NOTHING = object()
+
+
+class JsonStore:
+    """
+    Crash-safe reader/writer for one JSON data file (zones.json, systems.json, talkgroups.json).
+
+    Writes go to `<file>.tmp`, are fsynced, and replace the file with an atomic
+    rename, so a power cut leaves either the old or the new file, never a
+    truncated one. The old file is hard-linked (or copied) to the backup first,
+    so the primary path always exists. save() waits
+    `debounce` seconds and writes only the latest data, so a burst of edits costs
+    one write. Files are written as compact JSON.
+
+    load() is the single startup path: if the primary file is missing, empty or
+    corrupt it falls back to the backup, moves the bad file aside to
+    `<file>.corrupt` and restores the primary from the backup.
+
+    Use JsonStore.open() so all managers built over the same file share one store.
+    """
+    _stores: Dict[str, "JsonStore"] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, path: str, backup_suffix: str = ".bak", debounce: float = DEFAULT_DEBOUNCE):
+        self._path = path
+        self._backup_path = path + backup_suffix
+        self._debounce = debounce
+        self._pending = _NOTHING
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self.writes = 0
+        atexit.register(self.flush)
+
+    @classmethod
+    def open(cls, path: str, backup_suffix: str = ".bak") -> "JsonStore":
+        """Returns the shared store for path, creating it on first use."""
+        path = os.path.abspath(path)
+        with cls._stores_lock:
+            store = cls._stores.get(path)
+            if store is None:
+                store = cls._stores[path] = cls(path, backup_suffix)
+            return store
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def backup_path(self) -> str:
+        return self._backup_path
+
+    def load(self) -> Optional[dict]:
+        """
+        Returns the file's data, recovering from the backup if the primary is unreadable.
+        Returns None if neither file exists or can be read.
+        """
+        with self._lock:
+            try:
+                return self._read(self._path)
+            except FileNotFoundError:
+                primary_error = None
+            except (OSError, ValueError) as e:
+                primary_error = e
+                logging.error(f"JsonStore: {self._path} is unreadable: {e}")
+
+            try:
+                data = self._read(self._backup_path)
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError) as e:
+                logging.error(f"JsonStore: backup {self._backup_path} is unreadable too: {e}")
+                return None
+
+            if primary_error is not None:
+                os.replace(self._path, self._path + ".corrupt")
+            logging.error(f"JsonStore: restoring {self._path} from {self._backup_path}")
+            self._write(data)
+            return data
+
+    def save(self, data: dict):
+        """Schedules data to be written after the debounce window. Later calls replace earlier data."""
+        with self._lock:
+            self._pending = data
+            if self._timer is None:
+                self._timer = threading.Timer(self._debounce, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def write(self, data: dict):
+        """Writes data now, replacing anything scheduled by save()."""
+        with self._lock:
+            self._cancel_timer()
+            self._pending = _NOTHING
+            self._write(data)
+
+    def flush(self) -> bool:
+        """
+        Writes scheduled data now, if any. Returns True if something was written.
+        If the write fails the data stays scheduled for the next save() or flush().
+        """
+        with self._lock:
+            self._cancel_timer()
+            data, self._pending = self._pending, _NOTHING
+            if data is _NOTHING:
+                return False
+            try:
+                self._write(data)
+            except (OSError, TypeError, ValueError) as e:
+                logging.error(f"JsonStore: failed to write {self._path}, keeping the change pending: {e}")
+                self._pending = data
+                return False
+            return True
+
+    @staticmethod
+    def export(data: dict) -> str:
+        """Returns data as indented JSON for downloads and humans. The file itself stays compact."""
+        return json.dumps(data, indent=4)
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    @staticmethod
+    def _read(path: str) -> dict:
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def _write(self, data: dict):
+        tmp_path = self._path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(self._path):
+            self._backup()
+        os.replace(tmp_path, self._path)
+        self._fsync_dir()
+        self.writes += 1
+
+    def _backup(self):
+        """Makes the current primary the backup without ever removing the primary."""
+        backup_tmp = self._backup_path + ".tmp"
+        if os.path.lexists(backup_tmp):
+            os.remove(backup_tmp)
+        try:
+            os.link(self._path, backup_tmp)
+        except OSError:
+            shutil.copy2(self._path, backup_tmp)  # Filesystems without hard links
+        os.replace(backup_tmp, self._backup_path)
+
+    def _fsync_dir(self):
+        try:
+            fd = os.open(os.path.dirname(self._path) or ".", os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
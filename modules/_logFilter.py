@@ -0,0 +1,114 @@
+# _logFilter.py
+import threading
+import time
+from typing import Dict, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from modules.myConfiguration import MyConfig
+
+PASS = "pass"    # Build and publish every entry
+DROP = "drop"    # Discard without counting
+COUNT = "count"  # Discard, but report how many were seen in the periodic summary
+SAMPLE = "sample"  # Keep one entry in every N ("sample:N"), count the rest
+
+# Filter classes. Each LinePattern names one in its category; unrecognised lines are "misc".
+CATEGORIES = ("voice", "talkgroup", "nac", "hold", "duid", "config", "misc")
+
+SUMMARY_ACTION = "filter_summary"
+
+
+class LogFilterPolicy:
+    """
+    Decides per filter class whether a parsed line becomes a log entry.
+
+    Rules decide what reaches the outputs (history, SSE, external endpoint); the
+    in-process trackers still see every recognised line. Suppressed lines the
+    parser could not classify are never built at all. Lines that are counted or
+    sampled out are reported by summary() at most once per summary_interval seconds.
+
+    Args:
+        rules (dict): Filter class -> "pass", "drop", "count" or "sample:N".
+            Classes without a rule pass.
+        summary_interval (float): Minimum seconds between summaries.
+    """
+    def __init__(self, rules: Optional[Dict[str, str]] = None, summary_interval: float = 60.0):
+        self._modes: Dict[str, str] = {}
+        self._every: Dict[str, int] = {}
+        self._seen: Dict[str, int] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._summary_interval = summary_interval
+        self._last_summary = time.monotonic()
+        self._lock = threading.Lock()
+        for category, rule in (rules or {}).items():
+            self.set_rule(category, rule)
+
+    @classmethod
+    def from_config(cls, config: "MyConfig") -> "LogFilterPolicy":
+        """Reads filter_<class> keys and filter_summary_interval from the [logging] section."""
+        rules = {}
+        for category in CATEGORIES:
+            rule = config.get("logging", f"filter_{category}", fallback=None)
+            if rule:
+                rules[category] = rule
+        interval = config.getfloat("logging", "filter_summary_interval", fallback=60.0)
+        return cls(rules, summary_interval=interval)
+
+    @property
+    def summary_interval(self) -> float:
+        return self._summary_interval
+
+    @property
+    def active(self) -> bool:
+        """True if any class is dropped, counted or sampled."""
+        return any(mode != PASS for mode in self._modes.values())
+
+    def set_rule(self, category: str, rule: str):
+        rule = rule.strip().lower()
+        mode, _, arg = rule.partition(":")
+        if mode == SAMPLE:
+            try:
+                every = int(arg)
+            except ValueError:
+                raise ValueError(f"Filter rule for '{category}' must look like 'sample:N', got '{rule}'")
+            if every < 1:
+                raise ValueError(f"Filter rule for '{category}' needs N >= 1, got '{rule}'")
+            self._every[category] = every
+        elif mode not in (PASS, DROP, COUNT):
+            raise ValueError(f"Unknown filter rule '{rule}' for '{category}'")
+        self._modes[category] = mode
+
+    def admit(self, category: str) -> bool:
+        """Returns True if a line of this class should be turned into an entry."""
+        mode = self._modes.get(category, PASS)
+        if mode == PASS:
+            return True
+        if mode == DROP:
+            return False
+        with self._lock:
+            if mode == SAMPLE:
+                seen = self._seen.get(category, 0)
+                self._seen[category] = seen + 1
+                if seen % self._every[category] == 0:
+                    return True
+            self._suppressed[category] = self._suppressed.get(category, 0) + 1
+        return False
+
+    def summary(self, force: bool = False) -> Optional[dict]:
+        """
+        Returns a summary entry of suppressed lines since the last summary, or None
+        if the interval has not elapsed or nothing was suppressed.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_summary < self._summary_interval:
+            return None
+        with self._lock:
+            counts, self._suppressed = self._suppressed, {}
+            elapsed = now - self._last_summary
+            self._last_summary = now
+        if not counts:
+            return None
+        return {
+            "Action": SUMMARY_ACTION,
+            "Suppressed": counts,
+            "Interval": round(elapsed, 1)
+        }
@@ -0,0 +1,163 @@
+# _logHistory.py
+import threading
+import time
+from enum import IntEnum
+from typing import List, Optional
+
+
+class LogAction(IntEnum):
+    """Compact action codes for stored log records."""
+    MISC = 0
+    VOICE_UPDATE = 1
+    ADDED_TALKGROUP = 2
+    RECONFIG_NAC = 3
+    HOLD = 4
+    DUID = 5
+    CONFIG = 6
+
+    @property
+    def label(self) -> str:
+        """The action text OP25 uses for this code."""
+        return _ACTION_LABELS[self]
+
+    @classmethod
+    def from_entry(cls, entry: dict) -> "LogAction":
+        action = entry.get("Action", "")
+        code = _ACTION_CODES.get(action)
+        if code is not None:
+            return code
+        if action.startswith("duid"):
+            return cls.DUID
+        if "Config" in entry:
+            return cls.CONFIG
+        return cls.MISC
+
+    @classmethod
+    def parse(cls, value: str) -> "LogAction":
+        """Accepts an OP25 action label ("voice update") or a code name ("VOICE_UPDATE")."""
+        code = _ACTION_CODES.get(value)
+        if code is not None:
+            return code
+        try:
+            return cls[value.strip().upper().replace(" ", "_")]
+        except KeyError:
+            raise ValueError(f"Unknown log action '{value}'")
+
+
+_ACTION_LABELS = {
+    LogAction.MISC: "Misc",
+    LogAction.VOICE_UPDATE: "voice update",
+    LogAction.ADDED_TALKGROUP: "added talkgroup",
+    LogAction.RECONFIG_NAC: "Reconfiguring NAC",
+    LogAction.HOLD: "hold active",
+    LogAction.DUID: "duid",
+    LogAction.CONFIG: "config",
+}
+_ACTION_CODES = {label: code for code, label in _ACTION_LABELS.items()}
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class LogRecord:
+    """A single stored log entry. Numeric fields are 0 when the entry does not carry them."""
+    __slots__ = ("seq", "action", "tgid", "freq", "priority", "timestamp", "detail")
+
+    DETAIL_LIMIT = 200  # Longest Misc/config text kept per record
+
+    def __init__(self, seq: int, entry: dict, timestamp: float):
+        self.seq = seq
+        self.action = LogAction.from_entry(entry)
+        self.tgid = _to_int(entry.get("Talkgroup"))
+        self.freq = _to_int(entry.get("Frequency"))
+        self.priority = _to_int(entry.get("Priority"))
+        self.timestamp = timestamp
+        if self.action == LogAction.RECONFIG_NAC:
+            detail = f"{entry.get('NACFrom')}->{entry.get('NACTo')}"
+        elif self.action == LogAction.MISC:
+            detail = entry.get("Data")
+        elif self.action in (LogAction.CONFIG, LogAction.DUID):
+            detail = entry.get("Action")
+        else:
+            detail = None
+        self.detail = detail[:self.DETAIL_LIMIT] if detail else None
+
+    def to_dict(self) -> dict:
+        return {
+            "seq": self.seq,
+            "Action": self.action.label,
+            "Talkgroup": self.tgid,
+            "Frequency": self.freq,
+            "Priority": self.priority,
+            "Timestamp": self.timestamp,
+            "Detail": self.detail
+        }
+
+
+class LogHistory:
+    """
+    Fixed-capacity ring buffer of parsed log entries.
+
+    Each stored entry gets an increasing sequence number. Once the buffer is full
+    the oldest records are overwritten, so memory stays at `capacity` records no
+    matter how long the unit runs.
+    """
+    def __init__(self, capacity: int = 5000):
+        if capacity <= 0:
+            raise ValueError("LogHistory capacity must be positive")
+        self._capacity = capacity
+        self._records: List[Optional[LogRecord]] = [None] * capacity
+        self._next_seq = 1
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest record, or 0 when empty."""
+        return self._next_seq - 1
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest record still held."""
+        return max(1, self._next_seq - self._capacity)
+
+    def __len__(self) -> int:
+        return min(self._next_seq - 1, self._capacity)
+
+    def append(self, entry: dict, timestamp: Optional[float] = None) -> int:
+        """Stores entry and returns its sequence number."""
+        with self._lock:
+            seq = self._next_seq
+            self._records[seq % self._capacity] = LogRecord(seq, entry, timestamp or time.time())
+            self._next_seq = seq + 1
+        return seq
+
+    def since(self, seq: int = 0, action: Optional[LogAction] = None, limit: Optional[int] = None) -> List[LogRecord]:
+        """
+        Returns records newer than seq, oldest first.
+
+        Args:
+            seq (int): Only records with a larger sequence number are returned.
+            action (LogAction, optional): Only return records with this action.
+            limit (int, optional): Maximum number of records to return.
+        """
+        with self._lock:
+            start = max(seq + 1, self.first_seq)
+            end = self._next_seq
+            result = []
+            for s in range(start, end):
+                record = self._records[s % self._capacity]
+                if action is not None and record.action != action:
+                    continue
+                result.append(record)
+                if limit is not None and len(result) >= limit:
+                    break
+            return result
+
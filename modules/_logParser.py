@@ -0,0 +1,215 @@
+# _logParser.py
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEMOD_REGEX = re.compile(
+    r'(?P<Action>demodulator):\s+xlator\s+if_rate=(?P<if_rate>\d+),\s+input_rate=(?P<input_rate>\d+),\s+decim=(?P<decim>\d+),\s+if taps=\[(?P<taps>[\d,]+)\],\s+resampled_rate=(?P<resampled_rate>\d+),\s+sps=(?P<sps>\d+)'
+)
+
+RECONFIG_REGEX = re.compile(
+    r'(?P<Date>\d{2}/\d{2}/\d{2})\s+'
+    r'(?P<Time>\d{2}:\d{2}:\d{2}\.\d+)\s+'
+    r'(?P<Action>Reconfiguring NAC)\s+from\s+0x(?P<NACFrom>[0-9A-Fa-f]{3})\s+to\s+0x(?P<NACTo>[0-9A-Fa-f]{3})'
+)
+AUDIO_SOCKET_REGEX = re.compile(
+    r'(?P<Action>op25_audio::open_socket\(\)):\s+enabled udp host\((?P<host>[^)]+)\),\s+wireshark\((?P<wireshark>\d+)\),\s+audio\((?P<audio>\d+)\)'
+)
+
+FRAME_ASSEMBLER_REGEX = re.compile(
+    r'(?P<Action>p25_frame_assembler_impl):\s+do_imbe\[(?P<do_imbe>\d+)\],\s+do_output\[(?P<do_output>\d+)\],\s+do_audio_output\[(?P<do_audio_output>\d+)\],\s+do_phase2_tdma\[(?P<do_phase2_tdma>\d+)\],\s+do_nocrypt\[(?P<do_nocrypt>\d+)\]'
+)
+
+
+GAIN_REGEX = re.compile(
+    r'(?P<Action>gain):\s+name:\s+(?P<name>\S+)\s+range:\s+start\s+(?P<start>\d+)\s+stop\s+(?P<stop>\d+)\s+step\s+(?P<step>\d+)'
+)
+
+
+DEVICE_REGEX = re.compile(
+    r'(?P<Action>Using device)\s+#(?P<index>\d+)\s+(?P<model>.+?)\s+SN:\s+(?P<serial>\d+)'
+)
+
+HOLD_REGEX = re.compile(
+    r'(?P<Date>\d{2}/\d{2}/\d{2})\s+'
+    r'(?P<Time>\d{2}:\d{2}:\d{2}\.\d+)\s+'
+    r'(?P<Action>hold active)\s+tg\((?P<Talkgroup>\d+)\)'
+)
+
+# Regex to parse "voice update" log entries
+VOICE_REGEX = re.compile(
+    r'(?P<Date>\d{2}/\d{2}/\d{2})\s+'
+    r'(?P<Time>\d{2}:\d{2}:\d{2}\.\d+)\s+'
+    r'(?P<Action>voice update):\s+'
+    r'tg\((?P<Talkgroup>\d+)\),\s+'
+    r'freq\((?P<Frequency>\d+)\),\s+'
+    r'slot\([^)]+\),\s+'
+    r'prio\((?P<Priority>\d+)\)'
+)
+
+# Regex to parse "added talkgroup" log entries
+TG_REGEX = re.compile(
+    r'(?P<Date>\d{2}/\d{2}/\d{2})\s+'
+    r'(?P<Time>\d{2}:\d{2}:\d{2}\.\d+)\s+'
+    r'(?P<Action>added talkgroup)\s+'
+    r'(?P<Talkgroup>\d+)\s+from\s+(?P<Source>\S+)'
+    # ADD HERE
+)
+
+DUID_REGEX = re.compile(
+    r'(?P<Date>\d{2}/\d{2}/\d{2})\s+'
+    r'(?P<Time>\d{2}:\d{2}:\d{2}\.\d+)\s+'
+    r'(?P<Action>duid\d+),\s+tg\((?P<Talkgroup>\d+)\)'
+)
+
+
+_stampCache = (None, "", "")  # (whole second, date, HH:MM:SS) reused until the second changes
+
+
+def timestamp_now() -> Tuple[str, str]:
+    """Returns the current date and time (to the millisecond) formatted like OP25 log timestamps."""
+    global _stampCache
+    now = time.time()
+    sec = int(now)
+    cached_sec, date, hms = _stampCache
+    if sec != cached_sec:
+        local = time.localtime(sec)
+        date, hms = time.strftime("%m/%d/%y", local), time.strftime("%H:%M:%S", local)
+        _stampCache = (sec, date, hms)
+    return date, f"{hms}.{int((now - sec) * 1000):03d}"
+
+
+def is_timestamped(line: str) -> bool:
+    """Cheap check for the 'MM/DD/YY HH:MM:SS.ffffff' prefix OP25 puts on trunking lines."""
+    return len(line) > 9 and line[2] == "/" and line[5] == "/" and line[8] == " "
+
+
+class LinePattern:
+    """
+    One recognised OP25 stderr line type.
+
+    Args:
+        action (str): The action name reported for the line.
+        prefix (str): Literal text the line starts with (after the timestamp for
+            timestamped lines). Used to pick this pattern before running the regex.
+        regex (re.Pattern): The compiled regex, matched from the start of the full line.
+        timestamped (bool): Whether OP25 prefixes the line with a date and time.
+        fields (list[str], optional): For config lines, the groups reported under "Config".
+            When omitted, the entry is the regex groupdict.
+        has_talkgroup (bool): Whether the entry carries a "Talkgroup" to resolve a name for.
+        category (str, optional): Filter class the line belongs to (see _logFilter.py).
+            Defaults to the action.
+    """
+    __slots__ = ("action", "prefix", "regex", "timestamped", "fields", "has_talkgroup", "category")
+
+    def __init__(self, action: str, prefix: str, regex: re.Pattern, *, timestamped: bool,
+                 fields: Optional[List[str]] = None, has_talkgroup: bool = False, category: Optional[str] = None):
+        self.category = category or action
+        self.action = action
+        self.prefix = prefix
+        self.regex = regex
+        self.timestamped = timestamped
+        self.fields = fields
+        self.has_talkgroup = has_talkgroup
+
+    def to_entry(self, m: re.Match) -> dict:
+        """Builds the log entry dict for a successful match."""
+        if self.fields is None:
+            return m.groupdict()
+        date, time = timestamp_now()
+        return {
+            "Date": date,
+            "Time": time,
+            "Action": m.group("Action"),
+            "Config": {key: m.group(key) for key in self.fields}
+        }
+
+
+class LineParser:
+    """
+    Dispatches each line to at most one candidate regex.
+
+    Patterns are bucketed by the first KEY_LEN characters of their prefix, so a
+    line costs a timestamp check, one dict lookup and a startswith() before any
+    regex runs. Lines that match no bucket are rejected without running a regex.
+    """
+    KEY_LEN = 4
+
+    def __init__(self, patterns: Iterable[LinePattern] = ()):
+        self._timestamped: Dict[str, List[LinePattern]] = {}
+        self._untimestamped: Dict[str, List[LinePattern]] = {}
+        self._patterns: List[LinePattern] = []
+        for pattern in patterns:
+            self.register(pattern)
+
+    @property
+    def patterns(self) -> List[LinePattern]:
+        return list(self._patterns)
+
+    def register(self, pattern: LinePattern):
+        """Adds a new line type. Its prefix must be at least KEY_LEN characters long."""
+        if len(pattern.prefix) < self.KEY_LEN:
+            raise ValueError(f"Pattern prefix '{pattern.prefix}' must be at least {self.KEY_LEN} characters")
+        table = self._timestamped if pattern.timestamped else self._untimestamped
+        table.setdefault(pattern.prefix[:self.KEY_LEN], []).append(pattern)
+        self._patterns.append(pattern)
+
+    def body(self, line: str) -> Tuple[str, bool]:
+        """Returns the text the prefixes are compared against and whether the line is timestamped."""
+        if is_timestamped(line):
+            parts = line.split(None, 2)
+            return (parts[2] if len(parts) == 3 else ""), True
+        return line, False
+
+    def match(self, line: str) -> Optional[Tuple[LinePattern, re.Match]]:
+        """
+        Finds the pattern for line.
+
+        Returns:
+            tuple[LinePattern, re.Match] | None: The matching pattern and its match, or None.
+        """
+        body, timestamped = self.body(line)
+        table = self._timestamped if timestamped else self._untimestamped
+        candidates = table.get(body[:self.KEY_LEN])
+        if not candidates:
+            return None
+        for pattern in candidates:
+            if body.startswith(pattern.prefix):
+                m = pattern.regex.match(line)
+                if m:
+                    return pattern, m
+        return None
+
+
+# BUILT-IN LINE TYPES. BUILT ONCE AT IMPORT.
+DEFAULT_PATTERNS = [
+    LinePattern("voice update", "voice update", VOICE_REGEX, timestamped=True, has_talkgroup=True,
+                category="voice"),
+    LinePattern("added talkgroup", "added talkgroup", TG_REGEX, timestamped=True, has_talkgroup=True,
+                category="talkgroup"),
+    LinePattern("Reconfiguring NAC", "Reconfiguring NAC", RECONFIG_REGEX, timestamped=True,
+                category="nac"),
+    LinePattern("hold active", "hold active", HOLD_REGEX, timestamped=True, has_talkgroup=True,
+                category="hold"),
+    LinePattern("duid", "duid", DUID_REGEX, timestamped=True, has_talkgroup=True,
+                category="duid"),
+    LinePattern("gain", "gain:", GAIN_REGEX, timestamped=False, category="config",
+                fields=["name", "start", "stop", "step"]),
+    LinePattern("Using device", "Using device", DEVICE_REGEX, timestamped=False, category="config",
+                fields=["index", "model", "serial"]),
+    LinePattern("demodulator", "demodulator:", DEMOD_REGEX, timestamped=False, category="config",
+                fields=["if_rate", "input_rate", "decim", "taps", "resampled_rate", "sps"]),
+    LinePattern("op25_audio::open_socket()", "op25_audio::open_socket()", AUDIO_SOCKET_REGEX, timestamped=False,
+                category="config", fields=["host", "wireshark", "audio"]),
+    LinePattern("p25_frame_assembler_impl", "p25_frame_assembler_impl:", FRAME_ASSEMBLER_REGEX, timestamped=False,
+                category="config", fields=["do_imbe", "do_output", "do_audio_output", "do_phase2_tdma", "do_nocrypt"]),
+]
+
+MISC_CATEGORY = "misc"  # Filter class for lines no pattern recognises
+
+defaultParser = LineParser(DEFAULT_PATTERNS)
+
+
+def register_pattern(pattern: LinePattern):
+    """Registers a new line type with the default parser used by logMonitorOP25."""
+    defaultParser.register(pattern)
@@ -0,0 +1,78 @@
+# _logTailer.py
+import os
+import threading
+from typing import List
+
+
+class LogTailer:
+    """
+    Incrementally reads lines appended to a log file.
+
+    Keeps a byte offset into the file so every call only reads the bytes written
+    since the previous call. A trailing line without a newline is held back until
+    the rest of it arrives. If the file shrinks below the saved offset or is
+    replaced (new inode), it is treated as truncated and read again from the start.
+    """
+    def __init__(self, path: str, encoding: str = "utf-8"):
+        self._path = path
+        self._encoding = encoding
+        self._offset = 0
+        self._inode = None
+        self._partial = b""
+        self._truncations = 0
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def offset(self) -> int:
+        """Byte offset of the next unread byte."""
+        return self._offset
+
+    @property
+    def truncations(self) -> int:
+        """Number of times the file was detected as truncated or replaced."""
+        return self._truncations
+
+    def reset(self):
+        """Forget the current position so the next read starts at the beginning of the file."""
+        with self._lock:
+            self._offset = 0
+            self._inode = None
+            self._partial = b""
+
+    def read_new_lines(self) -> List[str]:
+        """
+        Returns the complete lines appended since the last call, without line endings.
+
+        Returns:
+            list[str]: The new lines, or an empty list if nothing new was written
+            or the file does not exist.
+        """
+        with self._lock:
+            try:
+                with open(self._path, "rb") as f:
+                    st = os.fstat(f.fileno())
+                    if self._inode is not None and (st.st_ino != self._inode or st.st_size < self._offset):
+                        # FILE WAS REOPENED WITH "w" OR ROTATED; START OVER
+                        self._offset = 0
+                        self._partial = b""
+                        self._truncations += 1
+                    self._inode = st.st_ino
+
+                    if st.st_size == self._offset:
+                        return []
+
+                    f.seek(self._offset)
+                    chunk = f.read(st.st_size - self._offset)
+            except FileNotFoundError:
+                return []
+
+            self._offset += len(chunk)
+            data = self._partial + chunk
+            pieces = data.split(b"\n")
+            self._partial = pieces.pop()  # EMPTY WHEN THE CHUNK ENDS WITH A NEWLINE
+
+            return [p.rstrip(b"\r").decode(self._encoding, errors="replace") for p in pieces]
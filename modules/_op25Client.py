@@ -0,0 +1,168 @@
+# _op25Client.py
+import json
+import logging
+import queue
+import select
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Optional
+
+# COMMANDS THAT ARE SAFE TO SEND TWICE. skip/lockout WOULD ACT TWICE IF THE FIRST DATAGRAM WAS ONLY SLOW,
+# AND hold IS A TOGGLE IN RX.PY (A SECOND hold RELEASES IT), SO THOSE ARE NEVER RETRIED
+IDEMPOTENT_COMMANDS = frozenset({"whitelist", "reload", "update", "set_freq", "watchdog"})
+
+
+class CommandTimeout(Exception):
+    """Raised on a command future when OP25 did not answer within its timeout and retries."""
+    def __init__(self, command: str, attempts: int):
+        self.command = command
+        self.attempts = attempts
+        super().__init__(f"No response to '{command}' after {attempts} attempt(s)")
+
+
+class _Request:
+    __slots__ = ("command", "arg1", "arg2", "timeout", "retries", "future", "queued")
+
+    def __init__(self, command: str, arg1, arg2, timeout: float, retries: int):
+        self.command = command
+        self.arg1 = arg1
+        self.arg2 = arg2
+        self.timeout = timeout
+        self.retries = retries
+        self.future: Future = Future()
+        self.queued = time.monotonic()
+
+    @property
+    def message(self) -> bytes:
+        return json.dumps({"command": self.command, "arg1": self.arg1, "arg2": self.arg2}).encode()
+
+
+class OP25CommandClient:
+    """
+    One long-lived UDP client for the rx.py terminal port (127.0.0.1:5000 by default).
+
+    submit() queues a command and returns a Future immediately; a single sender
+    thread owns the socket. The terminal protocol has no request ids, so commands
+    are correlated by order: the sender discards whatever datagrams arrived while it
+    was idle, sends one command, and the next datagram from rx.py is that command's
+    response. A command that gets no response within its timeout is resent up to
+    `retries` times (idempotent commands only), then its future fails with
+    CommandTimeout. The socket is connected, so a stopped rx.py surfaces as
+    ConnectionRefusedError instead of a hang.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 5000, timeout: float = 0.5, retries: int = 2,
+                 timeouts: Optional[Dict[str, float]] = None, buffer_size: int = 65536):
+        self._address = (host, port)
+        self._timeout = timeout
+        self._retries = retries
+        self._timeouts = dict(timeouts or {})
+        self._buffer_size = buffer_size
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.retried = 0
+        self.timeouts = 0
+        self.last_latency: Optional[float] = None
+
+    @property
+    def address(self):
+        return self._address
+
+    def submit(self, command: str, arg1=0, arg2=0, timeout: Optional[float] = None,
+               retries: Optional[int] = None) -> Future:
+        """Queues a command without blocking. The future resolves to OP25's decoded JSON response."""
+        if retries is None:
+            retries = self._retries if command in IDEMPOTENT_COMMANDS else 0
+        request = _Request(command, arg1, arg2, timeout or self._timeouts.get(command, self._timeout), retries)
+        self._ensure_started()
+        self._queue.put(request)
+        return request.future
+
+    def send(self, command: str, arg1=0, arg2=0, timeout: Optional[float] = None) -> Optional[dict]:
+        """Blocking form of submit(); returns None instead of raising when OP25 does not answer."""
+        future = self.submit(command, arg1, arg2, timeout)
+        try:
+            return future.result()
+        except (CommandTimeout, OSError, ValueError) as e:
+            print(f"[ERROR] Failed to send command '{command}': {e}")
+            return None
+
+    def close(self):
+        """Stops the sender thread; queued commands are cancelled."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread:
+            self._queue.put(None)
+            thread.join(timeout=5)
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request:
+                request.future.cancel()
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self._sock.connect(self._address)
+                self._sock.setblocking(False)
+                self._thread = threading.Thread(target=self._sender, name="op25-udp", daemon=True)
+                self._thread.start()
+
+    def _sender(self):
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            if not request.future.set_running_or_notify_cancel():
+                continue
+            try:
+                request.future.set_result(self._exchange(request))
+            except Exception as e:
+                request.future.set_exception(e)
+
+    def _exchange(self, request: _Request) -> dict:
+        message = request.message
+        for attempt in range(request.retries + 1):
+            self._drain()
+            if attempt:
+                self.retried += 1
+            sent = time.monotonic()
+            self._sock.send(message)
+            self.sent += 1
+            response = self._receive(sent + request.timeout)
+            if response is not None:
+                self.last_latency = time.monotonic() - request.queued
+                return json.loads(response.decode())
+        self.timeouts += 1
+        logging.error(f"OP25 did not answer '{request.command}' ({request.retries + 1} attempt(s))")
+        raise CommandTimeout(request.command, request.retries + 1)
+
+    def _receive(self, deadline: float) -> Optional[bytes]:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            readable, _, _ = select.select([self._sock], [], [], remaining)
+            if readable:
+                return self._sock.recv(self._buffer_size)
+
+    def _drain(self):
+        """Discards status updates (and stale responses) that arrived between commands."""
+        while True:
+            try:
+                self._sock.recv(self._buffer_size)
+            except BlockingIOError:
+                return
+            except ConnectionRefusedError:
+                # AN EARLIER DATAGRAM HIT A CLOSED PORT; THE NEXT SEND WILL REPORT IT IF RX.PY IS STILL DOWN
+                continue
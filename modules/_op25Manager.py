@@ -2,14 +2,19 @@
 import subprocess
 import os
 import time
-import socket
 import subprocess
 import json
-from typing import List, TYPE_CHECKING
+from concurrent.futures import Future
+from typing import FrozenSet, List, Optional, TYPE_CHECKING
 
 from flask import jsonify
 # Removed to avoid circular import: from modules._session import session
 from modules._session import SessionMember
+from modules._artifactCache import ArtifactCache, digest_of, write_lines
+from modules._op25Client import OP25CommandClient
+from modules._readiness import READY, ReadinessTracker
+from modules._supervisor import ProcessSupervisor
+from modules._switchTracker import SwitchRecord, SwitchTracker
 from modules.myConfiguration import MyConfig
 #  echo '{"command": "whitelist", "arg1": 47021, "arg2": 0}' | nc -u 127.0.0.1 5000
 
@@ -32,6 +37,37 @@ class op25Manager:
 
         self.session: 'session' = None  # Use forward reference for session type
         self._alreadyStarted = False
+        self.op25_process = None
+
+        # GENERATED TRUNK/TGROUPS/WHITELIST/BLACKLIST FILES, ONLY WRITTEN WHEN THEIR CONTENT CHANGES
+        self._artifacts = ArtifactCache(configMgr.get("paths", "artifact_dir", fallback="/dev/shm/op25-artifacts"))
+
+        # STABLE LINKS NAMED IN THE RUNNING TRUNK.TSV; A HOT SWITCH RE-POINTS THESE AND SENDS RELOAD
+        self._liveWhitelistFile = None
+        self._liveBlacklistFile = None
+        self._liveTGIDs: FrozenSet[int] = frozenset()  # Whitelist rx.py is running with; what a switch starts from
+        self._whitelistOverride: Optional[FrozenSet[int]] = None  # Set by /session/controller/whitelist until the next channel change
+        self._readiness = ReadinessTracker()  # Fed from the log bus; replaces fixed sleeps and log rescans
+        self._supervisor = ProcessSupervisor(
+            self,
+            backoff_initial=configMgr.getfloat("control", "restart_backoff_initial", fallback=1.0),
+            backoff_max=configMgr.getfloat("control", "restart_backoff_max", fallback=60.0),
+            crash_limit=configMgr.getint("control", "crash_loop_limit", fallback=5),
+            crash_window=configMgr.getfloat("control", "crash_loop_window", fallback=300.0),
+            crash_cooldown=configMgr.getfloat("control", "crash_loop_cooldown", fallback=60.0),
+            stable_uptime=configMgr.getfloat("control", "stable_uptime", fallback=120.0)
+        )
+        self._switchTracker = SwitchTracker(
+            confirm_timeout=configMgr.getfloat("control", "switch_confirm_timeout", fallback=15.0))
+
+        # ONE UDP CLIENT FOR THE LIFE OF THE API; COMMANDS NO LONGER OPEN A SOCKET EACH
+        self._client = OP25CommandClient(
+            host=configMgr.get("control", "udp_host", fallback="127.0.0.1"),
+            port=configMgr.getint("control", "udp_port", fallback=5000),
+            timeout=configMgr.getfloat("control", "command_timeout", fallback=0.5),
+            retries=configMgr.getint("control", "command_retries", fallback=2),
+            timeouts={"reload": configMgr.getfloat("control", "reload_timeout", fallback=2.0)}
+        )
        
         
     def set_session(self, session: 'session'):  # Use forward reference for session type
@@ -56,6 +92,30 @@ class op25Manager:
     @property
     def stdout_file(self):
         return self._stdout_file
+
+    @property
+    def client(self) -> OP25CommandClient:
+        return self._client
+
+    @property
+    def switchTracker(self) -> SwitchTracker:
+        return self._switchTracker
+
+    @property
+    def artifacts(self) -> ArtifactCache:
+        return self._artifacts
+
+    @property
+    def readiness(self) -> ReadinessTracker:
+        return self._readiness
+
+    @property
+    def supervisor(self) -> ProcessSupervisor:
+        return self._supervisor
+
+    @property
+    def isRunning(self) -> bool:
+        return self.op25_process is not None and self.op25_process.poll() is None
         
     def start(self, _session:SessionMember) -> bool | None:
         print("Starting...", self.alreadyStarted)
@@ -70,25 +130,38 @@ class op25Manager:
             # ]
 
             self._activeSession = _session
+            channel = self.session.activeChannel
+            override = self._whitelistOverride
+            if override is None:
+                whitelist = channel.toWhitelistTSV(self.artifacts)
+            else:
+                whitelist = self._list_artifact("whitelist", sorted(override))  # A RELAUNCH KEEPS THE OVERRIDE
+            self._liveWhitelistFile = self.artifacts.link("whitelist.tsv", whitelist)
+            self._liveBlacklistFile = self.artifacts.link("blacklist.tsv", channel.toBlacklistTSV(self.artifacts))
 
             self.op25_command = [
                 self.rx_script, "--nocrypt", "--args", "rtl",
                 "--gains", "lna:35", "-S", "960000", "-q", "0",
                 "-v", "2", "-2", "-V", "-U",
-                "-T", self.session.activeSystem.toTrunkTSV(self.session),
-                "-U", "-l", "50"
+                "-T", self.session.activeSystem.toTrunkTSV(self.session, self.artifacts,
+                                                           whitelist=self._liveWhitelistFile,
+                                                           blacklist=self._liveBlacklistFile),
+                "-U", "-l", str(self.client.address[1])
             ]
             
             
             # print(self.op25_command, flush=True)
             # Start subprocess
-            self.op25_process = subprocess.Popen(
-                self.op25_command,
-                stdout=open(self.stdout_file, "w"),
-                stderr=open(self.stderr_file, "w"),
-                text=True
-            )
-            time.sleep(3)  # Wait for startup
+            with open(self.stdout_file, "w") as stdout, open(self.stderr_file, "w") as stderr:
+                self.op25_process = subprocess.Popen(
+                    self.op25_command,
+                    stdout=stdout,
+                    stderr=stderr,
+                    text=True
+                )
+            self._liveTGIDs = channel.scanSet if override is None else override
+            self.readiness.spawned()  # Callers that need rx.py up use isConnected()/readiness.wait_for()
+            self.supervisor.watch(self.op25_process)  # Restarts rx.py with backoff if it dies on its own
             self.set_alreadyStarted(True) # Ensure we do not accidentally start the process again
             print("Process Ignition Complete")
             return True
@@ -97,43 +170,20 @@ class op25Manager:
             raise Exception("[FATAL] Session uavailable. Cannot start OP25.")
                 
     def isConnected(self, timeout=30):
-        """Continuously check for 'Reconfiguring NAC' in the log file until found or timeout."""
-        print("...", "isConnected()")
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            if os.path.exists(self.stderr_file):
-                with open(self.stderr_file, "r") as file:
-                    if "Reconfiguring NAC" in file.read():
-                        return True  # Found the phrase, return immediately
-            
-            time.sleep(1)  # Wait 1 second before checking again
-
-        return False  # Timed out after 30 seconds
+        """Waits until OP25 has logged 'Reconfiguring NAC' for the current run, or timeout seconds pass."""
+        return self.readiness.wait_for(READY, timeout)
 
     def send_udp_command(self, command, arg2=0):
-        try:
-            server_address = ('127.0.0.1', 5000)  # Target address and port
-            buffer_size = 1024  # Buffer size for receiving response
-
-            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-                message = json.dumps({"command": command, "arg1": arg2, "arg2": 0})
-                sock.sendto(message.encode(), server_address)
-
-                response, _ = sock.recvfrom(buffer_size)
-                response_data = json.loads(response.decode())
-
-                return response_data  # Return the received JSON response
-
-        except (socket.error, json.JSONDecodeError) as e:
-            print(f"[ERROR] Failed to send command '{command}': {e}")
-            return None  # Return None on failure
+        """Sends a command and waits (bounded by the command's timeout) for OP25's JSON response."""
+        return self.client.send(command, arg2)
 
     def stop(self):
         """Stops the OP25 process if running."""
+        self.supervisor.expect_exit()
         if self.op25_process and self.op25_process.poll() is None:
             self.op25_process.terminate()
             self.op25_process.wait()
+            self.readiness.stopped()
             print("[DEBUG] OP25 process terminated.")
             subprocess.run(["pkill", "-f", "rx.py"])        #TODO: Send API request to end gracefuuly
                                                             #TODO: PKILL ensures rx.py is closed for now 
@@ -141,82 +191,103 @@ class op25Manager:
     @property
     def activeSession (self):
         return self._activeSession
-    def switchTalkgroup(self, thisSession: 'session'):  # Use forward reference for session type
-        """Switches OP25 to a new talkgroup."""
-        if not self.op25_process or self.op25_process.poll() is not None:
-            print("[ERROR] OP25 is not running.")
-            return
 
-        logEntry = {
-            "action" : "switchTalkgroup",
-            "channel_number" : f"{thisSession.activeChannel.channel_number}",
-            "channel_name" : thisSession.activeChannel.name,
-            "zone_name" : thisSession.activeZone.name,
-            "system_name" : thisSession.activeSystem.sysname
-        }
-        
-        entry = json.dumps(logEntry)
-        # self.session.sessionManager.apiManager.sendManualLogEntry([entry])
-        
-        # Command to reload OP25 configuration, assuming self.command is implemented
-    def switchSystem(self, thisSession: 'session'):  # Use forward reference for session type
-        """Switches OP25 to a new P25 system with the first zone and channel set automatically."""
-        #TODO: Implement multisystem
-
-        # Command to reload OP25 configuration, assuming self.command is implemented
-        
-        #self.command("reload", 0)
-        pass
+    @property
+    def whitelistOverride(self) -> Optional[FrozenSet[int]]:
+        """The tgids set by overrideWhitelist(), or None while the active channel's list is in use."""
+        return self._whitelistOverride
+
+    def switchTalkgroup(self, thisSession: 'session') -> Optional[SwitchRecord]:  # Use forward reference for session type
+        """Hot-switches the running OP25 to the active channel's tgid list (same system, no restart)."""
+        channel = thisSession.activeChannel
+        label = f"{thisSession.activeZone.name} / {channel.channel_number} {channel.name}"
+        self._whitelistOverride = None  # A CHANNEL CHANGE ENDS ANY WHITELIST OVERRIDE
+        return self.switchGroup(channel.tgid, label=label, blacklist=channel.blacklistTGIDs)
+
+    def overrideWhitelist(self, tgids: List[int], label: str = "whitelist") -> Optional[SwitchRecord]:
+        """
+        Hot-switches to an ad-hoc tgid list in place of the active channel's. The list
+        is kept until the next channel change: a restart or supervisor relaunch starts
+        rx.py with it, and the session's isInScan() checks against it.
+        """
+        blacklist = self.session.activeChannel.blacklistTGIDs if self.session else ()
+        record = self.switchGroup(tgids, label=label, blacklist=blacklist)
+        if record is not None and record.written is not None:
+            self._whitelistOverride = frozenset(int(tgid) for tgid in tgids)
+        return record
+
+    def switchGroup(self, tgids: List[int], label: str = "whitelist", blacklist: List[int] = ()) -> Optional[SwitchRecord]:
+        """
+        Replaces the whitelist of the running rx.py without restarting it.
+
+        The whitelist (and blacklist) links named in the trunk.tsv rx.py was started
+        with are re-pointed at artifacts holding the new lists, then a reload is
+        queued on the UDP client; OP25 re-reads both files on reload. Returns immediately with the SwitchRecord,
+        which is completed as OP25 acknowledges the reload and as in-scan voice
+        traffic confirms the new list (see switchTracker).
+        """
+        if not self.isRunning or not self._liveWhitelistFile:
+            print("[ERROR] OP25 is not running.")
+            return None
 
-    def command(self, cmd, data):
-        """Sends a command to OP25. Ensures proper handling for hold, whitelist, and reload."""
-        time.sleep(1) 
-        
+        record = self.switchTracker.begin(label, tgids, previous=self._liveTGIDs)
+        try:
+            self._link_list("whitelist", self._liveWhitelistFile, tgids)
+            self._link_list("blacklist", self._liveBlacklistFile, blacklist or [1234])  # OP25 needs a non-empty blacklist
+        except OSError as e:
+            print(f"[ERROR] Failed to write whitelist for hot switch: {e}")
+            self.switchTracker.fail(record, str(e))
+            return record
+        self.switchTracker.mark_written(record)
+
+        def acknowledged(done: Future):
+            if done.cancelled() or done.exception() is not None:
+                self.switchTracker.fail(record, "reload not acknowledged")
+            else:
+                self._liveTGIDs = record.tgids
+                self.switchTracker.mark_acked(record)
+
+        self.command("reload", 0).add_done_callback(acknowledged)
+        return record
+
+    def _link_list(self, kind: str, link_path: str, tgids):
+        """Points a live list link at the artifact for tgids; lists seen before are not rewritten."""
+        self.artifacts.link(os.path.basename(link_path), self._list_artifact(kind, tgids))
+
+    def _list_artifact(self, kind: str, tgids) -> str:
+        tgids = list(tgids)
+        return self.artifacts.materialize(kind, ".tsv", digest_of(kind, tgids), lambda f: write_lines(f, tgids))
+
+    def switchSystem(self, thisSession: 'session') -> Optional[SwitchRecord]:  # Use forward reference for session type
+        """Switches OP25 to a new P25 system. The trunk file changes, so rx.py is restarted."""
+        self._whitelistOverride = None
+        record = self.switchTracker.begin(thisSession.activeSystem.sysname, thisSession.activeChannel.tgid,
+                                          previous=self._liveTGIDs, mode="restart")
+        self.restart()
+        self.switchTracker.mark_written(record)
+        return record
+
+    def command(self, cmd, data) -> Optional[Future]:
+        """
+        Queues a command to OP25 without blocking and returns its Future.
+
+        Commands are sent in order on the shared UDP client, so a whitelist followed
+        by a reload reaches OP25 in that order. Failures are logged when the future
+        completes; callers that need the response can wait on future.result().
+        """
         if cmd not in ["hold", "whitelist", "skip", "lockout", "reload"]:
             print(f"[ERROR] Invalid command: {cmd}")
-            return
+            return None
 
-        # 🔹 Step 1: Ensure hold TGIDs are whitelisted before holding
-        if cmd == "hold":
-            if data not in self.whitelist_tgids:
-                print(f"[INFO] TGID {data} not in whitelist. Adding before hold.")
-                self.whitelist([data])
+        future = self.client.submit(cmd, 0 if cmd == "reload" else data)
 
-            response = self.send_udp_command(cmd, data)
-            if response:
-                pass
-                # print(f"[SUCCESS] Hold command sent for TGID {data}.")
-            else:
-                print(f"[ERROR] Failed to hold TGID {data}. No response received.")
+        def report(done: Future):
+            if done.cancelled() or done.exception() is None:
+                return
+            print(f"[ERROR] OP25 command '{cmd}' ({data}) failed: {done.exception()}")
 
-        elif cmd == "whitelist":
-            response = self.send_udp_command(cmd, data)  # Directly send the command
-            if response:
-                pass
-                #print(f"[SUCCESS] Whitelisted TGID {data}.")
-            else:
-                print(f"[ERROR] Failed to whitelist TGID {data}. No response received.")
-
-        # 🔹 Step 3: Handle reload command - Fully reload both whitelist & blacklist
-        elif cmd == "reload":
-            response = self.send_udp_command(cmd, 0)  # Reset OP25 state
-            if response:
-                print("[SUCCESS] OP25 reload command executed.")
-                time.sleep(1)  # Ensure OP25 has time to process reload
-                # 🔹 Step 3B: Reapply stored whitelist TGIDs after reset
-                # if self.whitelist_tgids:
-                #     self.whitelist(self.whitelist_tgids)
-            else:
-                print("[ERROR] OP25 reload command failed. No response received.")
-
-        # 🔹 Step 4: Handle all other commands and verify response
-        elif cmd=="lockout":
-            response = self.send_udp_command(cmd, data)
-            if response:
-                pass
-                #print(f"[SUCCESS] Command '{cmd}' executed with data: {data}.")
-            else:
-                print(f"[ERROR] Command '{cmd}' failed. No response received.")
+        future.add_done_callback(report)
+        return future
 
     def update_scan_list(self, new_tgids: List[int]):
         """Updates the scan list by writing TGIDs directly to the whitelist file, then reloads OP25."""
@@ -242,8 +313,12 @@ class op25Manager:
 
         # Step 2: Reload OP25 to apply new whitelist
         print("[INFO] Sending OP25 reload command...")
-        response = self.command("reload", 0)
-        
+        future = self.command("reload", 0)
+        try:
+            response = future.result()
+        except Exception:
+            response = None
+
         if not response:
             print("[ERROR] OP25 reload command failed. Scan list update aborted.")
             return
@@ -253,4 +328,12 @@ class op25Manager:
     def restart(self):
         print("[INFO] Restarting OP25...")
         self.stop()
-        self.start()
\ No newline at end of file
+        self.supervisor.reset()  # A manual restart also clears a crash loop
+        self.relaunch()
+
+    def relaunch(self):
+        """Starts rx.py again for the current session after it stopped or crashed."""
+        if not self.session:
+            raise Exception("[FATAL] Session uavailable. Cannot start OP25.")
+        self.set_alreadyStarted(False)
+        self.start(self.session)
\ No newline at end of file
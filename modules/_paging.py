@@ -0,0 +1,65 @@
+# _paging.py
+import base64
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def encode_cursor(*parts: int) -> str:
+    """Encodes a position, e.g. (sys index, tgid), as an opaque cursor string."""
+    raw = ":".join(str(part) for part in parts)
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> Tuple[int, ...]:
+    """
+    Decodes a cursor made by encode_cursor with `size` parts.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        parts = tuple(int(part) for part in raw.split(":"))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    if len(parts) != size:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return parts
+
+
+class FieldProjection:
+    """
+    Keeps only the requested keys of listing items.
+
+    `fields=name,zone_index` keeps those keys; a dotted name such as
+    `channels.name` keeps "channels" but only the listed keys of each dict in it.
+    An empty spec keeps everything.
+    """
+    def __init__(self, spec: Optional[str]):
+        self._keys: List[str] = []
+        self._nested: Dict[str, List[str]] = {}
+        for field in (spec or "").split(","):
+            field = field.strip()
+            if not field:
+                continue
+            head, _, rest = field.partition(".")
+            if head not in self._keys:
+                self._keys.append(head)
+            if rest:
+                self._nested.setdefault(head, []).append(rest)
+
+    def apply(self, item: dict) -> dict:
+        if not self._keys:
+            return item
+        projected = {}
+        for key in self._keys:
+            if key not in item:
+                continue
+            value = item[key]
+            subkeys = self._nested.get(key)
+            if subkeys and isinstance(value, list):
+                value = [{k: v[k] for k in subkeys if k in v} for v in value if isinstance(v, dict)]
+            projected[key] = value
+        return projected
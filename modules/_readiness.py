@@ -0,0 +1,100 @@
+# _readiness.py
+import threading
+import time
+from typing import Dict, Optional
+
+# STARTUP STATES OF RX.PY, IN THE ORDER THEY NORMALLY HAPPEN
+SPAWNED = "spawned"
+DEVICE_OPENED = "device_opened"
+DEMOD_CONFIGURED = "demod_configured"
+NAC_LOCKED = "nac_locked"
+FIRST_VOICE = "first_voice"
+STATES = (SPAWNED, DEVICE_OPENED, DEMOD_CONFIGURED, NAC_LOCKED, FIRST_VOICE)
+
+READY = NAC_LOCKED  # Control channel decoded; commands and channel switches take effect from here
+
+# LOG ACTION (logMonitorOP25 ENTRY "Action") -> STATE IT PROVES
+ACTION_STATES = {
+    "Using device": DEVICE_OPENED,
+    "demodulator": DEMOD_CONFIGURED,
+    "Reconfiguring NAC": NAC_LOCKED,
+    "voice update": FIRST_VOICE,
+}
+
+
+class ReadinessTracker:
+    """
+    Follows one rx.py run from spawn to first voice using the parsed log stream.
+
+    op25Manager calls spawned() right after Popen; on_entry() is subscribed to the
+    log bus and records the first time each state's log line appears, so nothing
+    re-reads the stderr file. wait_for() blocks on a condition until a state is
+    reached or the timeout passes. States are only recorded for the current run,
+    and a state does not imply the earlier ones (rx.py may not print every line).
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._reached: Dict[str, float] = {}
+        self._spawned_wall: Optional[float] = None
+        self.runs = 0
+        self.last_ready_ms: Optional[float] = None
+
+    def spawned(self):
+        """Starts a new run; every state but SPAWNED is cleared."""
+        with self._cond:
+            self.runs += 1
+            self._reached = {SPAWNED: time.monotonic()}
+            self._spawned_wall = time.time()
+            self._cond.notify_all()
+
+    def stopped(self):
+        """Clears all states, so waiters time out instead of seeing the previous run."""
+        with self._cond:
+            self._reached = {}
+            self._spawned_wall = None
+            self._cond.notify_all()
+
+    def on_entry(self, entry: dict):
+        """Log bus subscriber: one dict lookup for lines that are not startup milestones."""
+        state = ACTION_STATES.get(entry.get("Action"))
+        if state is None or state in self._reached:
+            return
+        with self._cond:
+            if SPAWNED not in self._reached or state in self._reached:
+                return
+            now = time.monotonic()
+            self._reached[state] = now
+            if state == READY:
+                self.last_ready_ms = round((now - self._reached[SPAWNED]) * 1000, 1)
+            self._cond.notify_all()
+
+    def reached(self, state: str) -> bool:
+        return state in self._reached
+
+    def wait_for(self, state: str = READY, timeout: float = 30.0) -> bool:
+        """
+        Blocks until the current run reaches state, or timeout seconds pass.
+
+        Returns:
+            bool: True if the state was reached.
+
+        Raises:
+            ValueError: If state is not one of STATES.
+        """
+        if state not in STATES:
+            raise ValueError(f"Unknown readiness state '{state}'")
+        with self._cond:
+            return self._cond.wait_for(lambda: state in self._reached, timeout)
+
+    def to_dict(self) -> dict:
+        """Each state's time since spawn in milliseconds (None until reached)."""
+        reached = dict(self._reached)
+        spawned = reached.get(SPAWNED)
+        return {
+            "run": self.runs,
+            "spawned_at": self._spawned_wall,
+            "ready": READY in reached,
+            "states": {state: None if state not in reached else round((reached[state] - spawned) * 1000, 1)
+                       for state in STATES},
+            "last_ready_ms": self.last_ready_ms
+        }
@@ -0,0 +1,62 @@
+# _responseCache.py
+import gzip
+import json
+import threading
+from typing import Callable, Dict, Optional
+
+
+class CachedResponse:
+    """Serialized JSON body for one ETag, with its gzip form built on first request."""
+    __slots__ = ("etag", "body", "_gzipped", "_min_gzip_size", "_level")
+
+    def __init__(self, etag: str, body: bytes, min_gzip_size: int, level: int):
+        self.etag = etag
+        self.body = body
+        self._gzipped: Optional[bytes] = None
+        self._min_gzip_size = min_gzip_size
+        self._level = level
+
+    @property
+    def compressible(self) -> bool:
+        return len(self.body) >= self._min_gzip_size
+
+    @property
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=self._level, mtime=0)
+        return self._gzipped
+
+
+class ResponseCache:
+    """
+    Keeps the serialized (and gzipped) JSON of large read endpoints per ETag.
+
+    The caller supplies an ETag that changes whenever the data does, e.g. the
+    catalog snapshot's etag_for("zones"). While the ETag is unchanged every
+    request reuses the same bytes; a new ETag replaces the entry for that key.
+    Bodies smaller than min_gzip_size are never compressed.
+    """
+    def __init__(self, min_gzip_size: int = 1024, gzip_level: int = 6):
+        self._entries: Dict[str, CachedResponse] = {}
+        self._lock = threading.Lock()
+        self._min_gzip_size = min_gzip_size
+        self._gzip_level = gzip_level
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, etag: str, build: Callable[[], object]) -> CachedResponse:
+        """Returns the cached response for key, calling build() for the data if the ETag changed."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.etag == etag:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        body = json.dumps(build(), separators=(",", ":")).encode("utf-8")
+        entry = CachedResponse(etag, body, self._min_gzip_size, self._gzip_level)
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
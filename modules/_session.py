@@ -28,6 +28,7 @@ class SessionMember:
             _activeSystem: The active system object retrieved based on the system index.
             _activeZone: The active zone object retrieved based on the zone index.
             _active_channel: The active channel object retrieved based on the zone and channel indices.
+            _stale (bool): True when an admin change removed the active zone or channel; see refresh().
         """
         self._session_manager = session_mgr  # must be first
 
@@ -41,6 +42,7 @@ class SessionMember:
         self._activeSystem = self._get_system(self.activeSysIndex)
         self._activeZone = self._get_zone(self._activeZoneIndex)
         self._active_channel = self._get_channel(self.activeZoneIndex, self.activeChannelNumber)
+        self._stale = False
 
     def append_line_to_file(self, line: str):
         with open("/opt/op25-project/logs/app_log.txt", 'a') as file:
@@ -102,6 +104,19 @@ class SessionMember:
     def activeTGIDList(self) -> TalkgroupSet:
         return self._activeTGIDList
 
+    @property
+    def isStale(self) -> bool:
+        """True while OP25 is tuned to a zone or channel that is no longer in the catalog."""
+        return self._stale
+
+    def isInScan(self, tgid: int) -> bool:
+        """Returns True if tgid is on the active channel's scan list, or on a whitelist override while one is set. O(1)."""
+        override = self.sessionManager.op25Manager.whitelistOverride
+        if override is not None:
+            return tgid in override
+        channel = self._active_channel
+        return channel is not None and tgid in channel.scanSet
+
     def update_session(self, channel: channelMember, zone: zoneMember, system: systemsMember):
         """
         Update the session state with the provided channel, zone, and system information,
@@ -134,10 +149,56 @@ class SessionMember:
         self._activeSysIndex = system.index
         self._activeSystem = system
         self._activeTGIDList = self._get_tgid_list(system.index)
+        self._stale = False
 
         # Trigger talkgroup or system change
         self._change_talkgroup(did_system_change)
 
+    def refresh(self):
+        """
+        Re-resolves the active zone, channel, system and talkgroup set from the current
+        catalog snapshot after an admin update, so the session does not keep serving
+        objects from the old one. OP25 is not retuned.
+
+        Zone indexes shift when an earlier zone is deleted, so the zone is found by
+        name and the channel by number and sysid (or by name and sysid if it was
+        renumbered), and the active indexes follow it. If the zone or channel is gone,
+        the previous objects are kept and the session is flagged stale until the next
+        channel change.
+        """
+        zone, channel = self._find_active(self._activeZone, self._active_channel)
+        system = self._get_system(self._activeSysIndex)
+        tgid_list = self._get_tgid_list(self._activeSysIndex)
+        if zone and channel:
+            self._activeZone = zone
+            self._active_channel = channel
+            self._activeZoneIndex = zone.index
+            self._activeChannelNumber = channel.channel_number
+        else:
+            self._stale = True
+            self._log_debug(f"Active channel '{self._active_channel.name}' is no longer in the catalog")
+        if system:
+            self._activeSystem = system
+        if tgid_list:
+            self._activeTGIDList = tgid_list
+        self._log_debug(f"Session refreshed from catalog version {self.sessionManager.catalog.version}")
+
+    def _find_active(self, old_zone: zoneMember, old_channel: channelMember):
+        """Returns (zone, channel) of the current snapshot that match the given ones, or (None, None)."""
+        zones = self.sessionManager.zoneManager
+        zone = self._get_zone(old_zone.index)
+        if zone is None or zone.name != old_zone.name:
+            zone = zones.getZoneByName(old_zone.name)
+        if zone is None:
+            return None, None
+        channel = zone.get_channel_by_number(old_channel.channel_number)
+        if channel is not None and channel.sysid == old_channel.sysid:
+            return zone, channel
+        for channel in zone.channels:
+            if channel.name == old_channel.name and channel.sysid == old_channel.sysid:
+                return zone, channel
+        return None, None
+
     def _change_talkgroup(self, did_system_change: bool):
         """
         Handles the change of a talkgroup or system.
@@ -172,12 +233,11 @@ class SessionMember:
             int: HTTP status code (200 for success, 404 if no next channel is found).
         """
         """Switch to the next channel in the current zone."""
-        next_channel_data = self.sessionManager.zoneManager.getNextChannel(self._activeZoneIndex, self._activeChannelNumber)
-        if not next_channel_data:
+        zone = self._get_zone(self._activeZoneIndex)
+        channel = zone.next_channel(self._activeChannelNumber) if zone else None  # Prebuilt channel object
+        if not channel:
             return {"error": "No next channel found"}, 404
 
-        zone = self._get_zone(self._activeZoneIndex)
-        channel = channelMember(next_channel_data, zone.index)  # Updated instantiation
         system = self._get_system(channel.sysid)
 
         self.update_session(channel, zone, system)
@@ -198,12 +258,11 @@ class SessionMember:
                    if no previous channel is found.
         """
         """Switch to the previous channel in the current zone."""
-        prev_channel_data = self.sessionManager.zoneManager.getPreviousChannel(self._activeZoneIndex, self._activeChannelNumber)
-        if not prev_channel_data:
+        zone = self._get_zone(self._activeZoneIndex)
+        channel = zone.previous_channel(self._activeChannelNumber) if zone else None  # Prebuilt channel object
+        if not channel:
             return {"error": "No previous channel found"}, 404
 
-        zone = self._get_zone(self._activeZoneIndex)
-        channel = channelMember(prev_channel_data, zone.index)  # Updated instantiation
         system = self._get_system(channel.sysid)
 
         self.update_session(channel, zone, system)
@@ -228,7 +287,7 @@ class SessionMember:
         if not next_zone_data:
             return {"error": "No next zone found"}, 404
 
-        zone = zoneMember(next_zone_data, next_zone_data.get("zone_index"))
+        zone = self._get_zone(next_zone_data.get("zone_index"))
         channel = zone.channels[0]
         system = self._get_system(channel.sysid) # Remember, sysid is the system index. 
 
@@ -251,12 +310,11 @@ class SessionMember:
             None
         """
         """Switch to a specific channel in the current zone."""
-        channel_data = self.sessionManager.zoneManager.getChannel(self._activeZoneIndex, channel_number)
-        if not channel_data:
+        channel = self.sessionManager.zoneManager.getChannel(self._activeZoneIndex, channel_number)
+        if not channel:
             return {"error": "Channel not found"}, 404
 
         zone = self._get_zone(self._activeZoneIndex)
-        channel = channelMember(channel_data, zone.index)
         system = self._get_system(channel.sysid) # Remember, sysid is the system index. 
         self.update_session(channel, zone, system)
         return self._format_session_response(channel, zone, system)
@@ -281,7 +339,7 @@ class SessionMember:
         if not prev_zone_data:
             return {"error": "No previous zone found"}, 404
 
-        zone = zoneMember(prev_zone_data, prev_zone_data.get("zone_index"))
+        zone = self._get_zone(prev_zone_data.get("zone_index"))
         channel = zone.channels[0]
         system = self._get_system(channel.sysid)
 
@@ -1,6 +1,7 @@
 #sessionHandler.py
 from __future__ import annotations
-from typing import List, TYPE_CHECKING
+import threading
+from typing import List, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from api import API
     from modules._session import sessionMember  # Only imported for type checking
@@ -10,6 +11,7 @@ from modules._op25Manager import op25Manager
 from modules._systemsManager import systemsManager
 from modules._talkgroupSet import TalkgroupSet, TalkgroupMember, TalkgroupManager
 from modules._zoneManager import channelMember, zoneMember, zoneManager
+from modules._catalog import Catalog, CatalogSnapshot
 from typing import List
 
 class SessionManager(object):
@@ -21,34 +23,91 @@ class SessionManager(object):
         # from modules._op25Manager import op25Manager
         # TODO: USE DEFAULT SETTINGS FOR PATHS IN THE FUTURE 
         # NOTE: TO MYSELF
-        self._zoneManager = zoneManager("/opt/op25-project/zones.json")
-        self._talkgroupsManager = TalkgroupManager("/opt/op25-project/talkgroups.json")
-        self._systemsManager = systemsManager("/opt/op25-project/systems.json")
+        # ZONES, SYSTEMS AND TALKGROUPS ARE READ THROUGH ONE IMMUTABLE SNAPSHOT; ADMIN WRITES SWAP IT
+        self._catalog = Catalog(
+            zones=zoneManager("/opt/op25-project/zones.json"),
+            systems=systemsManager("/opt/op25-project/systems.json"),
+            talkgroups=TalkgroupManager("/opt/op25-project/talkgroups.json")
+        )
+        self._warmSearchIndexes(self._catalog.current)
         self._op25Manager = opManager
         self._apiManager = api
         # Pass self into session to resolve the circular reference
         self._thisSession = SessionMember(self, defaultSystemIndex, defaultZoneIndex, defaultChannelIndex)
     
     def reloadManagers(self) -> bool:
-        self._zoneManager._load_zones()
-        self._talkgroupsManager.reload() 
-        #TODO: RELOAD SYSTEMS MANAGER
-        pass
+        """Re-reads zones, systems and talkgroups from disk and publishes them as one new snapshot."""
+        self._publish(lambda current: {
+            "zones": current.zones.reload(),
+            "systems": current.systems.reload(),
+            "talkgroups": current.talkgroups.reload()
+        })
+        return True
+
+    def updateZones(self, data: dict) -> CatalogSnapshot:
+        """Saves a new zones document and publishes it. Returns the new snapshot."""
+        return self._publish(lambda current: {"zones": current.zones.update(data)})
+
+    def updateSystems(self, data: dict) -> CatalogSnapshot:
+        """Saves a new systems document and publishes it. Returns the new snapshot."""
+        return self._publish(lambda current: {"systems": current.systems.update(data)})
+
+    def updateTalkgroups(self, data: dict) -> CatalogSnapshot:
+        """Saves a new talkgroups document and publishes it. Returns the new snapshot."""
+        return self._publish(lambda current: {"talkgroups": current.talkgroups.update(data)})
+
+    def patchCatalog(self, part: str, derive, expected_version: Optional[int] = None) -> CatalogSnapshot:
+        """
+        Applies a single-entry change to one part of the catalog and saves only that part's file.
+
+        Args:
+            part (str): "zones", "systems" or "talkgroups".
+            derive (callable): Receives the current manager for that part and returns the
+                changed manager, e.g. lambda tg: tg.with_talkgroup(0, 46501, {"name": "PD 1"}).
+            expected_version (int, optional): Catalog version the change was based on.
+
+        Raises:
+            CatalogConflict: If the catalog changed since expected_version.
+        """
+        def change(current: CatalogSnapshot) -> dict:
+            manager = derive(getattr(current, part))
+            manager.save()
+            return {part: manager}
+        return self._publish(change, expected_version)
+
+    def _publish(self, change, expected_version: Optional[int] = None) -> CatalogSnapshot:
+        snapshot = self._catalog.apply(change, expected_version)
+        if self._thisSession is not None:
+            self._thisSession.refresh()
+        self._warmSearchIndexes(snapshot)
+        return snapshot
+
+    @staticmethod
+    def _warmSearchIndexes(snapshot: CatalogSnapshot):
+        """Builds the talkgroup search indexes of a new snapshot in the background, off the request path."""
+        def warm():
+            for tg_set in snapshot.talkgroups.sets:
+                tg_set.searchIndex
+        threading.Thread(target=warm, daemon=True).start()
+
+    @property
+    def catalog(self) -> Catalog:
+        return self._catalog
     
     @property 
     def apiManager(self) -> "API":
         return self._apiManager
     @property
     def zoneManager(self) -> zoneManager:
-        return self._zoneManager
+        return self._catalog.current.zones
 
     @property
     def systemsManager(self) -> systemsManager:
-        return self._systemsManager
+        return self._catalog.current.systems
 
     @property
     def talkgroupsManager(self) -> TalkgroupManager:
-        return self._talkgroupsManager
+        return self._catalog.current.talkgroups
 
     @property
     def op25Manager(self) -> op25Manager:
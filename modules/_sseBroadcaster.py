@@ -0,0 +1,125 @@
+# _sseBroadcaster.py
+import itertools
+import json
+import threading
+from collections import deque
+from typing import Any, Iterator, List, Optional, Tuple
+
+DROP_OLDEST = "oldest"  # Drop the oldest buffered event when a subscriber is full
+DROP_MISC = "misc"      # Drop the oldest "Misc" event first, then fall back to the oldest event
+DROP_POLICIES = (DROP_OLDEST, DROP_MISC)
+
+
+class SSESubscriber:
+    """
+    A single SSE client. Holds its own bounded buffer of (event id, event) pairs so a
+    slow or idle browser can never make the server hold more than `capacity` events for it.
+    """
+    def __init__(self, capacity: int, drop_policy: str):
+        self._buffer: deque = deque()
+        self._capacity = capacity
+        self._drop_policy = drop_policy
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def _drop_one(self):
+        if self._drop_policy == DROP_MISC:
+            for i, (_, event) in enumerate(self._buffer):
+                if isinstance(event, dict) and event.get("Action") == "Misc":
+                    del self._buffer[i]
+                    return
+        self._buffer.popleft()
+
+    def put(self, event_id: int, event: Any):
+        with self._cond:
+            if len(self._buffer) >= self._capacity:
+                self._drop_one()
+                self.dropped += 1
+            self._buffer.append((event_id, event))
+            self._cond.notify()
+
+    def get(self, timeout: float) -> Optional[Tuple[int, Any]]:
+        """Returns the next (event id, event), or None if nothing arrived within timeout."""
+        with self._cond:
+            if not self._buffer:
+                self._cond.wait(timeout)
+            if not self._buffer:
+                return None
+            return self._buffer.popleft()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+
+class SSEBroadcaster:
+    """
+    Fans every published event out to all connected SSE subscribers.
+
+    Each event is stamped with an increasing id. A short replay history lets a
+    reconnecting browser resume from its Last-Event-ID. Memory is bounded by
+    replay_size plus capacity per connected subscriber.
+    """
+    def __init__(self, capacity: int = 256, drop_policy: str = DROP_OLDEST, replay_size: int = 512):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown SSE drop policy '{drop_policy}'. Expected one of {DROP_POLICIES}")
+        self._capacity = capacity
+        self._drop_policy = drop_policy
+        self._history: deque = deque(maxlen=replay_size)
+        self._subscribers: List[SSESubscriber] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def last_event_id(self) -> int:
+        return self._history[-1][0] if self._history else 0
+
+    def publish(self, event: Any) -> int:
+        """Stamps event with the next id and delivers it to every subscriber. Returns the id."""
+        with self._lock:
+            event_id = next(self._ids)
+            self._history.append((event_id, event))
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub.put(event_id, event)
+        return event_id
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> SSESubscriber:
+        """
+        Registers a new subscriber.
+
+        Args:
+            last_event_id (int, optional): The last id the client saw. Events after it that
+                are still in the replay history are queued for the subscriber first.
+        """
+        sub = SSESubscriber(self._capacity, self._drop_policy)
+        with self._lock:
+            if last_event_id is not None:
+                for event_id, event in self._history:
+                    if event_id > last_event_id:
+                        sub.put(event_id, event)
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: SSESubscriber):
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+    def stream(self, last_event_id: Optional[int] = None, keepalive: float = 5) -> Iterator[str]:
+        """Yields SSE frames for one client until it disconnects."""
+        sub = self.subscribe(last_event_id)
+        try:
+            while True:
+                item = sub.get(timeout=keepalive)
+                if item is None:
+                    # Prevent client timeout
+                    yield ": keep-alive\n\n"
+                    continue
+                event_id, event = item
+                yield f"id: {event_id}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            self.unsubscribe(sub)
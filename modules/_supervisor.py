@@ -0,0 +1,222 @@
+# _supervisor.py
+import logging
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Deque, Optional
+
+if TYPE_CHECKING:
+    from modules._op25Manager import op25Manager
+
+# EXIT CLASSES, FROM THE LAST LINES RX.PY WROTE TO STDERR
+USB_LOST = "usb_lost"
+AUDIO_BUSY = "audio_busy"
+PORT_IN_USE = "port_in_use"
+TRACEBACK = "traceback"
+SIGNALED = "signaled"
+UNKNOWN = "unknown"
+
+# CHECKED IN ORDER; THE FIRST CLASS WITH A MATCHING LINE WINS
+EXIT_MARKERS = (
+    (USB_LOST, ("usb_claim_interface error", "LIBUSB_ERROR", "No supported devices found",
+                "Failed to open rtlsdr device", "rtlsdr_read_async", "cb transfer status", "lost device")),
+    (AUDIO_BUSY, ("Device or resource busy", "audio open error", "snd_pcm_open", "Unable to open audio")),
+    (PORT_IN_USE, ("Address already in use",)),
+    (TRACEBACK, ("Traceback (most recent call last)",)),
+)
+
+RUNNING = "running"
+STOPPED = "stopped"
+BACKOFF = "backoff"
+CRASH_LOOP = "crash_loop"
+
+
+def classify_exit(returncode: int, tail: str) -> tuple:
+    """Returns (exit class, detail line) for a finished rx.py."""
+    lines = [line.strip() for line in tail.splitlines() if line.strip()]
+    for reason, markers in EXIT_MARKERS:
+        for line in reversed(lines):
+            if any(marker in line for marker in markers):
+                # FOR A TRACEBACK THE USEFUL PART IS THE EXCEPTION ON THE LAST LINE
+                return reason, lines[-1] if reason == TRACEBACK else line
+    if returncode is not None and returncode < 0:
+        return SIGNALED, f"killed by signal {-returncode}"
+    return UNKNOWN, lines[-1] if lines else ""
+
+
+class ProcessSupervisor:
+    """
+    Watches rx.py and restarts it when it dies unexpectedly.
+
+    op25Manager calls watch() after every Popen and expect_exit() before it stops
+    the process on purpose. A daemon thread blocks in wait() (waitpid) on the
+    watched child; when it exits unexpectedly, the exit is classified from the
+    stderr tail and rx.py is restarted after an exponential backoff
+    (backoff_initial, doubling up to backoff_max). A run that stayed up for
+    stable_uptime seconds resets the backoff. After crash_limit crashes within
+    crash_window seconds the supervisor is in crash_loop and only retries every
+    crash_cooldown seconds, so a missing dongle is not hammered but the unit still
+    recovers on its own once the USB SDR comes back.
+    """
+    def __init__(self, manager: "op25Manager", backoff_initial: float = 1.0, backoff_max: float = 60.0,
+                 crash_limit: int = 5, crash_window: float = 300.0, crash_cooldown: float = 60.0,
+                 stable_uptime: float = 120.0,
+                 publish: Optional[Callable[[dict], None]] = None, tail_bytes: int = 8192):
+        self._manager = manager
+        self._backoff_initial = backoff_initial
+        self._backoff_max = backoff_max
+        self._crash_limit = crash_limit
+        self._crash_window = crash_window
+        self._crash_cooldown = crash_cooldown
+        self._stable_uptime = stable_uptime
+        self._tail_bytes = tail_bytes
+        self.publish = publish  # Optional sink for exit/restart events, e.g. the log bus
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._expected = False
+        self._started: Optional[float] = None
+        self._crashes: Deque[float] = deque()
+        self._consecutive = 0
+        self._next_restart: Optional[float] = None
+        self.state = STOPPED
+        self.restarts = 0
+        self.total_crashes = 0
+        self.last_exit: Optional[dict] = None
+
+    def watch(self, process: subprocess.Popen):
+        """Starts supervising a freshly spawned rx.py."""
+        with self._lock:
+            self._process = process
+            self._expected = False
+            self._started = time.monotonic()
+            self._next_restart = None
+            self.state = RUNNING
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="rx-supervisor", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def expect_exit(self):
+        """Marks the watched process as stopping on purpose; its exit will not trigger a restart."""
+        with self._lock:
+            self._expected = True
+            self.state = STOPPED
+
+    def reset(self):
+        """Forgets earlier crashes; called on a manual restart so a crash loop can be retried."""
+        with self._lock:
+            self._crashes.clear()
+            self._consecutive = 0
+
+    def close(self):
+        self._closed.set()
+        self._wake.set()
+
+    @property
+    def uptime(self) -> Optional[float]:
+        started = self._started
+        return None if started is None or self.state != RUNNING else time.monotonic() - started
+
+    def _run(self):
+        while not self._closed.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            process = self._process
+            if process is None:
+                continue
+            returncode = process.wait()
+            with self._lock:
+                if process is not self._process or self._expected:
+                    continue  # STOPPED OR REPLACED ON PURPOSE
+                self.state = BACKOFF
+            self._handle_crash(returncode)
+
+    def _handle_crash(self, returncode: int):
+        now = time.monotonic()
+        uptime = now - (self._started or now)
+        reason, detail = classify_exit(returncode, self._stderr_tail())
+        self._manager.readiness.stopped()
+
+        with self._lock:
+            self.total_crashes += 1
+            if uptime >= self._stable_uptime:
+                self._consecutive = 0
+            self._consecutive += 1
+            self._crashes.append(now)
+            while self._crashes and now - self._crashes[0] > self._crash_window:
+                self._crashes.popleft()
+            looping = len(self._crashes) >= self._crash_limit
+            if looping:
+                delay = self._crash_cooldown
+            else:
+                delay = min(self._backoff_max, self._backoff_initial * 2 ** (self._consecutive - 1))
+            self.state = CRASH_LOOP if looping else BACKOFF
+            self._next_restart = now + delay
+            self.last_exit = {
+                "code": returncode,
+                "reason": reason,
+                "detail": detail,
+                "uptime_s": round(uptime, 1),
+                "at": time.time(),
+                "restart_in_s": delay
+            }
+
+        if looping:
+            logging.error(f"rx.py crashed {len(self._crashes)} times in {self._crash_window:.0f}s "
+                          f"({reason}: {detail}); crash loop, retrying in {delay:.1f}s")
+        else:
+            logging.error(f"rx.py exited with {returncode} ({reason}: {detail}); restarting in {delay:.1f}s")
+        self._emit("rx.py exited")
+        if self._closed.wait(delay):
+            return
+
+        with self._lock:
+            if self.state not in (BACKOFF, CRASH_LOOP):
+                return  # SOMEONE STARTED OR STOPPED RX.PY DURING THE BACKOFF
+            self.restarts += 1
+        try:
+            self._manager.relaunch()
+        except Exception as e:
+            logging.error(f"rx.py restart failed: {e}")
+            with self._lock:
+                self.state = STOPPED
+            return
+        self._emit("rx.py restarted")
+
+    def _stderr_tail(self) -> str:
+        """Reads the end of the stderr log; read here rather than from the log monitor, which may lag."""
+        try:
+            with open(self._manager.stderr_file, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - self._tail_bytes))
+                return f.read().decode("utf-8", errors="replace")
+        except OSError:
+            return ""
+
+    def _emit(self, action: str):
+        if self.publish is None:
+            return
+        try:
+            self.publish({"Action": action, **self.to_dict()})
+        except Exception as e:
+            logging.error(f"Supervisor event failed: {e}")
+
+    def to_dict(self) -> dict:
+        next_restart = self._next_restart
+        uptime = self.uptime
+        return {
+            "state": self.state,
+            "pid": self._process.pid if self._process is not None else None,
+            "uptime_s": None if uptime is None else round(uptime, 1),
+            "restarts": self.restarts,
+            "crashes": self.total_crashes,
+            "recent_crashes": len(self._crashes),
+            "next_restart_in_s": None if next_restart is None else round(max(0.0, next_restart - time.monotonic()), 1),
+            "last_exit": self.last_exit
+        }
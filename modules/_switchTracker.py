@@ -0,0 +1,153 @@
+# _switchTracker.py
+import threading
+import time
+from collections import deque
+from typing import Deque, Iterable, Optional
+
+# LOG ACTIONS THAT PROVE OP25 IS FOLLOWING A TALKGROUP
+CONFIRM_ACTIONS = frozenset({"voice update", "hold active"})
+
+PENDING = "pending"
+CONFIRMED = "confirmed"
+UNCONFIRMED = "unconfirmed"
+FAILED = "failed"
+
+
+class SwitchRecord:
+    """
+    Timeline of one channel switch, in monotonic seconds from the HTTP handler.
+
+    written: the whitelist/blacklist files were replaced.
+    acked: OP25 answered the reload command.
+    confirmed: the first voice traffic on a tgid that only the new channel scans.
+    """
+    __slots__ = ("id", "label", "mode", "tgids", "_confirmSet", "started", "written", "acked", "confirmed",
+                 "confirmed_tgid", "status", "error")
+
+    def __init__(self, switch_id: int, label: str, mode: str, tgids: frozenset, previous: frozenset):
+        self.id = switch_id
+        self.label = label
+        self.mode = mode
+        self.tgids = tgids
+        # TRAFFIC ON A TGID BOTH CHANNELS SCAN DOES NOT SHOW THE NEW LIST IS ACTIVE
+        self._confirmSet = (tgids - previous) or tgids
+        self.started = time.monotonic()
+        self.written: Optional[float] = None
+        self.acked: Optional[float] = None
+        self.confirmed: Optional[float] = None
+        self.confirmed_tgid: Optional[int] = None
+        self.status = PENDING
+        self.error: Optional[str] = None
+
+    def confirms(self, tgid: int) -> bool:
+        return tgid in self._confirmSet
+
+    def _ms(self, stamp: Optional[float]) -> Optional[float]:
+        return None if stamp is None else round((stamp - self.started) * 1000, 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "mode": self.mode,
+            "status": self.status,
+            "tgids": len(self.tgids),
+            "written_ms": self._ms(self.written),
+            "acked_ms": self._ms(self.acked),
+            "confirmed_ms": self._ms(self.confirmed),
+            "confirmed_tgid": self.confirmed_tgid,
+            "error": self.error
+        }
+
+
+class SwitchTracker:
+    """
+    Measures channel switches end to end.
+
+    op25Manager calls begin() when a switch starts and records each stage on the
+    returned SwitchRecord. on_entry() is subscribed to the log bus and confirms the
+    pending switch from the first voice update on one of its tgids. A switch that
+    sees no such traffic within confirm_timeout seconds is reported as unconfirmed;
+    a quiet talkgroup list looks the same as a reload that did not take.
+    """
+    def __init__(self, confirm_timeout: float = 15.0, history: int = 50):
+        self._confirm_timeout = confirm_timeout
+        self._records: Deque[SwitchRecord] = deque(maxlen=history)
+        self._pending: Optional[SwitchRecord] = None
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+    def begin(self, label: str, tgids: Iterable[int], previous: Iterable[int] = (), mode: str = "hot") -> SwitchRecord:
+        """
+        Starts timing a switch from the whitelist rx.py is running with (previous,
+        tracked by op25Manager) to tgids. Passed in rather than taken from the last
+        record, which is wrong after boot and after a failed switch.
+        """
+        tgids = frozenset(int(tgid) for tgid in tgids)
+        previous = frozenset(previous)
+        with self._lock:
+            if self._pending is not None and self._pending.status == PENDING:
+                self._pending.status = UNCONFIRMED  # SUPERSEDED BEFORE ANY TRAFFIC
+            record = SwitchRecord(self._next_id, label, mode, tgids, previous)
+            self._next_id += 1
+            self._records.append(record)
+            self._pending = record
+        return record
+
+    def mark_written(self, record: SwitchRecord):
+        record.written = time.monotonic()
+
+    def mark_acked(self, record: SwitchRecord):
+        record.acked = time.monotonic()
+
+    def fail(self, record: SwitchRecord, error: str):
+        record.error = error
+        record.status = FAILED
+        with self._lock:
+            if self._pending is record:
+                self._pending = None
+
+    def on_entry(self, entry: dict):
+        """Log bus subscriber; cheap for everything except voice updates while a switch is pending."""
+        record = self._pending
+        if record is None or entry.get("Action") not in CONFIRM_ACTIONS:
+            return
+        now = time.monotonic()
+        if now - record.started > self._confirm_timeout:
+            self._expire(record)
+            return
+        try:
+            tgid = int(entry.get("Talkgroup"))
+        except (TypeError, ValueError):
+            return
+        if record.confirms(tgid):
+            with self._lock:
+                if self._pending is not record:
+                    return
+                self._pending = None
+            record.confirmed = now
+            record.confirmed_tgid = tgid
+            record.status = CONFIRMED
+
+    def _expire(self, record: SwitchRecord):
+        with self._lock:
+            if self._pending is record:
+                self._pending = None
+                record.status = UNCONFIRMED
+
+    def stats(self) -> dict:
+        """Returns recent switches (newest first) and confirmation latency figures in milliseconds."""
+        pending = self._pending
+        if pending is not None and time.monotonic() - pending.started > self._confirm_timeout:
+            self._expire(pending)
+        records = list(self._records)
+        confirmed = sorted((r.confirmed - r.started) * 1000 for r in records if r.status == CONFIRMED)
+        acked = sorted((r.acked - r.started) * 1000 for r in records if r.acked is not None)
+        return {
+            "count": len(records),
+            "confirmed": len(confirmed),
+            "confirm_ms_p50": round(confirmed[len(confirmed) // 2], 1) if confirmed else None,
+            "confirm_ms_max": round(confirmed[-1], 1) if confirmed else None,
+            "ack_ms_p50": round(acked[len(acked) // 2], 1) if acked else None,
+            "recent": [r.to_dict() for r in reversed(records)]
+        }
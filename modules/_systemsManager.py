@@ -2,11 +2,13 @@ from __future__ import annotations  # You already have this
 import json
 import os
 import tempfile
-import shutil
 from typing import TYPE_CHECKING
 
+from modules._artifactCache import digest_of
 from modules._talkgroupSet import TalkgroupManager
+from modules._jsonStore import JsonStore
 if TYPE_CHECKING:
+    from modules._artifactCache import ArtifactCache
     from modules._session import session
 
 
@@ -120,9 +122,14 @@ class systemsMember:
             self._trunkFilePath = os.path.join(tempfile.gettempdir(), f"{safe_name}_trunk.tsv")
         return self._trunkFilePath
 
-    def toTrunkTSV(self, _session: session.SessionMember):
+    def toTrunkTSV(self, _session: session.SessionMember, artifacts: "ArtifactCache" = None,
+                   whitelist: str = None, blacklist: str = None):
         """
         Writes the trunk.tsv file for OP25 using the provided session object.
+
+        With artifacts, the trunk file and the talkgroup CSV are content-addressed
+        and only written when their content changed. whitelist/blacklist override
+        the channel's own files, e.g. with stable links that a hot switch re-points.
         """
       
         headers = [
@@ -146,40 +153,51 @@ class systemsMember:
             "0",
             self.nac or "0",
             self.modulation or "",
-            _session.activeTGIDList.toTalkgroupsCSV() or "",
-            _session.activeChannel.toWhitelistTSV(),
-            _session.activeChannel.toBlacklistTSV(),
+            _session.activeTGIDList.toTalkgroupsCSV(artifacts) or "",
+            whitelist or _session.activeChannel.toWhitelistTSV(artifacts),
+            blacklist or _session.activeChannel.toBlacklistTSV(artifacts),
             str(self.center_frequency or "")
         ]
 
-        with open(self.trunkFilePath, "w") as f:
+        def write(f):
             f.write("\t".join(headers) + "\n")
             f.write("\t".join(values) + "\n")
 
+        if artifacts is not None:
+            return artifacts.materialize("trunk", ".tsv", digest_of("trunk", values), write)
+
+        with open(self.trunkFilePath, "w") as f:
+            write(f)
+
         #return "/opt/op25-project/templates/_trunk.tsv"
         return self.trunkFilePath
 
 class systemsManager:
-    """Represents an entire group of systems."""
-    def __init__(self, file_path):
+    """
+    Represents an entire group of systems.
+
+    A systemsManager is not modified after it is built; it is part of a CatalogSnapshot.
+    reload(), update() and with_system() return a new manager instead.
+    """
+    def __init__(self, file_path, data=None):
         self.file_path = file_path
-        self.data = self._read_file()
+        self._store = JsonStore.open(file_path, backup_suffix=".bak")
+        self.data = data if data is not None else self._read_file()
         self.members = self._initialize_members()
+        self._build_indexes()
 
     def _read_file(self):
         """
-        Reads and parses a JSON file from the specified file path.
+        Reads and parses the systems file, recovering from the backup if it is corrupt.
 
-        If the file does not exist, an empty dictionary is returned.
+        If neither the file nor its backup can be read, an empty dictionary is returned.
 
         Returns:
             dict: The contents of the JSON file as a dictionary, or an empty
             dictionary if the file does not exist.
         """
-        if not os.path.exists(self.file_path):
-            return {}
-        with open(self.file_path, 'r') as f:
-            return json.load(f)
+        data = self._store.load()
+        return data if data is not None else {}
 
     def _initialize_members(self):
         """
@@ -195,38 +213,68 @@ class systemsManager:
         """
         return [systemsMember(self.data[key], parent=self, index=int(key)) for key in sorted(self.data.keys(), key=int)]
 
+    def _build_indexes(self):
+        """
+        Builds the index, name and NAC lookups over `self.members`.
 
-    def reload(self):
+        Called once per load so lookups and next/previous navigation return the
+        cached members (and their cached file paths) without rescanning `self.data`.
         """
-        Reloads system data from the original JSON file, discarding any current in-memory changes.
+        by_index = {member.index: member for member in self.members}
+        by_name = {}
+        by_nac = {}
+        for member in self.members:
+            by_name.setdefault(member.sysname, member)
+            by_nac.setdefault(member.nac, member)
+        positions = {member.index: pos for pos, member in enumerate(self.members)}
+        self._byIndex, self._byName, self._byNAC, self._positions = by_index, by_name, by_nac, positions
+
+    def reload(self) -> systemsManager:
         """
-        self.data = self._read_file()
-        self.members = self._initialize_members()
+        Returns a new systemsManager read from the original JSON file.
+        """
+        return systemsManager(self.file_path)
         
-    def update(self, new_data):
+    def update(self, new_data) -> systemsManager:
         """
-        Updates the current system data with new_data and writes it to file.
-        Before overwriting the original file, creates a backup with the .bak extension.
+        Saves new_data as the systems file and returns a new systemsManager built from it.
+        The previous file is kept with the .bak extension.
 
         Args:
             new_data (dict): The new system configuration data to save.
 
-        Raises:
-            IOError: If file operations fail.
+        Returns:
+            systemsManager: A manager for new_data. This instance is not modified.
         """
-        self.data = new_data
+        manager = systemsManager(self.file_path, data=new_data)
+        manager.save()
+        return manager
 
-        # Create backup of the original file
-        if os.path.exists(self.file_path):
-            backup_path = self.file_path + ".bak"
-            shutil.copy2(self.file_path, backup_path)
+    def with_system(self, index: int, fields: dict | None) -> systemsManager:
+        """
+        Returns a new systemsManager with one system added or updated (fields merged
+        into it), or removed if fields is None. This instance is not modified.
 
-        # Write updated data to file
-        with open(self.file_path, 'w') as f:
-            json.dump(self.data, f, indent=4)
-            
-        # RELOAD THE FILE WITH NEW DATA
-        self.reload()
+        Raises:
+            KeyError: If a removed system does not exist.
+            ValueError: If the resulting system has no sysname, no numeric control
+                channels, or a nac that is not a number (decimal or 0x hex).
+        """
+        key = str(index)
+        data = dict(self.data)
+        if fields is None:
+            if key not in data:
+                raise KeyError(f"System {index} not found")
+            del data[key]
+        else:
+            system = {**data.get(key, {}), **fields, "index": index}
+            _validate_system(system)
+            data[key] = system
+        return systemsManager(self.file_path, data=data)
+
+    def save(self):
+        """Schedules the systems file to be written (debounced, atomic; the old file becomes systems.json.bak)."""
+        self._store.save(self.data)
 
     @property
     def systems(self):
@@ -240,13 +288,16 @@ class systemsManager:
             index (int): The index of the system to retrieve.
 
         Returns:
-            systemsMember: An instance of systemsMember initialized with the data
-            corresponding to the given index, or None if the index does not exist.
+            systemsMember: The cached systemsMember for the given index, or None
+            if the index does not exist.
         """
-        try:
-            return systemsMember(self.data[str(index)], parent=self, index=index)
-        except KeyError:
-            return None
+        member = self._byIndex.get(index)
+        if member is None and not isinstance(index, int):
+            try:
+                member = self._byIndex.get(int(index))
+            except (TypeError, ValueError):
+                return None
+        return member
 
     def getSystemByName(self, sysname) -> systemsMember:
         """
@@ -259,10 +310,7 @@ class systemsManager:
             systemsMember: An instance of systemsMember corresponding to the 
                            specified system name, or None if no match is found.
         """
-        for key, entry in self.data.items():
-            if entry.get("sysname") == sysname:
-                return systemsMember(entry, parent=self, index=int(key))
-        return None
+        return self._byName.get(sysname)
 
     def getSystemByNAC(self, nac) -> systemsMember:
         """
@@ -275,10 +323,10 @@ class systemsManager:
             systemsMember: An instance of `systemsMember` corresponding to the 
             provided NAC, or `None` if no matching system is found.
         """
-        for key, entry in self.data.items():
-            if entry.get("nac") == nac:
-                return systemsMember(entry, parent=self, index=int(key))
-        return None
+        member = self._byNAC.get(nac)
+        if member is None and not isinstance(nac, str):
+            member = self._byNAC.get(str(nac))
+        return member
 
     def getAllSystemNames(self) -> list[str]:
         """
@@ -301,14 +349,17 @@ class systemsManager:
 
         Returns:
             systemsMember | None: An instance of `systemsMember` representing the next system 
-            in the sequence, or `None` if there are no systems available.
+            in the sequence, or `None` if there are no systems available or current_index
+            is not a number.
         """
-        keys = sorted(self.data.keys(), key=int)
-        if not keys:
+        members = self.members
+        if not members:
+            return None
+        try:
+            current_pos = self._positions.get(int(current_index), -1)
+        except (TypeError, ValueError):
             return None
-        current_pos = keys.index(str(current_index)) if str(current_index) in keys else -1
-        next_index = (current_pos + 1) % len(keys)
-        return systemsMember(self.data[keys[next_index]], parent=self, index=next_index)
+        return members[(current_pos + 1) % len(members)]
 
     def previousSystem(self, current_index) -> systemsMember:
         """
@@ -319,7 +370,8 @@ class systemsManager:
 
         Returns:
             systemsMember: An instance of `systemsMember` representing the previous system
-            in the sequence. If the data is empty, an empty dictionary is returned.
+            in the sequence. If the data is empty, an empty dictionary is returned; if
+            current_index is not a number, None is returned.
 
         Notes:
             - The systems are sorted by their keys (converted to integers) to determine
@@ -329,12 +381,14 @@ class systemsManager:
             - The sequence wraps around, so if the current system is the first one,
               the previous system will be the last one in the sequence.
         """
-        keys = sorted(self.data.keys(), key=int)
-        if not keys:
+        members = self.members
+        if not members:
             return {}
-        current_pos = keys.index(str(current_index)) if str(current_index) in keys else 0
-        previous_index = (current_pos - 1) % len(keys)
-        return systemsMember(self.data[keys[previous_index]], parent=self, index=previous_index)
+        try:
+            current_pos = self._positions.get(int(current_index), 0)
+        except (TypeError, ValueError):
+            return None
+        return members[(current_pos - 1) % len(members)]
     
 
     def toJSON(self) -> str: # SEE API.PY :: /admin/systems endpoint; might be ok to remove
@@ -344,4 +398,21 @@ class systemsManager:
         Returns:
             str: A JSON string representation of the `data` attribute, formatted with an indentation of 4 spaces.
         """
-        return json.dumps(self.data, indent=4)
\ No newline at end of file
+        return JsonStore.export(self.data)
+
+
+def _validate_system(system: dict):
+    """Checks the fields OP25's trunk file needs; raises ValueError naming the first bad one."""
+    if not str(system.get("sysname") or "").strip():
+        raise ValueError("A system needs a sysname")
+    channels = system.get("control_channels")
+    if not isinstance(channels, list) or not channels:
+        raise ValueError("control_channels must be a non-empty list of frequencies")
+    try:
+        [float(freq) for freq in channels]
+    except (TypeError, ValueError):
+        raise ValueError(f"control_channels must be numbers, got {channels!r}")
+    try:
+        int(str(system.get("nac", "0") or "0"), 0)
+    except ValueError:
+        raise ValueError(f"nac must be a number, got {system.get('nac')!r}")
@@ -0,0 +1,145 @@
+# _talkgroupImport.py
+import csv
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+# HEADER NAMES ACCEPTED FOR EACH COLUMN (LOWERCASE). FILES WITHOUT A HEADER USE THIS COLUMN ORDER.
+COLUMNS = {
+    "tgid": ("decimal", "tgid", "dec"),
+    "name": ("alpha tag", "alpha_tag", "name", "alphatag"),
+    "priority": ("priority", "prio"),
+    "category": ("category", "tag"),
+}
+POSITIONAL = ("tgid", "name", "priority", "category")
+
+MAX_REPORTED_ERRORS = 20
+
+
+class TalkgroupCSVImporter:
+    """
+    Reads talkgroups from CSV row by row, in the `Decimal,Alpha Tag` format of
+    templates/_tgroups.csv plus optional Priority and Category columns.
+
+    The input is consumed as a stream of lines (a file, or a Flask request
+    stream), so the upload is never held in memory as a whole; only the parsed
+    talkgroups are kept, deduplicated by tgid (the last row wins). progress(percent)
+    is called every batch_size rows when the total size in bytes is known.
+
+    Args:
+        batch_size (int): Rows between progress reports.
+        progress (callable, optional): Receives an int percentage 0-100.
+    """
+    def __init__(self, batch_size: int = 500, progress: Optional[Callable[[int], None]] = None):
+        self.batch_size = batch_size
+        self._progress = progress
+        self.rows = 0
+        self.duplicates = 0
+        self.skipped = 0
+        self.errors: List[str] = []
+        self._bytes_read = 0
+        self._last_percent = -1
+
+    def read(self, stream: Iterable[bytes], total_bytes: Optional[int] = None) -> Dict[int, dict]:
+        """
+        Parses the CSV stream.
+
+        Args:
+            stream: Binary line iterator, e.g. open(path, "rb") or request.stream.
+            total_bytes (int, optional): Stream size, for progress reporting.
+
+        Returns:
+            dict: tgid -> fields ("name", and "priority"/"category" when present).
+        """
+        talkgroups: Dict[int, dict] = {}
+        reader = csv.reader(self._decode(stream))
+        columns = None
+        for line_number, row in enumerate(reader, start=1):
+            if not row or not any(cell.strip() for cell in row):
+                continue
+            if columns is None:
+                columns = self._columns(row)
+                if columns is not None:
+                    continue
+                columns = {name: pos for pos, name in enumerate(POSITIONAL)}
+
+            self.rows += 1
+            fields = self._fields(row, columns, line_number)
+            if fields is not None:
+                tgid = fields.pop("tgid")
+                if tgid in talkgroups:
+                    self.duplicates += 1
+                talkgroups[tgid] = fields
+
+            if self.rows % self.batch_size == 0:
+                self._report(total_bytes)
+        self._report(total_bytes, done=True)
+        return talkgroups
+
+    def summary(self, imported: int) -> dict:
+        return {
+            "rows": self.rows,
+            "imported": imported,
+            "duplicates": self.duplicates,
+            "skipped": self.skipped,
+            "errors": self.errors
+        }
+
+    def _decode(self, stream: Iterable[bytes]) -> Iterator[str]:
+        first = True
+        for raw in stream:
+            self._bytes_read += len(raw)
+            line = raw.decode("utf-8-sig" if first else "utf-8", errors="replace")
+            first = False
+            yield line
+
+    @staticmethod
+    def _columns(row: List[str]) -> Optional[Dict[str, int]]:
+        """Returns column positions if row is a header, or None if it is already data."""
+        if row[0].strip().isdigit():
+            return None
+        columns = {}
+        for pos, cell in enumerate(row):
+            label = cell.strip().lower()
+            for name, aliases in COLUMNS.items():
+                if label in aliases and name not in columns:
+                    columns[name] = pos
+        if "tgid" not in columns:
+            columns["tgid"] = 0
+        if "name" not in columns:
+            columns["name"] = 1
+        return columns
+
+    def _fields(self, row: List[str], columns: Dict[str, int], line_number: int) -> Optional[dict]:
+        def cell(name: str) -> str:
+            pos = columns.get(name)
+            return row[pos].strip() if pos is not None and pos < len(row) else ""
+
+        try:
+            fields = {"tgid": int(cell("tgid")), "name": cell("name")}
+            if cell("priority"):
+                fields["priority"] = int(cell("priority"))
+        except ValueError:
+            self.skipped += 1
+            if len(self.errors) < MAX_REPORTED_ERRORS:
+                self.errors.append(f"Line {line_number}: expected numeric Decimal/Priority, got {row!r}")
+            return None
+        if not fields["name"]:
+            self.skipped += 1
+            if len(self.errors) < MAX_REPORTED_ERRORS:
+                self.errors.append(f"Line {line_number}: missing Alpha Tag for talkgroup {fields['tgid']}")
+            return None
+        if cell("category"):
+            fields["category"] = cell("category")
+        return fields
+
+    def _report(self, total_bytes: Optional[int], done: bool = False):
+        if self._progress is None:
+            return
+        if done:
+            percent = 100
+        elif total_bytes:
+            percent = min(99, int(self._bytes_read * 100 / total_bytes))
+        else:
+            return
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self._progress(percent)
@@ -0,0 +1,105 @@
+# _talkgroupSearch.py
+import re
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Iterator, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from modules._talkgroupSet import TalkgroupMember
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# RESULT RANKS, BEST FIRST
+EXACT_TGID = 0
+TGID_PREFIX = 1
+NAME_PREFIX = 2
+TOKEN_PREFIX = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """Splits text into lowercase alphanumeric tokens: "PD 1 Car/Car" -> ["pd", "1", "car", "car"]."""
+    return _TOKEN.findall(text.lower())
+
+
+class TalkgroupSearchIndex:
+    """
+    Prefix search over one talkgroup set, for autocomplete.
+
+    Holds three sorted arrays, searched with bisect: tgids as strings, the first
+    token of each name, and every name token. A query matches a talkgroup when
+    every query token is a prefix of one of its name tokens or of its tgid. Results
+    come best first: exact tgid, tgid prefix, name starts with the query, then
+    any other name token, and scanning stops as soon as `limit` results are found.
+
+    The index belongs to an immutable TalkgroupSet, so a changed set gets a new one.
+    """
+    def __init__(self, talkgroups: Sequence["TalkgroupMember"]):
+        self._members = list(talkgroups)
+        self._tokens: List[Tuple[str, ...]] = []
+        tgids, starts, tokens = [], [], []
+        for pos, tg in enumerate(self._members):
+            tgid = str(tg.tgid)
+            name_tokens = tuple(tokenize(tg.name or ""))
+            self._tokens.append(name_tokens + (tgid,))
+            tgids.append((tgid, pos))
+            if name_tokens:
+                starts.append((name_tokens[0], pos))
+            tokens.extend((token, pos) for token in name_tokens[1:])
+        tgids.sort()
+        starts.sort()
+        tokens.sort()
+        self._byTgid = {tg.tgid: pos for pos, tg in enumerate(self._members)}
+        self._tgidKeys, self._tgidPos = self._split(tgids)
+        self._startKeys, self._startPos = self._split(starts)
+        self._tokenKeys, self._tokenPos = self._split(tokens)
+
+    @staticmethod
+    def _split(pairs: List[Tuple[str, int]]) -> Tuple[List[str], List[int]]:
+        return [key for key, _ in pairs], [pos for _, pos in pairs]
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[int, "TalkgroupMember"]]:
+        """Returns up to limit (rank, member) pairs, best first."""
+        terms = tokenize(query)
+        if not terms or limit <= 0:
+            return []
+        first, rest = terms[0], terms[1:]
+        results: List[Tuple[int, "TalkgroupMember"]] = []
+        seen = set()
+        for rank, pos in self._candidates(first, query.strip()):
+            if pos in seen:
+                continue
+            seen.add(pos)
+            if rest and not self._matches(pos, rest):
+                continue
+            results.append((rank, self._members[pos]))
+            if len(results) >= limit:
+                break
+        return results
+
+    def _candidates(self, first: str, query: str) -> Iterator[Tuple[int, int]]:
+        if query.isdigit():
+            pos = self._byTgid.get(int(query))
+            if pos is not None:
+                yield EXACT_TGID, pos
+            for pos in self._prefix(self._tgidKeys, self._tgidPos, first):
+                yield TGID_PREFIX, pos
+        for pos in self._prefix(self._startKeys, self._startPos, first):
+            yield NAME_PREFIX, pos
+        for pos in self._prefix(self._tokenKeys, self._tokenPos, first):
+            yield TOKEN_PREFIX, pos
+        if not query.isdigit() and first.isdigit():
+            for pos in self._prefix(self._tgidKeys, self._tgidPos, first):
+                yield TGID_PREFIX, pos
+
+    @staticmethod
+    def _prefix(keys: List[str], positions: List[int], prefix: str) -> Iterator[int]:
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            yield positions[i]
+            i += 1
+
+    def _matches(self, pos: int, terms: List[str]) -> bool:
+        tokens = self._tokens[pos]
+        return all(any(token.startswith(term) for token in tokens) for term in terms)
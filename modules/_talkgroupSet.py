@@ -2,10 +2,15 @@ import json
 import os
 import csv
 import tempfile
-import shutil
-from typing import TYPE_CHECKING, Union  # Add TYPE_CHECKING for conditional imports
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Optional, TextIO, Union  # Add TYPE_CHECKING for conditional imports
+
+from modules._artifactCache import digest_of
+from modules._jsonStore import JsonStore
+from modules._talkgroupSearch import TalkgroupSearchIndex
 
 if TYPE_CHECKING:
+    from modules._artifactCache import ArtifactCache
     from modules._sessionManager import sessionManager  # Import only for type hints
 
 class TalkgroupMember:
@@ -51,6 +56,11 @@ class TalkgroupSet:
         self._talkgroups = [
             TalkgroupMember(tg, self, index) for index, tg in tg_data.items()
         ]
+        self._byTgid = {tg.tgid: tg for tg in self._talkgroups}  # tgid -> member, built once per load
+        self._names = {tg.tgid: tg.name for tg in self._talkgroups}
+        self._searchIndex = None
+        self._ordered = None
+        self._digest = None
         self._talkgroup_csv_file_path = ""
 
     @property
@@ -66,22 +76,62 @@ class TalkgroupSet:
         return self._sysid
 
     def getTalkgroup(self, tgid: int) -> Union["TalkgroupMember", None]:
+        tg = self._byTgid.get(tgid)
+        if tg is None and not isinstance(tgid, int):
+            try:
+                tg = self._byTgid.get(int(tgid))
+            except (TypeError, ValueError):
+                return None
+        return tg
+
+    def getName(self, tgid: int) -> Union[str, None]:
+        """Returns the talkgroup's name, or None if the tgid is not in this set."""
+        return self._names.get(tgid)
+
+    def to_dict(self) -> dict:
+        """Returns this set's talkgroups as stored in talkgroups.json (key -> talkgroup)."""
+        return self._tg_data
+
+    @property
+    def orderedByTgid(self) -> tuple[list[TalkgroupMember], list[int]]:
+        """Members sorted by tgid and the matching tgid list, for paging. Built on first use."""
+        if self._ordered is None:
+            members = sorted(self._talkgroups, key=lambda tg: tg.tgid)
+            self._ordered = (members, [tg.tgid for tg in members])
+        return self._ordered
+
+    @property
+    def searchIndex(self) -> TalkgroupSearchIndex:
+        """Autocomplete index for this set, built on first use and kept as long as the set is."""
+        if self._searchIndex is None:
+            self._searchIndex = TalkgroupSearchIndex(self._talkgroups)
+        return self._searchIndex
+
+    @property
+    def artifactDigest(self) -> str:
+        """Hash of the (tgid, name) rows the tgroups CSV is made from; computed once per set."""
+        if self._digest is None:
+            self._digest = digest_of("tgroups", ((tg.tgid, tg.name) for tg in self._talkgroups))
+        return self._digest
+
+    def _write_csv(self, csvfile: TextIO):
+        writer = csv.writer(csvfile)
+        writer.writerow(["Decimal", "Alpha Tag"])
         for tg in self._talkgroups:
-            if tg.tgid == tgid:
-                return tg
-        return None
+            writer.writerow([tg.tgid, tg.name])
 
-    def toTalkgroupsCSV(self) -> Union[str, None]:
-        """Writes the talkgroups to a CSV file with headers 'Index', 'Decimal', and 'Alpha Tag'.
+    def toTalkgroupsCSV(self, artifacts: Optional["ArtifactCache"] = None) -> Union[str, None]:
+        """Writes the talkgroups to a CSV file with headers 'Decimal' and 'Alpha Tag'.
+        With artifacts, the CSV is only written if no file with this content exists yet,
+        and write errors raise OSError instead of returning None.
         Returns File Path on success, None on failure.
         """
+        if artifacts is not None:
+            return artifacts.materialize("tgroups", ".csv", self.artifactDigest, self._write_csv)
         try:
             file_path = self.talkgroup_csv_file_path
             with open(file_path, "w", newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(["Decimal", "Alpha Tag"])
-                for tg in self._talkgroups:
-                    writer.writerow([tg.tgid, tg.name])  # Include the index
+                self._write_csv(csvfile)
             return file_path
         except Exception as e:
             import logging
@@ -97,64 +147,156 @@ class TalkgroupSet:
         return self._talkgroup_csv_file_path
 
 class TalkgroupManager:
-    def __init__(self, file_path: str):
+    """
+    Holds the talkgroup sets for every system.
+
+    A TalkgroupManager is not modified after it is built; it is part of a
+    CatalogSnapshot. reload(), update() and with_talkgroup() return a new manager instead.
+
+    Args:
+        data (dict, optional): Talkgroups document to use instead of reading file_path.
+        previous (TalkgroupManager, optional): Manager to reuse sets from. A set is
+            reused when its system's entry in data is the very same dict object.
+    """
+    def __init__(self, file_path: str, data: Union[dict, None] = None,
+                 previous: Union["TalkgroupManager", None] = None):
         from modules._sessionManager import SessionManager  # Lazy import to avoid circular dependency
         self.file_path = file_path
-        self._data = self._read_file()
-        self._sets = self._initialize_sets()
+        self._store = JsonStore.open(file_path, backup_suffix=".bk")
+        self._data = data if data is not None else self._read_file()
+        self._sets = self._initialize_sets(previous)
+        self._build_index()
         
-    def reload(self):
-        """Reloads the talkgroup data from the file."""
-        self._data = self._read_file()
-        self._sets = self._initialize_sets()
+    def reload(self) -> "TalkgroupManager":
+        """Returns a new TalkgroupManager read from the file."""
+        manager = TalkgroupManager(self.file_path)
         self.logIT("Talkgroup data reloaded.")
+        return manager
 
     def _read_file(self) -> dict:
-        if not os.path.exists(self.file_path):
-            return {}
-        with open(self.file_path, 'r') as f:
-            return json.load(f)
+        data = self._store.load()  # Recovers from talkgroups.json.bk if the file is corrupt
+        return data if data is not None else {}
         
-    def _initialize_sets(self) -> list[TalkgroupSet]:
-        return [
-            TalkgroupSet(
-                index = index, 
-                sysid = sysid, 
-                tg_data = tg_data, 
-                parent_manager = self)
-            for index, (sysid, tg_data) in enumerate(self._data.items())
-        ]
+    def _initialize_sets(self, previous: Union["TalkgroupManager", None] = None) -> list[TalkgroupSet]:
+        reusable = previous._setsBySysIndex if previous else {}
+        sets = []
+        for index, (sysid, tg_data) in enumerate(self._data.items()):
+            tg_set = reusable.get(index)
+            if tg_set is None or tg_set.sysid != sysid or tg_set._tg_data is not tg_data:
+                tg_set = TalkgroupSet(
+                    index = index, 
+                    sysid = sysid, 
+                    tg_data = tg_data, 
+                    parent_manager = self)
+            sets.append(tg_set)
+        return sets
+
+    def _build_index(self):
+        """Builds the system index -> set lookup for the current sets."""
+        self._setsBySysIndex = {tg_set.sysIndex: tg_set for tg_set in self._sets}
 
     def logIT(self, line, file_path = "/opt/op25-project/logs/app_log.txt"):
         with open(file_path, 'a') as file:
             file.write(line + '\n')
 
-    def getTalkgroupSetBySysIndex(self, system_index: str) -> Union["TalkgroupSet", None]:
+    def getTalkgroupSetBySysIndex(self, system_index: int) -> Union["TalkgroupSet", None]:
         """Finds a TalkgroupSet by its system index."""
-        self.logIT(f"Searching for TalkgroupSet with system index: {system_index}")
-        for tg_set in self._sets:
-            self.logIT(f" + Checking TalkgroupSet with sysIndex: {tg_set.sysIndex}")
-            if tg_set.sysIndex == system_index:
-                self.logIT(f" - Found TalkgroupSet: {tg_set.sysIndex}")
-                return tg_set
-            else:
-                self.logIT(f" - Not a match: {tg_set.sysIndex} != {system_index}")
-        self.logIT(f"TalkgroupSet with system index {system_index} not found.")
-        return None
+        tg_set = self._setsBySysIndex.get(system_index)
+        if tg_set is None and not isinstance(system_index, int):
+            try:
+                tg_set = self._setsBySysIndex.get(int(system_index))
+            except (TypeError, ValueError):
+                return None
+        return tg_set
     
-    def getTalkgroupName(self, sysIndex: str, tgid: int) -> str:
-        """Finds the talkgroup by system index and tgid, and returns its name."""
-        tg_set = self.getTalkgroupSetBySysIndex(sysIndex)
-        if tg_set:
-            tg_member = tg_set.getTalkgroup(tgid)
-            if tg_member:
-                return tg_member.name
-        return f"Undefined ({tgid})"
+    def getTalkgroupName(self, sysIndex: int, tgid: int) -> str:
+        """Finds the talkgroup by system index and tgid, and returns its name. No file I/O."""
+        tg_set = self._setsBySysIndex.get(sysIndex)
+        name = tg_set.getName(tgid) if tg_set else None
+        if name is None:
+            try:
+                tg_set = self._setsBySysIndex.get(int(sysIndex))
+                name = tg_set.getName(int(tgid)) if tg_set else None
+            except (TypeError, ValueError):
+                name = None
+        return name if name is not None else f"Undefined ({tgid})"
 
     @property
     def sets(self) -> list[TalkgroupSet]:
         return self._sets
 
+    def search(self, query: str, sys_index: Union[int, None] = None, limit: int = 20) -> list[dict]:
+        """
+        Finds talkgroups by tgid prefix or name token prefix, case-insensitive, best matches first.
+
+        Args:
+            query (str): e.g. "465", "pd disp".
+            sys_index (int, optional): Only search this system's set; all systems if None.
+            limit (int): Maximum number of results.
+
+        Returns:
+            list[dict]: Talkgroup dicts with the system index added as "sys".
+        """
+        if sys_index is None:
+            sets = self._sets
+        else:
+            tg_set = self.getTalkgroupSetBySysIndex(sys_index)
+            sets = [tg_set] if tg_set else []
+        ranked = []
+        for tg_set in sets:
+            for rank, tg in tg_set.searchIndex.search(query, limit):
+                ranked.append((rank, tg_set.sysIndex, tg))
+        ranked.sort(key=lambda item: (item[0], item[1]))
+        return [{"sys": sys, **tg.to_dict()} for _, sys, tg in ranked[:limit]]
+
+    def page(self, sys_index: Union[int, None] = None, after: Union[tuple, None] = None,
+             offset: int = 0, limit: int = 100) -> tuple[list[tuple[int, TalkgroupMember]], Union[tuple, None], int]:
+        """
+        Returns one page of talkgroups ordered by (system index, tgid).
+
+        Args:
+            sys_index (int, optional): Only this system's set; all sets if None.
+            after (tuple, optional): (sys index, tgid) of the last item of the previous page.
+            offset (int): Items to skip (after `after`, if given).
+            limit (int): Maximum number of items.
+
+        Returns:
+            tuple: ([(sys index, member), ...], (sys index, tgid) to continue after or None, total count)
+        """
+        if sys_index is None:
+            sets = self._sets
+        else:
+            tg_set = self.getTalkgroupSetBySysIndex(sys_index)
+            sets = [tg_set] if tg_set else []
+        total = sum(len(tg_set.talkgroups) for tg_set in sets)
+
+        items = []
+        skip = offset
+        more = False
+        for tg_set in sets:
+            if after is not None and tg_set.sysIndex < after[0]:
+                continue
+            members, tgids = tg_set.orderedByTgid
+            start = bisect_right(tgids, after[1]) if after is not None and tg_set.sysIndex == after[0] else 0
+            if len(items) >= limit:
+                if start < len(members):
+                    more = True
+                    break
+                continue
+            available = len(members) - start
+            if skip >= available:
+                skip -= available
+                continue
+            start += skip
+            skip = 0
+            end = start + limit - len(items)
+            items.extend((tg_set.sysIndex, tg) for tg in members[start:end])
+            if end < len(members):
+                more = True
+                break
+        next_after = (items[-1][0], items[-1][1].tgid) if more and items else None
+        return items, next_after, total
+
     def get_set_by_sysid(self, sysid: str) -> Union["TalkgroupSet", None]:
         for tg_set in self._sets:
             if tg_set.sysid == sysid:
@@ -171,34 +313,113 @@ class TalkgroupManager:
         member = self.get_member(sysid, tgid)
         return member.name if member else f"Undefined ({tgid})"
 
-    def update(self, new_data: dict):
+    def update(self, new_data: dict) -> "TalkgroupManager":
         """
-        Updates the internal data and associated sets with new data, creates a backup of the current file, 
-        and saves the updated data to the file.
+        Saves new_data as the talkgroups file and returns a new TalkgroupManager built from it.
 
         Args:
             new_data (dict): A dictionary containing the new data to update.
 
-        Raises:
-            IOError: If there is an issue creating the backup or saving the new data to the file.
+        Returns:
+            TalkgroupManager: A manager for new_data. This instance is not modified.
 
         Side Effects:
-            - Updates the internal `_data` attribute with `new_data`.
-            - Reinitializes `_sets` using the `_initialize_sets` method.
-            - Creates a backup of the current file by copying it to a new file with a `.bk` extension.
-            - Writes the updated data to the file specified by `self.file_path`.
+            - Schedules a debounced, atomic write of `self.file_path`; the previous file
+              is kept with a `.bk` extension.
         """
-        self._data = new_data
-        self._sets = self._initialize_sets()
+        manager = TalkgroupManager(self.file_path, data=new_data)
+        manager.save()
+        return manager
 
-        # Create backup
-        backup_path = f"{self.file_path}.bk"
-        shutil.copy2(self.file_path, backup_path)
+    def with_talkgroup(self, sys_index: int, tgid: int, fields: Union[dict, None]) -> "TalkgroupManager":
+        """
+        Returns a new manager with one talkgroup added or updated, or removed if fields is None.
+        Only that system's set is rebuilt; every other set is shared with this manager.
 
-        # Save new data
-        with open(self.file_path, 'w') as f:
-            json.dump(self._data, f, indent=4)
+        Args:
+            sys_index (int): System index of the talkgroup set.
+            tgid (int): Talkgroup to change.
+            fields (dict | None): Values merged into the talkgroup ("name", "priority", ...).
 
+        Raises:
+            KeyError: If the system has no talkgroup set, or a removed talkgroup does not exist.
+            ValueError: If priority is not a number, or a new talkgroup has no name.
+        """
+        tg_set = self.getTalkgroupSetBySysIndex(sys_index)
+        if tg_set is None:
+            raise KeyError(f"No talkgroup set for system {sys_index}")
+        member = tg_set.getTalkgroup(tgid)
+        entries = dict(tg_set._tg_data)
+        if fields is None:
+            if member is None:
+                raise KeyError(f"Talkgroup {tgid} not found in system {sys_index}")
+            del entries[member.index]
+        else:
+            if member is None and not str(fields.get("name") or "").strip():
+                raise ValueError(f"A new talkgroup needs a name (tgid {tgid})")
+            entry = dict(member._data) if member else {"name": "", "priority": 0}
+            entry.update(fields)
+            entry["tgid"] = tgid
+            entry["priority"] = int(entry.get("priority") or 0)
+            key = member.index if member else str(tgid)
+            if not member and key in entries:
+                # THE SET IS KEYED BY POSITION AND str(tgid) HOLDS ANOTHER TALKGROUP
+                key = str(max((int(k) for k in entries if str(k).isdigit()), default=-1) + 1)
+            entries[key] = entry
+        data = dict(self._data)
+        data[tg_set.sysid] = entries
+        return TalkgroupManager(self.file_path, data=data, previous=self)
+
+    def with_talkgroups(self, sys_index: int, talkgroups: dict, replace: bool = False) -> "TalkgroupManager":
+        """
+        Returns a new manager with many talkgroups merged into one system's set, e.g. from a CSV import.
+
+        The fields dicts of new talkgroups become the stored entries instead of being
+        copied, so a large import is held in memory once; don't reuse `talkgroups`.
+        New talkgroups are keyed by tgid like the existing data, or by the next free
+        number when that key already holds another talkgroup (sets keyed by position).
+
+        Args:
+            sys_index (int): System index of the talkgroup set.
+            talkgroups (dict): tgid -> fields merged into that talkgroup ("name", "priority", ...).
+            replace (bool): Drop the talkgroups that are not in `talkgroups` instead of keeping them.
+
+        Raises:
+            KeyError: If the system has no talkgroup set.
+        """
+        tg_set = self.getTalkgroupSetBySysIndex(sys_index)
+        if tg_set is None:
+            raise KeyError(f"No talkgroup set for system {sys_index}")
+        existing = tg_set._tg_data
+        entries = {} if replace else dict(existing)
+        next_key = None
+        for tgid, fields in talkgroups.items():
+            member = tg_set.getTalkgroup(tgid)
+            if member:
+                entry = dict(member._data)
+                entry.update(fields)
+                entry["tgid"] = tgid
+                entries[member.index] = entry
+                continue
+            fields.setdefault("name", "")
+            fields.setdefault("priority", 0)
+            fields["tgid"] = tgid
+            key = str(tgid)
+            if key in existing or key in entries:
+                # EXISTING KEYS ARE KEPT BY THEIR TALKGROUPS, EVEN ONES A REPLACE DROPS
+                if next_key is None:
+                    next_key = max((int(k) for k in list(existing) + list(entries) if str(k).isdigit()), default=-1) + 1
+                while str(next_key) in existing or str(next_key) in entries:
+                    next_key += 1
+                key = str(next_key)
+            entries[key] = fields
+        data = dict(self._data)
+        data[tg_set.sysid] = entries
+        return TalkgroupManager(self.file_path, data=data, previous=self)
+
+    def save(self):
+        """Schedules the talkgroups file to be written (debounced, atomic; the old file becomes .bk)."""
+        self._store.save(self._data)
 
     def to_json(self) -> str:
-        return json.dumps(self._data, indent=4)
\ No newline at end of file
+        return JsonStore.export(self._data)
\ No newline at end of file
@@ -2,58 +2,161 @@
 import json
 import os
 import tempfile
-from typing import List, Optional
+from functools import partial
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Tuple
 import re
-import shutil
 
-from typing import List, Optional
+from modules._artifactCache import digest_of, write_lines
+from modules._jsonStore import JsonStore
+
+if TYPE_CHECKING:
+    from modules._artifactCache import ArtifactCache
 
 class zoneManager:
     """
     Manages zones and their associated channels by reading and writing to a JSON file.
     Provides methods to access, update, and navigate zones and channels.
+
+    A zoneManager is not modified after it is built; it is part of a CatalogSnapshot.
+    reload(), update(), with_zone() and with_channel() return a new manager instead.
+
+    Args:
+        data (dict, optional): Zones document to use instead of reading file_path.
+        previous (zoneManager, optional): Manager to reuse zone objects from. A zone is
+            reused when its entry in data is the very same dict object at the same index.
     """
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, data: Optional[dict] = None, previous: Optional["zoneManager"] = None):
         print("Init...")
         self.file_path = file_path
-        self._zones = self._load_zones()
+        self._store = JsonStore.open(file_path, backup_suffix=".bak")
+        self._zones = self._load_zones(data, previous)
+        self._systemScanSets = self._build_system_scan_sets()
         
-    def reload(self):
+    def reload(self) -> "zoneManager":
+        """Returns a new zoneManager read from the zones file."""
         self.append_line_to_file("zoneManager.reload()")
-        self._zones = self._load_zones()
-        self.append_line_to_file("zoneManager.reload() -> Done")
+        return zoneManager(self.file_path)
         
-    def _load_zones(self) -> List["zoneMember"]:
+    def _load_zones(self, data: Optional[dict] = None, previous: Optional["zoneManager"] = None) -> List["zoneMember"]:
         print("Load Zones...")
-        if not os.path.exists(self.file_path):
-            raise FileNotFoundError(f"Zone file not found: {self.file_path}")
-            return []
-        with open(self.file_path, 'r') as f:
-            self._data = json.load(f)
-            print(self._data)
-        return [zoneMember(zone_data, idx) for idx, zone_data in enumerate(self._data.get("zones", {}).values())]
+        if data is None:
+            data = self._store.load()
+            if data is None:
+                raise FileNotFoundError(f"Zone file not found: {self.file_path}")
+        self._data = data
+        reusable = previous.zones if previous else []
+        zones = []
+        for idx, zone_data in enumerate(self._data.get("zones", {}).values()):
+            if idx < len(reusable) and reusable[idx]._data is zone_data:
+                zones.append(reusable[idx])
+            else:
+                zones.append(zoneMember(zone_data, idx))
+        return zones
+
+    def _build_system_scan_sets(self) -> Dict[str, FrozenSet[int]]:
+        """Unions the scan sets of every channel on each system, keyed by sysid."""
+        members: Dict[str, set] = {}
+        for zone in self._zones:
+            for ch in zone.channels:
+                members.setdefault(str(ch.sysid), set()).update(ch.scanSet)
+        return {sysid: frozenset(tgids) for sysid, tgids in members.items()}
+
+    def getSystemScanSet(self, sysid) -> FrozenSet[int]:
+        """Returns every tgid that any channel on the system scans."""
+        return self._systemScanSets.get(str(sysid), frozenset())
 
     def save(self):
-        with open(self.file_path, 'w') as f:
-            json.dump({"zones": [zone.to_dict() for zone in self._zones]}, f, indent=4)
-
-    def update(self, data):
-        # Create a backup if the file exists
-        if os.path.exists(self.file_path):
-            backup_path = self.file_path + '.bak'
-            shutil.copy2(self.file_path, backup_path)
-
-        # Write the updated data as-is
-        with open(self.file_path, 'w') as f:
-            json.dump(data, f, indent=4)
-            
-        self._zones = self._load_zones()  # ✅ FIXED
+        """Schedules the zones file to be written (debounced, atomic; the old file becomes zones.json.bak)."""
+        self._store.save(self._data)
+
+    def update(self, data) -> "zoneManager":
+        """Saves data as the zones file and returns a new zoneManager built from it."""
+        manager = zoneManager(self.file_path, data=data)
+        manager.save()
+        return manager
     
 
+    def with_zone(self, zone_index: int, fields: Optional[dict]) -> "zoneManager":
+        """
+        Returns a new zoneManager with one zone updated (fields merged into it), added
+        (zone_index == number of zones), or removed if fields is None. Zones before the
+        change are shared with this manager.
+
+        Raises:
+            KeyError: If the zone does not exist.
+        """
+        zones = self._data.get("zones", {})
+        keys = list(zones.keys())
+        if fields is not None and zone_index == len(keys):
+            key = str(max((int(k) for k in keys if str(k).isdigit()), default=0) + 1)
+            zones = {**zones, key: {"name": "", "channels": [], **_copy_zone(fields)}}
+        elif 0 <= zone_index < len(keys):
+            if fields is None:
+                # LATER ZONES MOVE UP ONE INDEX; COPY THEM SO THE OLD SNAPSHOT KEEPS ITS zone_index VALUES
+                zones = {
+                    k: (_copy_zone(v) if pos > zone_index else v)
+                    for pos, (k, v) in enumerate(zones.items()) if pos != zone_index
+                }
+            else:
+                zones = dict(zones)
+                zones[keys[zone_index]] = _copy_zone({**zones[keys[zone_index]], **fields})
+        else:
+            raise KeyError(f"Zone {zone_index} not found")
+        return zoneManager(self.file_path, data={**self._data, "zones": zones}, previous=self)
+
+    def with_channel(self, zone_index: int, channel_number: int, fields: Optional[dict]) -> "zoneManager":
+        """
+        Returns a new zoneManager with one channel in a zone added or updated (fields
+        merged into it), or removed if fields is None. Only that zone is rebuilt.
+
+        Raises:
+            KeyError: If the zone, or a removed channel, does not exist.
+            ValueError: If a new channel has no name or sysid, or tgid is not a list of numbers.
+        """
+        zone = self.getZoneByIndex(zone_index)
+        if zone is None:
+            raise KeyError(f"Zone {zone_index} not found")
+        zone_data = _copy_zone(zone.to_dict())
+        channels = zone_data["channels"]
+        pos = zone._dataPositions.get(channel_number)
+        if fields is None:
+            if pos is None:
+                raise KeyError(f"Channel {channel_number} not found in zone {zone_index}")
+            del channels[pos]
+        else:
+            channel = {**(channels[pos] if pos is not None else {}), **fields, "channel_number": channel_number}
+            if not channel.get("name") or channel.get("sysid") in (None, ""):
+                raise ValueError("A channel needs a name and a sysid")
+            channel["tgid"] = [int(tgid) for tgid in channel.get("tgid", [])]
+            if pos is None:
+                channels.append(channel)
+            else:
+                channels[pos] = channel
+        zones = dict(self._data.get("zones", {}))
+        zones[list(zones.keys())[zone_index]] = zone_data
+        return zoneManager(self.file_path, data={**self._data, "zones": zones}, previous=self)
+
     @property
     def zones(self) -> List["zoneMember"]:
         return self._zones
 
+    def page(self, after: Optional[int] = None, offset: int = 0, limit: int = 100) -> Tuple[List["zoneMember"], Optional[int], int]:
+        """
+        Returns one page of zones in index order.
+
+        Args:
+            after (int, optional): Index of the last zone of the previous page.
+            offset (int): Zones to skip (after `after`, if given).
+            limit (int): Maximum number of zones.
+
+        Returns:
+            tuple: ([zoneMember, ...], index to continue after or None, total count)
+        """
+        start = (after + 1 if after is not None else 0) + offset
+        zones = self._zones[start:start + limit]
+        more = start + limit < len(self._zones)
+        return zones, (zones[-1].index if more and zones else None), len(self._zones)
+
     def getZoneByIndex(self, index: int) -> Optional["zoneMember"]:
         return self._zones[index] if 0 <= index < len(self._zones) else None
 
@@ -63,9 +166,9 @@ class zoneManager:
                 return zone
         return None
 
-    def getZoneChannelsByIndex(self, index: int) -> List["channelMember"]:
+    def getZoneChannelsByIndex(self, index: int) -> Tuple["channelMember", ...]:
         zone = self.getZoneByIndex(index)
-        return zone.channels if zone else []
+        return zone.channels if zone else ()
 
     def getChannelsBySysId(self, sysid: str) -> List["channelMember"]:
         matched_channels = []
@@ -82,10 +185,10 @@ class zoneManager:
         self.append_line_to_file(f"Channel Number -> {channel_number}")
         self.append_line_to_file(f"Zone -> {zone}")
         if zone:
-            channels = zone.channels
-            if 0 <= channel_number < len(channels):
-                self.append_line_to_file(f"Channel -> {channels[channel_number]}")
-                return channels[channel_number]
+            channel = zone.get_channel_by_index(channel_number)
+            if channel:
+                self.append_line_to_file(f"Channel -> {channel}")
+            return channel
         return None
 
     def getNextChannel(self, zone_index: int, channel_number: int) -> dict:
@@ -119,20 +222,49 @@ class zoneManager:
         return self._zones[previous_index].to_dict()
 
     def to_json(self) -> str:
-        return json.dumps({"zones": [z.to_dict() for z in self._zones]}, indent=4)
+        return JsonStore.export(self._data)
 
     def append_line_to_file(self, line: str):
         with open("/opt/op25-project/logs/app_log.txt", 'a') as file:
             file.write(line + '\n')
+def _copy_zone(zone_data: dict) -> dict:
+    """Copies a zone dict and its channel dicts, which zoneMember and channelMember annotate in place."""
+    return {**zone_data, "channels": [dict(ch) for ch in zone_data.get("channels", [])]}
+
+
 class zoneMember:
     """
     Represents a zone containing multiple channels.
     Provides methods to navigate between channels and access channel data.
+
+    Channel objects are built once when the zone is loaded and reused for every
+    lookup. zoneManager builds new zone objects (and so new channels) on reload/update.
+    scanSet is the union of the channels' scan sets. A channel with a non-numeric
+    channel_number or tgid is skipped (and left in the file) so it cannot take the
+    rest of zones.json down with it.
     """
+    __slots__ = ("_data", "index", "_channels", "_positions", "_dataPositions", "_scanSet")
+
     def __init__(self, zone_data: dict, index: int):
         self._data = zone_data
         self._data["zone_index"] = index
         self.index = index
+        channels = []
+        # channel_number -> position in _channels / in the zone's "channels" list; the first channel wins on duplicates
+        self._positions: Dict[int, int] = {}
+        self._dataPositions: Dict[int, int] = {}
+        for data_pos, ch_data in enumerate(self._data.get("channels", [])):
+            try:
+                ch = channelMember(ch_data, index)
+            except (TypeError, ValueError) as e:
+                print(f"Skipping channel {data_pos} in zone '{self.name}': {e}")
+                continue
+            if ch.channel_number not in self._positions:
+                self._positions[ch.channel_number] = len(channels)
+                self._dataPositions[ch.channel_number] = data_pos
+            channels.append(ch)
+        self._channels: Tuple["channelMember", ...] = tuple(channels)
+        self._scanSet: FrozenSet[int] = frozenset().union(*(ch.scanSet for ch in self._channels))
 
     @property
     def name(self) -> str:
@@ -140,25 +272,35 @@ class zoneMember:
         return self._data.get("name")
 
     @property
-    def channels(self) -> List["channelMember"]:
-        """Returns the list of channels in the zone."""
-        return [channelMember(ch, self.index) for ch in self._data.get("channels", [])]
+    def channels(self) -> Tuple["channelMember", ...]:
+        """Returns the channels in the zone."""
+        return self._channels
+
+    @property
+    def scanSet(self) -> FrozenSet[int]:
+        """Returns every tgid scanned by any channel in the zone."""
+        return self._scanSet
+
+    def get_channel_by_number(self, channel_number: int) -> Optional["channelMember"]:
+        """Retrieves a channel by its channel_number."""
+        pos = self._positions.get(channel_number)
+        return self._channels[pos] if pos is not None else None
 
     def next_channel(self, current_number: int) -> Optional["channelMember"]:
         """Gets the next channel in the zone."""
-        ch_list = self.channels
-        for i, ch in enumerate(ch_list):
-            if ch.channel_number == current_number:
-                return ch_list[(i + 1) % len(ch_list)]
-        return ch_list[0] if ch_list else None
+        ch_list = self._channels
+        if not ch_list:
+            return None
+        pos = self._positions.get(current_number)
+        return ch_list[(pos + 1) % len(ch_list)] if pos is not None else ch_list[0]
 
     def previous_channel(self, current_number: int) -> Optional["channelMember"]:
         """Gets the previous channel in the zone."""
-        ch_list = self.channels
-        for i, ch in enumerate(ch_list):
-            if ch.channel_number == current_number:
-                return ch_list[(i - 1) % len(ch_list)]
-        return ch_list[-1] if ch_list else None
+        ch_list = self._channels
+        if not ch_list:
+            return None
+        pos = self._positions.get(current_number)
+        return ch_list[(pos - 1) % len(ch_list)] if pos is not None else ch_list[-1]
 
     def to_dict(self) -> dict:
         """Returns the zone as a dictionary."""
@@ -166,19 +308,24 @@ class zoneMember:
 
     def get_channel_by_index(self, channel_index: int) -> Optional["channelMember"]:
         """Retrieves a channel by its index within the zone."""
-        channels = self.channels
+        channels = self._channels
         return channels[channel_index] if 0 <= channel_index < len(channels) else None
 
 class channelMember:
     """
     Represents a channel within a zone.
     Manages whitelist and blacklist functionality and provides access to channel properties.
+    The tgid list is compiled into a frozen scanSet once, for O(1) membership checks.
     """
+    __slots__ = ("_data", "_whitelistFilePath", "_blacklistTGIDs", "_blacklistFilePath", "_scanSet")
+
     def __init__(self, channel_data: dict, zone_index: Optional[int] = None):
         self._data = channel_data
         self._whitelistFilePath = ""
         self._blacklistTGIDs = []
         self._blacklistFilePath = ""
+        int(self._data.get("channel_number"))  # RAISES HERE RATHER THAN ON EVERY LATER LOOKUP
+        self._scanSet: FrozenSet[int] = frozenset(int(tgid) for tgid in self._data.get("tgid", []))
         if zone_index is not None:
             self._data["zone_index"] = zone_index
 
@@ -211,6 +358,11 @@ class channelMember:
         """Returns the system ID of the channel."""
         return self._data.get("sysid")
 
+    @property
+    def scanSet(self) -> FrozenSet[int]:
+        """Returns the channel's tgids as a frozenset."""
+        return self._scanSet
+
     @property
     def whitelistFilePath(self) -> str:
         """Returns the file path for the whitelist."""
@@ -227,25 +379,40 @@ class channelMember:
             self._blacklistFilePath = os.path.join(tempfile.gettempdir(), f"_blacklist_{safe_name}.tsv")
         return self._blacklistFilePath
 
-    def toWhitelistTSV(self) -> str:
-        """Writes the TGIDs to a whitelist TSV file."""
+    def toWhitelistTSV(self, artifacts: Optional["ArtifactCache"] = None) -> str:
+        """
+        Writes the TGIDs to a whitelist TSV file; with artifacts, only if that list was never written.
+        Without artifacts, errors are printed and None is returned; with artifacts they raise OSError.
+        """
+        if artifacts is not None:
+            tgids = self.tgid
+            return artifacts.materialize("whitelist", ".tsv", digest_of("whitelist", tgids),
+                                         partial(write_lines, values=tgids))
         try:
             with open(self.whitelistFilePath, "w", newline='') as tsvfile:
-                for tgid in self.tgid:
-                    tsvfile.write(f"{tgid}\n")
+                write_lines(tsvfile, self.tgid)
             return self.whitelistFilePath
         except Exception as e:
             print(f"Error writing whitelist TSV: {e}")
             return None
 
-    def toBlacklistTSV(self) -> str:
-        """Writes the TGIDs to a blacklist TSV file."""
+    @property
+    def blacklistTGIDs(self) -> Tuple[int, ...]:
+        """Returns the tgids locked out on this channel."""
+        return tuple(self._blacklistTGIDs)
+
+    def toBlacklistTSV(self, artifacts: Optional["ArtifactCache"] = None) -> str:
+        """
+        Writes the TGIDs to a blacklist TSV file; with artifacts, only if that list was never written.
+        Without artifacts, errors are printed and None is returned; with artifacts they raise OSError.
+        """
+        tgids = self._blacklistTGIDs or [1234]  # Placeholder for empty blacklist
+        if artifacts is not None:
+            return artifacts.materialize("blacklist", ".tsv", digest_of("blacklist", tgids),
+                                         partial(write_lines, values=tgids))
         try:
             with open(self.blacklistFilePath, "w", newline='') as tsvfile:
-                for tgid in self._blacklistTGIDs:
-                    tsvfile.write(f"{tgid}\n")
-                if not self._blacklistTGIDs:
-                    tsvfile.write("1234\n")  # Placeholder for empty blacklist
+                write_lines(tsvfile, tgids)
             return self.blacklistFilePath
         except Exception as e:
             print(f"Error writing blacklist TSV: {e}")
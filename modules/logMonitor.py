@@ -4,75 +4,24 @@ if TYPE_CHECKING:
     from api import API  # Replace with actual class name if different
 import logging
 import requests
-import re
 import time
 import threading
 import queue
 from watchdog.observers import Observer  # type: ignore
 from watchdog.events import FileSystemEventHandler  # type: ignore
 import os
-from datetime import datetime
-
-DEMOD_REGEX = re.compile(
-    r'(?P<Action>demodulator):\s+xlator\s+if_rate=(?P<if_rate>\d+),\s+input_rate=(?P<input_rate>\d+),\s+decim=(?P<decim>\d+),\s+if taps=\[(?P<taps>[\d,]+)\],\s+resampled_rate=(?P<resampled_rate>\d+),\s+sps=(?P<sps>\d+)'
-)
-
-RECONFIG_REGEX = re.compile(
-    r'(?P<Date>\d{2}/\d{2}/\d{2})\s+'
-    r'(?P<Time>\d{2}:\d{2}:\d{2}\.\d+)\s+'
-    r'(?P<Action>Reconfiguring NAC)\s+from\s+0x(?P<NACFrom>[0-9A-Fa-f]{3})\s+to\s+0x(?P<NACTo>[0-9A-Fa-f]{3})'
-)
-AUDIO_SOCKET_REGEX = re.compile(
-    r'(?P<Action>op25_audio::open_socket\(\)):\s+enabled udp host\((?P<host>[^)]+)\),\s+wireshark\((?P<wireshark>\d+)\),\s+audio\((?P<audio>\d+)\)'
+from collections import deque
+from modules._logTailer import LogTailer
+from modules._eventBus import EventBus, LOG_TOPIC, ALL_LOG_TOPIC
+from modules._logHistory import LogHistory
+from modules._logParser import (  # noqa: F401  (regexes re-exported for existing imports)
+    DEMOD_REGEX, RECONFIG_REGEX, AUDIO_SOCKET_REGEX, FRAME_ASSEMBLER_REGEX, GAIN_REGEX,
+    DEVICE_REGEX, HOLD_REGEX, VOICE_REGEX, TG_REGEX, DUID_REGEX,
+    LineParser, defaultParser, timestamp_now, MISC_CATEGORY
 )
+from modules._logFilter import LogFilterPolicy
 
-FRAME_ASSEMBLER_REGEX = re.compile(
-    r'(?P<Action>p25_frame_assembler_impl):\s+do_imbe\[(?P<do_imbe>\d+)\],\s+do_output\[(?P<do_output>\d+)\],\s+do_audio_output\[(?P<do_audio_output>\d+)\],\s+do_phase2_tdma\[(?P<do_phase2_tdma>\d+)\],\s+do_nocrypt\[(?P<do_nocrypt>\d+)\]'
-)
-
-
-GAIN_REGEX = re.compile(
-    r'(?P<Action>gain):\s+name:\s+(?P<name>\S+)\s+range:\s+start\s+(?P<start>\d+)\s+stop\s+(?P<stop>\d+)\s+step\s+(?P<step>\d+)'
-)
-
-
-DEVICE_REGEX = re.compile(
-    r'(?P<Action>Using device)\s+#(?P<index>\d+)\s+(?P<model>.+?)\s+SN:\s+(?P<serial>\d+)'
-)
-
-HOLD_REGEX = re.compile(
-    r'(?P<Date>\d{2}/\d{2}/\d{2})\s+'
-    r'(?P<Time>\d{2}:\d{2}:\d{2}\.\d+)\s+'
-    r'(?P<Action>hold active)\s+tg\((?P<Talkgroup>\d+)\)'
-)
 
-# Regex to parse "voice update" log entries
-VOICE_REGEX = re.compile(
-    r'(?P<Date>\d{2}/\d{2}/\d{2})\s+'
-    r'(?P<Time>\d{2}:\d{2}:\d{2}\.\d+)\s+'
-    r'(?P<Action>voice update):\s+'
-    r'tg\((?P<Talkgroup>\d+)\),\s+'
-    r'freq\((?P<Frequency>\d+)\),\s+'
-    r'slot\([^)]+\),\s+'
-    r'prio\((?P<Priority>\d+)\)'
-)
-
-# Regex to parse "added talkgroup" log entries
-TG_REGEX = re.compile(
-    r'(?P<Date>\d{2}/\d{2}/\d{2})\s+'
-    r'(?P<Time>\d{2}:\d{2}:\d{2}\.\d+)\s+'
-    r'(?P<Action>added talkgroup)\s+'
-    r'(?P<Talkgroup>\d+)\s+from\s+(?P<Source>\S+)'
-    # ADD HERE
-)
-
-DUID_REGEX = re.compile(
-    r'(?P<Date>\d{2}/\d{2}/\d{2})\s+'
-    r'(?P<Time>\d{2}:\d{2}:\d{2}\.\d+)\s+'
-    r'(?P<Action>duid\d+),\s+tg\((?P<Talkgroup>\d+)\)'
-)
- 
- 
 class LogFileHandler(FileSystemEventHandler):
     """
     Handles file system events for the log file.
@@ -87,9 +36,7 @@ class LogFileHandler(FileSystemEventHandler):
         Reads new lines and appends them as entries.
         """
         if event.src_path == self.logMonitor.source:
-            old_lines = self.logMonitor.lines
-            self.logMonitor.read()
-            new_lines = self.logMonitor.lines[len(old_lines):]
+            new_lines = self.logMonitor.read()
             self.logMonitor.append_new_entries(new_lines)
 
 class LogFileWatcher:
@@ -111,17 +58,28 @@ class LogFileWatcher:
 
 class logMonitorOP25:
     """
-    Monitors the OP25 log file for specific patterns and sends parsed entries to an API endpoint.
+    Monitors the OP25 log file for specific patterns and publishes parsed entries on the event bus.
+    Entries can also be forwarded to an external HTTP endpoint when one is given.
     """
-    def __init__(self, API: "API", file="/opt/op25-project/logs/stderr_op25.log", endpoint=None):
-        self.source = "/opt/op25-project/logs/stderr_op25.log"  # Path to the log file
-        self.endpoint = endpoint  # API endpoint to send parsed entries
-        self.lines = []  # Stores all lines read from the log file
-        self.entries = []  # Stores parsed log entries
-        self.queue = queue.Queue()  # Queue for sending entries to the API
-        self.sender_thread = threading.Thread(target=self._sender_worker, daemon=True)
-        self.sender_thread.start()
+    def __init__(self, API: "API", file="/opt/op25-project/logs/stderr_op25.log", endpoint=None, bus: EventBus = None,
+                 history_size: int = 5000, line_buffer_size: int = 500, log_filter: LogFilterPolicy = None):
+        self.source = file or "/opt/op25-project/logs/stderr_op25.log"  # Path to the log file
+        self.endpoint = endpoint  # Optional external endpoint to forward parsed entries to
+        self.bus = bus  # In-process event bus; subscribers receive every parsed entry
+        self.lines = deque(maxlen=line_buffer_size)  # Most recent raw lines read from the log file
+        self.history = LogHistory(history_size)  # Bounded, queryable store of parsed entries
+        self.tailer = LogTailer(self.source)  # Reads only the bytes appended since the last event
+        self.parser: LineParser = defaultParser  # Shared pattern table, built once at import
+        self.filter = log_filter or LogFilterPolicy()  # Per-class drop/sample/count rules for the outputs
+        self.queue = queue.Queue()  # Queue for forwarding entries to the external endpoint
+        if self.endpoint:
+            self.sender_thread = threading.Thread(target=self._sender_worker, daemon=True)
+            self.sender_thread.start()
         self._api = API
+        if self.filter.active:
+            # A QUIET LOG WOULD OTHERWISE HOLD BACK THE LAST SUMMARY UNTIL THE NEXT LINE ARRIVES
+            self.summary_thread = threading.Thread(target=self._summary_worker, daemon=True)
+            self.summary_thread.start()
         self.initFile()
 
     @property
@@ -140,45 +98,81 @@ class logMonitorOP25:
             open(self.source, 'w').close()
 
         try:
-            with open(self.source, 'r') as f:
-                self.lines = f.readlines()
+            new_lines = self.read()
         except Exception as e:
             raise IOError(f"Unable to read log file: {e}")
 
         # Process existing lines in the log file
-        self.append_new_entries(self.lines)
+        self.append_new_entries(new_lines)
 
     def read(self):
         """
-        Reads the entire log file into memory.
+        Reads the lines appended to the log file since the last read.
+        Truncation (OP25 restarts reopen the file with "w") is detected by the tailer.
+
+        Returns:
+            list[str]: The newly appended lines.
         """
-        with open(self.source) as f:
-            self.lines = f.readlines()
+        new_lines = self.tailer.read_new_lines()
+        self.lines.extend(new_lines)
+        return new_lines
 
     def _timestamp_now(self):
-        now = datetime.now()
-        return now.strftime("%m/%d/%y"), now.strftime("%H:%M:%S.%f")[:-3]
+        return timestamp_now()
 
     def append_new_entries(self, new_lines):
         """
         Parses and appends new log entries from the provided lines.
         """
         for line in new_lines:
-            entry = self.interpretLine(line)
+            result = self.parser.match(line)
+            admitted = self.filter.admit(result[0].category if result else MISC_CATEGORY)
+            if not admitted and result is None:
+                continue  # NO TRACKER READS MISC LINES
+            entry = self._build_entry(line, result)
             if entry:
-                self.entries.append(entry)
-                self.queue.put(entry)
+                self._dispatch(entry, output=admitted)
+
+        self._flush_summary()
+
+    def _flush_summary(self, force=False):
+        """Reports suppressed classes as counters instead of entries."""
+        summary = self.filter.summary(force=force)
+        if summary:
+            summary["Date"], summary["Time"] = self._timestamp_now()
+            self._dispatch(summary, record=False)
+
+    def _summary_worker(self):
+        while True:
+            time.sleep(self.filter.summary_interval)
+            try:
+                self._flush_summary()
+            except Exception as e:
+                logging.error(f"Log filter summary failed: {e}")
+
+    def _dispatch(self, entry, record=True, output=True):
+        """
+        Hands an entry to the in-process trackers and, unless the filter suppressed it
+        (output=False), stores it in the history and sends it to the bus and the external endpoint.
+        """
+        if self.bus:
+            self.bus.publish(ALL_LOG_TOPIC, entry)
+        if not output:
+            return
+        if record:
+            self.history.append(entry)
+        if self.bus:
+            self.bus.publish(LOG_TOPIC, entry)
+        if self.endpoint:
+            self.queue.put(entry)
 
     def _sender_worker(self):
         """
-        Worker thread that sends log entries to the API endpoint.
-        Retries failed requests with exponential backoff.
+        Worker thread that forwards log entries to the external endpoint.
+        Only started when an endpoint is configured. Retries failed requests after a delay.
         """
         while True:
             entry = self.queue.get()
-            if not self.endpoint:
-                self.queue.task_done()
-                continue
             try:
                 response = requests.post(self.endpoint, json=entry, timeout=5)
                 response.raise_for_status()
@@ -189,108 +183,32 @@ class logMonitorOP25:
             finally:
                 self.queue.task_done()
 
-    def _match_config_patterns(self, line):
-        """
-        Matches config-related log lines and returns structured data.
-        """
-        date, time = self._timestamp_now()
-
-        config_patterns = [
-            {
-                "regex": GAIN_REGEX,
-                "action": "gain",
-                "fields": ["name", "start", "stop", "step"]
-            },
-            {
-                "regex": DEVICE_REGEX,
-                "action": "Using device",
-                "fields": ["index", "model", "serial"]
-            },
-            {
-                "regex": DEMOD_REGEX,
-                "action": "demodulator",
-                "fields": ["if_rate", "input_rate", "decim", "taps", "resampled_rate", "sps"]
-            },
-            {
-                "regex": AUDIO_SOCKET_REGEX,
-                "action": "op25_audio::open_socket()",
-                "fields": ["host", "wireshark", "audio"]
-            },
-            {
-                "regex": FRAME_ASSEMBLER_REGEX,
-                "action": "p25_frame_assembler_impl",
-                "fields": ["do_imbe", "do_output", "do_audio_output", "do_phase2_tdma", "do_nocrypt"]
-            }
-        ]
-
-        for pattern in config_patterns:
-            m = pattern["regex"].match(line)
-            if m:
-                return {
-                    "Date": date,
-                    "Time": time,
-                    "Action": m.group("Action"),
-                    "Config": {key: m.group(key) for key in pattern["fields"]}
-                }
-
-        return None
-
     def interpretLine(self, line):
         """
         Interprets a single line from the log file.
-        Tries to match the line against predefined regex patterns.
-        """
-        # Step 1: Check VOICE_REGEX
-        m = VOICE_REGEX.match(line)
-        if m:
-            entry = m.groupdict()
-            entry["Talkgroup Name"] = self.api.sessionManager.talkgroupsManager.getTalkgroupName(
-                self.api.sessionManager.thisSession.activeSystem.index, m
-            )
-            return entry
-
-        # Step 2: Check TG_REGEX
-        m = TG_REGEX.match(line)
-        if m:
-            entry = m.groupdict()
-            entry["Talkgroup Name"] = self.api.sessionManager.talkgroupsManager.getTalkgroupName(
-                self.api.sessionManager.thisSession.activeChannelNumber, m
-            )
-            return entry
-
-        # Step 3: Check RECONFIG_REGEX
-        m = RECONFIG_REGEX.match(line)
-        if m:
-            return m.groupdict()
-
-        # Step 4: Check HOLD_REGEX
-        m = HOLD_REGEX.match(line)
-        if m:
-            entry = m.groupdict()
-            entry["Talkgroup Name"] = self.api.sessionManager.talkgroupsManager.getTalkgroupName(
-                self.api.sessionManager.thisSession.activeSystem.index, m
-            )
-            return entry
+        The parser picks at most one candidate regex from the line's action prefix.
+        """
+        return self._build_entry(line, self.parser.match(line))
+
+    def _build_entry(self, line, result):
+        """Builds the entry dict for a line from its parser result (None for unrecognised lines)."""
+        # Fallback for uncategorized lines
+        if result is None:
+            date, time = self._timestamp_now()
+            return {
+                "Date": date,
+                "Time": time,
+                "Action": "Misc",
+                "Data": line.strip()
+            }
 
-        # Step 5: Check DUID_REGEX
-        m = DUID_REGEX.match(line)
-        if m:
-            entry = m.groupdict()
+        pattern, m = result
+        entry = pattern.to_entry(m)
+        if pattern.has_talkgroup:
+            session = self.api.sessionManager.thisSession
+            tgid = int(entry["Talkgroup"])
             entry["Talkgroup Name"] = self.api.sessionManager.talkgroupsManager.getTalkgroupName(
-                self.api.sessionManager.thisSession.activeSystem.index, m
+                session.activeSystem.index, tgid
             )
-            return entry
-
-        # Step 6: Check config-related patterns
-        entry = self._match_config_patterns(line)
-        if entry:
-            return entry
-
-        # Step 7: Fallback for uncategorized lines
-        date, time = self._timestamp_now()
-        return {
-            "Date": date,
-            "Time": time,
-            "Action": "Misc",
-            "Data": line.strip()
-        }
+            entry["In Scan"] = session.isInScan(tgid)  # Traffic outside the active channel's tgid list is flagged
+        return entry
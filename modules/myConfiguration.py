@@ -1,6 +1,7 @@
 import os
 import configparser
 import sys
+import time
 
 class MyConfig:
   import configparser
@@ -12,22 +13,31 @@ class MyConfig:
         self.config = configparser.ConfigParser()
         self.config.optionxform = str  # ← Preserve case
         self.config.read(config_file)
+        self._version = time.time_ns()  # Changes whenever the settings do; used for response ETags
         
     def reload(self):
         self.config = configparser.ConfigParser()
         self.config.optionxform = str  # ← Preserve case
         self.config.read(self.config_file)
+        self._version = time.time_ns()
 
     @property
     def config_file(self):
         return self._configFile
 
+    @property
+    def version(self) -> int:
+        return self._version
+
     def get(self, section, key, fallback=None):
         return self.config.get(section, key, fallback=fallback)
 
     def getint(self, section, key, fallback=0):
         return self.config.getint(section, key, fallback=fallback)
 
+    def getfloat(self, section, key, fallback=0.0):
+        return self.config.getfloat(section, key, fallback=fallback)
+
     def getboolean(self, section, key, fallback=False):
         return self.config.getboolean(section, key, fallback=fallback)
 
@@ -35,6 +45,7 @@ class MyConfig:
         if not self.config.has_section(section):
             self.config.add_section(section)
         self.config.set(section, key, str(value))
+        self._version = time.time_ns()
 
     def save(self):
         with open(self.config_file, "w") as configfile:
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# benchmark_logParser.py
+"""
+Compares lines/sec of the dispatching LineParser against the old sequential
+regex chain from logMonitorOP25.interpretLine (talkgroup name lookups excluded).
+
+Pass a recorded `-v 2` stderr log with --log, or let the script build a sample
+where most lines are unrecognised, like a real busy system.
+
+Usage:
+    python3 scripts/benchmark_logParser.py --log /opt/op25-project/logs/stderr_op25.log
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from modules._logParser import (  # noqa: E402
+    AUDIO_SOCKET_REGEX, DEMOD_REGEX, DEVICE_REGEX, DUID_REGEX, FRAME_ASSEMBLER_REGEX, GAIN_REGEX,
+    HOLD_REGEX, RECONFIG_REGEX, TG_REGEX, VOICE_REGEX, defaultParser, timestamp_now
+)
+
+RECOGNISED = [
+    "05/14/25 18:22:31.512602 voice update:  tg(46501), freq(853462500), slot(-), prio(3)",
+    "05/14/25 18:22:31.512602 duid15, tg(46501)",
+    "05/14/25 18:22:31.512602 Reconfiguring NAC from 0x000 to 0x1f1",
+]
+NOISE = [
+    "05/14/25 18:22:31.512602 [0] tsbk(0x02) grant tg(46517) freq(853462500)",
+    "05/14/25 18:22:31.512602 [0] NAC 0x1f1 LCW: ec=0, pb=0, sf=0, lco=0, src_addr=0x2f1c3a",
+    "05/14/25 18:22:31.512602 tdma: slot 0 ESS key 0x0000 alg 0x80",
+    "freq 853.462500 tuning error -220 Hz",
+]
+
+
+def legacy_timestamp_now():
+    now = datetime.now()
+    return now.strftime("%m/%d/%y"), now.strftime("%H:%M:%S.%f")[:-3]
+
+
+def legacy_interpret(line):
+    """The pre-dispatch interpretLine: every regex in turn, config table rebuilt per call."""
+    for regex in (VOICE_REGEX, TG_REGEX, RECONFIG_REGEX, HOLD_REGEX, DUID_REGEX):
+        m = regex.match(line)
+        if m:
+            return m.groupdict()
+    date, t = legacy_timestamp_now()
+    config_patterns = [
+        {"regex": GAIN_REGEX, "fields": ["name", "start", "stop", "step"]},
+        {"regex": DEVICE_REGEX, "fields": ["index", "model", "serial"]},
+        {"regex": DEMOD_REGEX, "fields": ["if_rate", "input_rate", "decim", "taps", "resampled_rate", "sps"]},
+        {"regex": AUDIO_SOCKET_REGEX, "fields": ["host", "wireshark", "audio"]},
+        {"regex": FRAME_ASSEMBLER_REGEX, "fields": ["do_imbe", "do_output", "do_audio_output", "do_phase2_tdma", "do_nocrypt"]},
+    ]
+    for pattern in config_patterns:
+        m = pattern["regex"].match(line)
+        if m:
+            return {"Date": date, "Time": t, "Action": m.group("Action"),
+                    "Config": {key: m.group(key) for key in pattern["fields"]}}
+    date, t = legacy_timestamp_now()
+    return {"Date": date, "Time": t, "Action": "Misc", "Data": line.strip()}
+
+
+def dispatch_interpret(line):
+    """The current interpretLine without the talkgroup name lookup."""
+    result = defaultParser.match(line)
+    if result is None:
+        date, t = timestamp_now()
+        return {"Date": date, "Time": t, "Action": "Misc", "Data": line.strip()}
+    pattern, m = result
+    return pattern.to_entry(m)
+
+
+def lines_per_sec(func, lines) -> float:
+    start = time.perf_counter()
+    for line in lines:
+        func(line)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", help="Recorded OP25 stderr log to replay")
+    parser.add_argument("--lines", type=int, default=200000, help="Sample size when no log is given")
+    parser.add_argument("--noise", type=float, default=0.7, help="Share of unrecognised lines in the sample")
+    args = parser.parse_args()
+
+    if args.log:
+        with open(args.log, errors="replace") as f:
+            lines = [line.rstrip("\n") for line in f]
+    else:
+        rng = random.Random(25)
+        lines = [rng.choice(NOISE if rng.random() < args.noise else RECOGNISED) for _ in range(args.lines)]
+
+    legacy = lines_per_sec(legacy_interpret, lines)
+    dispatch = lines_per_sec(dispatch_interpret, lines)
+    print(f"lines:      {len(lines)}")
+    print(f"sequential: {legacy:,.0f} lines/sec")
+    print(f"dispatch:   {dispatch:,.0f} lines/sec ({dispatch / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
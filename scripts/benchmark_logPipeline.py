@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# benchmark_logPipeline.py
+"""
+Benchmarks the OP25 log ingestion pipeline end to end.
+
+Writes a synthetic corpus (see op25LogCorpus.py) to a temporary stderr log in
+chunks, and after each chunk fires LogFileHandler.on_modified the way watchdog
+does. The real logMonitorOP25 tails, parses and publishes each entry on the
+event bus to an SSEBroadcaster, and a consumer thread drains one SSE
+subscriber like a browser would.
+
+Reports:
+    lines/sec                   lines fully processed per second of handler time
+    parse->bus p50/p99          time from the handler firing to the entry reaching a bus subscriber
+    parse->sse p50/p99          time from the handler firing to an SSE client dequeuing the entry
+    peak RSS                    maximum resident set size of the process
+
+Use --json to save a result and --compare to print the change against a saved
+result from another commit. The corpus is seeded, so runs are comparable.
+
+Usage:
+    python3 scripts/benchmark_logPipeline.py --lines 200000 --json /tmp/bench_head.json
+    python3 scripts/benchmark_logPipeline.py --lines 200000 --compare /tmp/bench_head.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from watchdog.events import FileModifiedEvent  # type: ignore  # noqa: E402
+from modules._eventBus import EventBus, LOG_TOPIC  # noqa: E402
+from modules._logFilter import LogFilterPolicy  # noqa: E402
+from modules._sseBroadcaster import SSEBroadcaster  # noqa: E402
+from modules._talkgroupSet import TalkgroupManager  # noqa: E402
+from modules.logMonitor import LogFileHandler, logMonitorOP25  # noqa: E402
+from op25LogCorpus import DEFAULT_TALKGROUPS, CorpusGenerator  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def bench_api(talkgroups_file):
+    """The parts of API that logMonitorOP25 touches: talkgroup names and the scan list of the active channel."""
+    scan_set = frozenset(DEFAULT_TALKGROUPS[:6])
+    session = SimpleNamespace(activeSystem=SimpleNamespace(index=0), activeSysIndex=0, isInScan=scan_set.__contains__)
+    manager = SimpleNamespace(talkgroupsManager=TalkgroupManager(talkgroups_file), thisSession=session)
+    return SimpleNamespace(sessionManager=manager)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run(args) -> dict:
+    lines = list(CorpusGenerator(noise=args.noise, seed=args.seed).lines(args.lines))
+
+    fd, log_path = tempfile.mkstemp(suffix="_stderr_op25.log")
+    os.close(fd)
+
+    bus = EventBus()
+    broadcaster = SSEBroadcaster(capacity=args.sse_buffer, replay_size=16)
+    state = {"fired": 0.0}
+
+    # HANDLER FIRE TIME PER SSE EVENT ID, RECORDED BEFORE PUBLISHING SO THE CONSUMER NEVER MISSES IT
+    fired_by_id = {}
+
+    def to_sse(entry):
+        fired_by_id[broadcaster.last_event_id + 1] = state["fired"]
+        broadcaster.publish(entry)
+
+    bus.subscribe(LOG_TOPIC, to_sse)
+
+    bus_latency = []
+    bus.subscribe(LOG_TOPIC, lambda entry: bus_latency.append(time.perf_counter() - state["fired"]))
+    sse_latency = []
+    subscriber = broadcaster.subscribe()
+    done = threading.Event()
+
+    def consume():
+        while not (done.is_set() and len(subscriber) == 0):
+            item = subscriber.get(timeout=0.1)
+            if item is not None:
+                fired = fired_by_id.pop(item[0], None)
+                if fired is not None:
+                    sse_latency.append(time.perf_counter() - fired)
+
+    consumer = threading.Thread(target=consume, daemon=True)
+    consumer.start()
+
+    rules = dict(rule.split("=", 1) for rule in args.filter)
+    monitor = logMonitorOP25(bench_api(args.talkgroups), file=log_path, bus=bus, log_filter=LogFilterPolicy(rules))
+    handler = LogFileHandler(monitor)
+    event = FileModifiedEvent(log_path)
+
+    busy = 0.0
+    with open(log_path, "a") as f:
+        for i in range(0, len(lines), args.chunk):
+            f.write("\n".join(lines[i:i + args.chunk]) + "\n")
+            f.flush()
+            state["fired"] = time.perf_counter()
+            handler.on_modified(event)
+            busy += time.perf_counter() - state["fired"]
+
+    done.set()
+    consumer.join(timeout=30)
+    os.remove(log_path)
+
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "params": {"lines": args.lines, "noise": args.noise, "seed": args.seed, "chunk": args.chunk,
+                   "filter": sorted(args.filter)},
+        "lines_per_sec": len(lines) / busy if busy else 0.0,
+        "bus_p50_ms": percentile(bus_latency, 50) * 1e3,
+        "bus_p99_ms": percentile(bus_latency, 99) * 1e3,
+        "sse_p50_ms": percentile(sse_latency, 50) * 1e3,
+        "sse_p99_ms": percentile(sse_latency, 99) * 1e3,
+        "sse_dropped": subscriber.dropped,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+METRICS = [
+    ("lines_per_sec", "lines/sec", "{:,.0f}"),
+    ("bus_p50_ms", "parse->bus p50 (ms)", "{:.3f}"),
+    ("bus_p99_ms", "parse->bus p99 (ms)", "{:.3f}"),
+    ("sse_p50_ms", "parse->sse p50 (ms)", "{:.3f}"),
+    ("sse_p99_ms", "parse->sse p99 (ms)", "{:.3f}"),
+    ("sse_dropped", "sse events dropped", "{:,}"),
+    ("peak_rss_mb", "peak RSS (MB)", "{:.1f}"),
+]
+
+
+def report(result: dict, baseline: dict = None):
+    print(f"revision {result['revision']}  python {result['python']}  {result['machine']}  {result['params']}")
+    for key, label, fmt in METRICS:
+        line = f"  {label:<22} {fmt.format(result[key]):>12}"
+        if baseline and key in baseline:
+            old = baseline[key]
+            change = f"{(result[key] - old) / old * 100:+.1f}%" if old else "n/a"
+            line += f"   was {fmt.format(old):>12} ({change}) @ {baseline.get('revision', '?')}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=100000)
+    parser.add_argument("--noise", type=float, default=0.6, help="Share of unrecognised noise lines")
+    parser.add_argument("--seed", type=int, default=25)
+    parser.add_argument("--chunk", type=int, default=20, help="Lines written per simulated watchdog event")
+    parser.add_argument("--sse-buffer", type=int, default=256, help="SSE subscriber buffer size")
+    parser.add_argument("--filter", action="append", default=[], metavar="CLASS=RULE",
+                        help="Log filter rule, e.g. misc=count or duid=sample:10 (repeatable)")
+    parser.add_argument("--talkgroups", default=os.path.join(ROOT, "talkgroups.json"))
+    parser.add_argument("--json", help="Write the result to this file")
+    parser.add_argument("--compare", help="Compare against a result saved with --json")
+    args = parser.parse_args()
+
+    result = run(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    report(result, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# benchmark_logTailer.py
+"""
+Measures the per-event cost of reading new log lines as stderr_op25.log grows.
+
+Compares the incremental LogTailer against the old approach of re-reading the
+whole file with readlines() on every watchdog event. The tailer's cost should stay
+flat while the full re-read grows with the file size.
+
+Usage:
+    python3 scripts/benchmark_logTailer.py --max-mb 300 --step-mb 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from modules._logTailer import LogTailer  # noqa: E402
+
+SAMPLE_LINE = "05/14/25 18:22:31.512 voice update:  tg(46501), freq(853462500), slot(-), prio(3)\n"
+EVENT_LINES = 5  # Lines appended per simulated watchdog event
+EVENTS = 200     # Events measured at each file size
+
+
+def grow_file(path: str, target_bytes: int):
+    """Appends filler lines until the file reaches target_bytes."""
+    block = SAMPLE_LINE * 10000
+    with open(path, "a") as f:
+        size = f.tell()
+        while size < target_bytes:
+            f.write(block)
+            size += len(block)
+
+
+def time_tailer(tailer: LogTailer, path: str) -> float:
+    """Returns the mean seconds per event for the incremental tailer."""
+    tailer.read_new_lines()  # Skip the filler so only the appended lines are read
+    total = 0.0
+    with open(path, "a") as f:
+        for _ in range(EVENTS):
+            f.write(SAMPLE_LINE * EVENT_LINES)
+            f.flush()
+            start = time.perf_counter()
+            lines = tailer.read_new_lines()
+            total += time.perf_counter() - start
+            assert len(lines) == EVENT_LINES
+    return total / EVENTS
+
+
+def time_full_read(path: str, events: int) -> float:
+    """Returns the mean seconds per event for the old readlines() approach."""
+    total = 0.0
+    with open(path, "a") as f:
+        for _ in range(events):
+            f.write(SAMPLE_LINE * EVENT_LINES)
+            f.flush()
+            start = time.perf_counter()
+            with open(path) as r:
+                r.readlines()
+            total += time.perf_counter() - start
+    return total / events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-mb", type=int, default=300, help="Largest log size to test")
+    parser.add_argument("--step-mb", type=int, default=50, help="Log size increment between measurements")
+    parser.add_argument("--full-events", type=int, default=3, help="Events to time for the full re-read (slow)")
+    parser.add_argument("--skip-full", action="store_true", help="Only measure the incremental tailer")
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix="_stderr_op25.log")
+    os.close(fd)
+    tailer = LogTailer(path)
+
+    print(f"{'size (MB)':>10} {'tailer (us/event)':>18} {'readlines (ms/event)':>21}")
+    try:
+        for mb in [1] + list(range(args.step_mb, args.max_mb + 1, args.step_mb)):
+            grow_file(path, mb * 1024 * 1024)
+            tail_us = time_tailer(tailer, path) * 1e6
+            full = "-" if args.skip_full else f"{time_full_read(path, args.full_events) * 1e3:.1f}"
+            print(f"{mb:>10} {tail_us:>18.1f} {full:>21}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
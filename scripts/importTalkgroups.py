@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# importTalkgroups.py
+"""
+Imports a talkgroup CSV (Decimal,Alpha Tag[,Priority][,Category]) into one
+system's talkgroup set.
+
+By default the file is streamed to the running API
+(POST /admin/talkgroups/<sys>/import), which reports progress on
+/controller/progress. With --talkgroups-file the JSON file is updated directly
+instead; only do that while the API is stopped.
+
+Usage:
+    python3 scripts/importTalkgroups.py statewide.csv --sys 0
+    python3 scripts/importTalkgroups.py statewide.csv --sys 0 --mode replace --url http://localhost:5001
+    python3 scripts/importTalkgroups.py statewide.csv --sys 0 --talkgroups-file /opt/op25-project/talkgroups.json
+"""
+import argparse
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from modules._talkgroupImport import TalkgroupCSVImporter  # noqa: E402
+
+
+def import_remote(args) -> dict:
+    url = f"{args.url.rstrip('/')}/admin/talkgroups/{args.sys}/import?mode={args.mode}"
+    if args.force:
+        url += "&force=true"
+    with open(args.csv, "rb") as f:
+        req = urllib.request.Request(url, data=f, method="POST", headers={
+            "Content-Type": "text/csv",
+            "Content-Length": str(os.path.getsize(args.csv))
+        })
+        try:
+            with urllib.request.urlopen(req) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as e:
+            return {"error": f"HTTP {e.code}", **json.load(e)}
+
+
+def import_local(args) -> dict:
+    from modules._jsonStore import JsonStore
+    from modules._talkgroupSet import TalkgroupManager
+
+    def progress(percent):
+        print(f"\r{percent:3d}%", end="", file=sys.stderr, flush=True)
+
+    importer = TalkgroupCSVImporter(batch_size=args.batch_size, progress=progress)
+    with open(args.csv, "rb") as f:
+        talkgroups = importer.read(f, os.path.getsize(args.csv))
+    print(file=sys.stderr)
+    if args.mode == "replace" and not talkgroups:
+        return {"error": "Nothing to import; replace would empty the talkgroup set", **importer.summary(0)}
+    if args.mode == "replace" and importer.skipped and not args.force:
+        return {"error": f"{importer.skipped} row(s) skipped; use --force to replace anyway", **importer.summary(0)}
+
+    manager = TalkgroupManager(args.talkgroups_file)
+    manager = manager.with_talkgroups(args.sys, talkgroups, replace=args.mode == "replace")
+    JsonStore.open(args.talkgroups_file).write(manager._data)
+    return importer.summary(len(talkgroups))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv", help="CSV file to import")
+    parser.add_argument("--sys", type=int, required=True, help="System index of the talkgroup set")
+    parser.add_argument("--mode", choices=("merge", "replace"), default="merge",
+                        help="replace drops talkgroups that are not in the file")
+    parser.add_argument("--url", default="http://localhost:5001", help="API base URL")
+    parser.add_argument("--talkgroups-file", help="Update this talkgroups.json directly instead of using the API")
+    parser.add_argument("--force", action="store_true", help="Replace even if some rows were skipped")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    result = import_local(args) if args.talkgroups_file else import_remote(args)
+    print(json.dumps(result, indent=4))
+    if "error" in result:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
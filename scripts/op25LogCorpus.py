@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# op25LogCorpus.py
+"""
+Generates realistic synthetic OP25 `rx.py -v 2` stderr output for benchmarks.
+
+The corpus starts with the device/gain/demod/audio config lines OP25 prints at
+startup and a NAC reconfiguration, then interleaves calls (bursts of voice
+update lines on one tgid/freq followed by duid lines) with a configurable
+share of unrecognised trunking noise. The same seed always produces the same
+corpus, so results are comparable between commits.
+
+Usage:
+    python3 scripts/op25LogCorpus.py --lines 100000 --noise 0.6 > /tmp/stderr_op25.log
+"""
+import argparse
+import random
+import sys
+from typing import Iterator, List, Optional
+
+DEFAULT_TALKGROUPS = [46501, 46502, 46503, 46504, 46513, 46517, 46518, 46949, 47021, 46800, 46801, 46802]
+DEFAULT_FREQS = [851012500, 851262500, 852137500, 853462500, 853925000, 854112500]
+
+STARTUP_LINES = [
+    "Using device #0 Realtek RTL2838UHIDIR SN: 00000001",
+    "gain: name: LNA range: start 0 stop 49 step 1",
+    "demodulator: xlator if_rate=96000, input_rate=960000, decim=10, if taps=[1,2,3,4,5,6,7,8], resampled_rate=48000, sps=5",
+    "op25_audio::open_socket(): enabled udp host(127.0.0.1), wireshark(23456), audio(23456)",
+    "p25_frame_assembler_impl: do_imbe[1], do_output[0], do_audio_output[1], do_phase2_tdma[1], do_nocrypt[1]",
+]
+
+
+class CorpusGenerator:
+    """Produces OP25 stderr lines with increasing timestamps."""
+    def __init__(self, noise: float = 0.6, seed: int = 25, talkgroups: Optional[List[int]] = None,
+                 freqs: Optional[List[int]] = None):
+        self.noise = noise
+        self.rng = random.Random(seed)
+        self.talkgroups = talkgroups or DEFAULT_TALKGROUPS
+        self.freqs = freqs or DEFAULT_FREQS
+        self._clock = 18 * 3600.0  # Seconds since midnight
+
+    def _stamp(self) -> str:
+        self._clock += self.rng.uniform(0.001, 0.05)
+        t = self._clock % 86400
+        h, rem = divmod(t, 3600)
+        m, s = divmod(rem, 60)
+        return f"05/14/25 {int(h):02d}:{int(m):02d}:{s:09.6f}"
+
+    def noise_line(self) -> str:
+        rng = self.rng
+        kind = rng.randrange(5)
+        if kind == 0:
+            return f"{self._stamp()} [0] tsbk(0x02) grant tg({rng.choice(self.talkgroups)}) freq({rng.choice(self.freqs)})"
+        if kind == 1:
+            return f"{self._stamp()} [0] NAC 0x1f1 LCW: ec=0, pb=0, sf=0, lco=0, src_addr=0x{rng.randrange(1 << 24):06x}"
+        if kind == 2:
+            return f"{self._stamp()} tdma: slot {rng.randrange(2)} ESS key 0x0000 alg 0x80"
+        if kind == 3:
+            return f"freq {rng.choice(self.freqs) / 1e6:.6f} tuning error {rng.randrange(-400, 400)} Hz"
+        return f"{self._stamp()} [0] nac 0x1f1 tsbk(0x3a) rfss status: syid 0x{rng.randrange(4096):03x} rfid 1 stid 1"
+
+    def call_lines(self) -> Iterator[str]:
+        """Yields one call: a burst of voice updates on one tgid/freq, then a few duid lines."""
+        rng = self.rng
+        tgid = rng.choice(self.talkgroups)
+        freq = rng.choice(self.freqs)
+        prio = rng.randrange(1, 5)
+        for _ in range(rng.randrange(5, 40)):
+            yield f"{self._stamp()} voice update:  tg({tgid}), freq({freq}), slot(-), prio({prio})"
+        for _ in range(rng.randrange(1, 4)):
+            yield f"{self._stamp()} duid{rng.choice((3, 15))}, tg({tgid})"
+
+    def lines(self, count: int) -> Iterator[str]:
+        """Yields count lines, startup lines first. `noise` is the share of the remaining lines that are noise."""
+        produced = 0
+        for line in STARTUP_LINES + [f"{self._stamp()} Reconfiguring NAC from 0x000 to 0x1f1"]:
+            if produced >= count:
+                return
+            yield line
+            produced += 1
+        call = iter(())
+        while produced < count:
+            if self.rng.random() < self.noise:
+                yield self.noise_line()
+            else:
+                line = next(call, None)
+                if line is None:
+                    call = self.call_lines()
+                    line = next(call)
+                yield line
+            produced += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=100000)
+    parser.add_argument("--noise", type=float, default=0.6, help="Share of unrecognised noise lines")
+    parser.add_argument("--seed", type=int, default=25)
+    args = parser.parse_args()
+    for line in CorpusGenerator(noise=args.noise, seed=args.seed).lines(args.lines):
+        sys.stdout.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()